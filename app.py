@@ -4,16 +4,13 @@
 KOPIS API + 예매사이트 크롤링 (인터파크, 멜론, YES24)
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request, send_file
 from flask_cors import CORS
 import requests
-import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 import re
 import json
 import threading
-import time as time_module
-import subprocess
 from concurrent.futures import ThreadPoolExecutor
 import os
 import logging
@@ -24,23 +21,51 @@ from apscheduler.triggers.cron import CronTrigger
 from config import (
     KOPIS_API_KEY, KOPIS_BASE_URL, GENRE_CODES,
     GENRE_CODE_CONCERT, GENRE_CODE_MUSICAL, GENRE_CODE_THEATER,
-    ALLOWED_ORIGINS, ALLOWED_IMAGE_DOMAINS, SUPPORTED_LANGS, FLASK_DEBUG
+    ALLOWED_ORIGINS, ALLOWED_IMAGE_DOMAINS, SUPPORTED_LANGS, FLASK_DEBUG, SOURCE_STALE_HOURS,
+    SHARED_CACHE_DIR, SCHEDULER_LOCK_FILE, SHARED_CACHE_CHECK_SECONDS,
+    DETAIL_CACHE_DB, KOPIS_DETAIL_TTL_HOURS, KOPIS_DETAIL_MAX_ENTRIES,
+    KOPIS_DETAIL_PREFETCH_COUNT, KOPIS_DETAIL_PREFETCH_WORKERS,
+    TICKET_DETAIL_TTL_MINUTES, TICKET_DETAIL_STALE_HOURS, TICKET_DETAIL_MAX_ENTRIES,
+    IMAGE_ACCEL_REDIRECT_PREFIX, CLASSIFY_MEMO_SAVE_SECONDS
 )
 from constants import (
-    get_cache_key, normalize_name, classify_part, classify_region, categorize_concert
+    get_cache_key, normalize_name, classify_part, classify_region, categorize_concert,
+    classification_memo, venue_index
 )
 from utils.security import is_safe_url, set_security_headers
-from utils.helpers import calculate_dday, filter_ended_performances, sort_by_dday
-from services.merger import merge_performance_data, merge_source_data
-from services.image_proxy import get_cached_or_download, cleanup_old_cache
+from utils.helpers import calculate_dday
+from services.merge_store import performance_store
+from services.performance import Performance
+from services.response_cache import build_precompressed, precompressed_response, compressed_json_response, etag_matches
+from services.performance_index import PerformanceIndex, INDEXED_FIELDS, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, index_meta
+from services.search_index import SearchIndex
+from services.shared_cache import SchedulerLock, SnapshotStore
+from services.detail_cache import DetailCache
+from utils.singleflight import SingleFlight
+from services.image_proxy import get_image_variant, prewarm_posters, start_image_cache_maintenance
 from services.translation import (
-    translate_text, translate_performance_data, save_translation_cache,
-    load_po_translations, translation_cache, translation_cache_lock
+    translate_text, translate_texts, translate_performance_data, load_po_translations, start_cache_maintenance
+)
+from services.crawler_client import run_crawler_job, CrawlerTimeout
+from crawlers.yes24 import fetch_yes24_detail_http
+from crawlers.kopis import (
+    iter_kopis_pages, fetch_kopis_records, fetch_kopis_detail_record, KopisApiError
 )
-from crawlers.kopis import fetch_all_kopis, fetch_kopis_detail
 
 app = Flask(__name__)
 CORS(app, origins=ALLOWED_ORIGINS)
+
+# jsonify 응답에 Performance 레코드가 그대로 들어가도 기존 JSON 형태로 직렬화
+_flask_json_default = app.json.default
+
+
+def _json_default(obj):
+    if isinstance(obj, Performance):
+        return obj.to_dict()
+    return _flask_json_default(obj)
+
+
+app.json.default = _json_default
 # TODO: Rate Limiting 도입 시 flask-limiter 사용
 # from flask_limiter import Limiter
 # limiter = Limiter(app=app, default_limits=["200 per hour"])
@@ -56,10 +81,31 @@ KOPIS_BASE_URL = "http://www.kopis.or.kr/openApi/restful"
 # 캐시 저장소 (하루 2회 업데이트용)
 cache = {
     'data': None,
+    'response': None,     # /api/all 사전 직렬화/압축 응답 (build_precompressed)
+    'index': None,        # /api/all 필터/페이지네이션 인덱스 (PerformanceIndex)
+    'search': None,       # /api/search 역색인 (SearchIndex)
     'last_update': None
 }
 cache_lock = threading.Lock()
 
+# 워커 간 공유: 스케줄러 선출 잠금 + 게시된 스냅샷
+scheduler_lock = SchedulerLock(SCHEDULER_LOCK_FILE)
+snapshot_store = SnapshotStore(SHARED_CACHE_DIR, SHARED_CACHE_CHECK_SECONDS)
+
+# KOPIS 상세정보 캐시 (mt20id 기준, 하루 1회만 KOPIS 조회)
+kopis_detail_cache = DetailCache(DETAIL_CACHE_DB, 'kopis_detail', KOPIS_DETAIL_TTL_HOURS * 3600, KOPIS_DETAIL_MAX_ENTRIES)
+
+# 멜론/YES24 상세정보 캐시 + 같은 공연 동시 크롤링 합치기 (키당 브라우저 1개)
+ticket_detail_cache = DetailCache(
+    DETAIL_CACHE_DB, 'ticket_detail', TICKET_DETAIL_TTL_MINUTES * 60, TICKET_DETAIL_MAX_ENTRIES,
+    stale_ttl=TICKET_DETAIL_STALE_HOURS * 3600
+)
+ticket_detail_flight = SingleFlight()
+
+# 분류/정규화 메모 + 공연장 지역 색인 주기적 저장 (다음 기동 시 재사용)
+classification_memo.start(CLASSIFY_MEMO_SAVE_SECONDS)
+venue_index.start(CLASSIFY_MEMO_SAVE_SECONDS)
+
 # 기본 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -101,98 +147,143 @@ def get_kopis_performances():
         if genre and genre in GENRE_CODES:
             params['shcate'] = GENRE_CODES[genre]
 
-        response = requests.get(f"{KOPIS_BASE_URL}/pblprfr", params=params, timeout=10)
-
-        if response.status_code == 200:
-            root = ET.fromstring(response.content)
-            performances = []
-
-            for db in root.findall('.//db'):
-                perf_id = db.find('mt20id').text if db.find('mt20id') is not None else ''
-                name = db.find('prfnm').text if db.find('prfnm') is not None else ''
-
-                perf = {
-                    'id': perf_id,
-                    'name': name,
-                    'start_date': db.find('prfpdfrom').text if db.find('prfpdfrom') is not None else '',
-                    'end_date': db.find('prfpdto').text if db.find('prfpdto') is not None else '',
-                    'venue': db.find('fcltynm').text if db.find('fcltynm') is not None else '',
-                    'poster': db.find('poster').text if db.find('poster') is not None else '',
-                    'genre': db.find('genrenm').text if db.find('genrenm') is not None else '',
-                    'state': db.find('prfstate').text if db.find('prfstate') is not None else '',
-                    'source': 'KOPIS',
-                    'source_color': '#00d4ff',
-                    'hash': get_cache_key(normalize_name(name))
-                }
-                performances.append(perf)
-
-            return jsonify({
-                'success': True,
-                'data': performances,
-                'count': len(performances)
-            })
-        else:
-            return jsonify({'success': False, 'error': f'API 오류: {response.status_code}'})
+        try:
+            records = fetch_kopis_records('pblprfr', params)
+        except KopisApiError as e:
+            return jsonify({'success': False, 'error': f'API 오류: {e.status_code}'})
+
+        performances = []
+        for db in records:
+            name = db.get('prfnm', '')
+            perf = {
+                'id': db.get('mt20id', ''),
+                'name': name,
+                'start_date': db.get('prfpdfrom', ''),
+                'end_date': db.get('prfpdto', ''),
+                'venue': db.get('fcltynm', ''),
+                'poster': db.get('poster', ''),
+                'genre': db.get('genrenm', ''),
+                'state': db.get('prfstate', ''),
+                'source': 'KOPIS',
+                'source_color': '#00d4ff',
+                'hash': get_cache_key(normalize_name(name))
+            }
+            performances.append(perf)
+
+        return jsonify({
+            'success': True,
+            'data': performances,
+            'count': len(performances)
+        })
 
     except Exception as e:
         logging.error(f"KOPIS 공연 조회 오류: {e}", exc_info=True)
         return jsonify({'success': False, 'error': '공연 데이터를 불러오는 중 오류가 발생했습니다.'})
 
 
+def load_kopis_detail(perf_id):
+    """KOPIS 상세 레코드 → 모달용 상세정보 dict (없으면 None)"""
+    try:
+        db = fetch_kopis_detail_record(perf_id)
+    except KopisApiError:
+        return None
+    if db is None:
+        return None
+
+    # 예매 링크 정보 추출
+    booking_sites = []
+    for relate in db.get('relates', []):
+        site_name = relate.get('relatenm', '')
+        site_url = relate.get('relateurl', '')
+        if site_name and site_url:
+            # 사이트별 색상 지정
+            color = '#888'
+            if '인터파크' in site_name:
+                color = '#ff6464'
+            elif '멜론' in site_name:
+                color = '#00cd3c'
+            elif 'YES24' in site_name or '예스24' in site_name:
+                color = '#ffc800'
+            elif '티켓링크' in site_name:
+                color = '#0066cc'
+
+            booking_sites.append({
+                'name': site_name,
+                'url': site_url,
+                'color': color
+            })
+
+    detail = {
+        'id': db.get('mt20id', ''),
+        'name': db.get('prfnm', ''),
+        'start_date': db.get('prfpdfrom', ''),
+        'end_date': db.get('prfpdto', ''),
+        'venue': db.get('fcltynm', ''),
+        'cast': db.get('prfcast', ''),
+        'runtime': db.get('prfruntime', ''),
+        'price': db.get('pcseguidance', ''),
+        'poster': db.get('poster', ''),
+        'genre': db.get('genrenm', ''),
+        'state': db.get('prfstate', ''),
+        'story': db.get('sty', ''),
+        'schedule': db.get('dtguidance', ''),
+        'booking_sites': booking_sites  # 실제 예매 링크
+    }
+    return detail
+
+
+def prefetch_kopis_details(performances):
+    """갱신 후 임박 공연 상위 N건의 KOPIS 상세정보를 미리 캐시 (캐시에 없는 것만)"""
+    perf_ids = []
+    for perf in performances:
+        perf_id = perf.get('id', '')
+        if perf_id.startswith('PF') and any(s.get('name') == 'KOPIS' for s in perf.get('available_sites', [])):
+            perf_ids.append(perf_id)
+        if len(perf_ids) >= KOPIS_DETAIL_PREFETCH_COUNT:
+            break
+
+    def fetch(perf_id):
+        try:
+            detail = load_kopis_detail(perf_id)
+            if detail is not None:
+                kopis_detail_cache.put(perf_id, detail)
+                return True
+        except Exception as e:
+            logging.debug(f"KOPIS 상세 프리페치 실패 ({perf_id}): {e}")
+        return False
+
+    targets = kopis_detail_cache.missing(perf_ids)
+    if targets:
+        with ThreadPoolExecutor(max_workers=KOPIS_DETAIL_PREFETCH_WORKERS) as executor:
+            fetched = sum(executor.map(fetch, targets))
+        scheduler_logger.info(f"KOPIS 상세 프리페치: {fetched}/{len(targets)}건 (대상 {len(perf_ids)}건)")
+
+
+def prewarm_poster_cache(performances):
+    """갱신 후 전체 포스터 예열 (캐시에 없는 원본 다운로드 + 카드 썸네일 생성)"""
+    urls = [perf.get('poster', '') for perf in performances]
+    urls = [url for url in urls if url and is_safe_url(url)]
+    try:
+        stats = prewarm_posters(urls)
+        scheduler_logger.info(
+            f"포스터 예열: {stats['total']}건 (적중 {stats['hits']}, 다운로드 {stats['fetched']}, "
+            f"실패 {stats['failed']}, 적중률 {stats['hit_ratio']:.1%}, {stats['bytes'] / 1024 / 1024:.1f}MB)"
+        )
+    except Exception as e:
+        scheduler_logger.warning(f"포스터 예열 실패: {e}")
+
+
 @app.route('/api/kopis/performance/<perf_id>')
 def get_kopis_performance_detail(perf_id):
-    """KOPIS API로 공연 상세 정보 조회 (예매 링크 포함)"""
+    """KOPIS API로 공연 상세 정보 조회 (예매 링크 포함, 상세 캐시 우선)"""
     try:
-        params = {'service': KOPIS_API_KEY}
-        response = requests.get(f"{KOPIS_BASE_URL}/pblprfr/{perf_id}", params=params, timeout=10)
-
-        if response.status_code == 200:
-            root = ET.fromstring(response.content)
-            db = root.find('.//db')
-
-            if db is not None:
-                # 예매 링크 정보 추출
-                booking_sites = []
-                relates = db.find('relates')
-                if relates is not None:
-                    for relate in relates.findall('relate'):
-                        site_name = relate.find('relatenm').text if relate.find('relatenm') is not None else ''
-                        site_url = relate.find('relateurl').text if relate.find('relateurl') is not None else ''
-                        if site_name and site_url:
-                            # 사이트별 색상 지정
-                            color = '#888'
-                            if '인터파크' in site_name:
-                                color = '#ff6464'
-                            elif '멜론' in site_name:
-                                color = '#00cd3c'
-                            elif 'YES24' in site_name or '예스24' in site_name:
-                                color = '#ffc800'
-                            elif '티켓링크' in site_name:
-                                color = '#0066cc'
-
-                            booking_sites.append({
-                                'name': site_name,
-                                'url': site_url,
-                                'color': color
-                            })
-
-                detail = {
-                    'id': db.find('mt20id').text if db.find('mt20id') is not None else '',
-                    'name': db.find('prfnm').text if db.find('prfnm') is not None else '',
-                    'start_date': db.find('prfpdfrom').text if db.find('prfpdfrom') is not None else '',
-                    'end_date': db.find('prfpdto').text if db.find('prfpdto') is not None else '',
-                    'venue': db.find('fcltynm').text if db.find('fcltynm') is not None else '',
-                    'cast': db.find('prfcast').text if db.find('prfcast') is not None else '',
-                    'runtime': db.find('prfruntime').text if db.find('prfruntime') is not None else '',
-                    'price': db.find('pcseguidance').text if db.find('pcseguidance') is not None else '',
-                    'poster': db.find('poster').text if db.find('poster') is not None else '',
-                    'genre': db.find('genrenm').text if db.find('genrenm') is not None else '',
-                    'state': db.find('prfstate').text if db.find('prfstate') is not None else '',
-                    'story': db.find('sty').text if db.find('sty') is not None else '',
-                    'schedule': db.find('dtguidance').text if db.find('dtguidance') is not None else '',
-                    'booking_sites': booking_sites  # 실제 예매 링크
-                }
-                return jsonify({'success': True, 'data': detail})
+        detail = kopis_detail_cache.get(perf_id)
+        if detail is None:
+            detail = load_kopis_detail(perf_id)
+            if detail is not None:
+                kopis_detail_cache.put(perf_id, detail)
+        if detail is not None:
+            return jsonify({'success': True, 'data': detail})
 
         return jsonify({'success': False, 'error': '공연 정보를 찾을 수 없습니다.'})
 
@@ -324,32 +415,14 @@ def get_interpark_tickets():
 
 @app.route('/api/ticketing/melon')
 def get_melon_tickets():
-    """멜론티켓 콘서트 조회 (Selenium - subprocess)"""
+    """멜론티켓 콘서트 조회 (Playwright - 크롤러 워커)"""
     try:
-        # 별도 프로세스로 Selenium 실행
-        script_path = os.path.join(os.path.dirname(__file__), 'playwright_crawler.py')
-        result = subprocess.run(
-            ['python', script_path, 'melon'],
-            capture_output=True,
-            timeout=120,
-            cwd=os.path.dirname(__file__),
-            encoding='utf-8',
-            errors='replace'
-        )
-
-        if result.returncode == 0 and result.stdout:
-            data = json.loads(result.stdout)
-            data['source'] = '멜론티켓'
-            return jsonify(data)
-        else:
-            return jsonify({
-                'success': False,
-                'error': result.stderr or 'No output',
-                'source': '멜론티켓',
-                'data': []
-            })
+        data = run_crawler_job('melon', timeout=120)
+        data['source'] = '멜론티켓'
+        data.setdefault('data', [])
+        return jsonify(data)
 
-    except subprocess.TimeoutExpired:
+    except CrawlerTimeout:
         return jsonify({'success': False, 'error': 'Timeout (2분 초과)', 'source': '멜론티켓', 'data': []})
     except Exception as e:
         logging.error(f"멜론티켓 크롤링 오류: {e}", exc_info=True)
@@ -358,32 +431,14 @@ def get_melon_tickets():
 
 @app.route('/api/ticketing/yes24')
 def get_yes24_tickets():
-    """YES24 티켓 콘서트 조회 (Selenium - subprocess)"""
+    """YES24 티켓 콘서트 조회 (Playwright - 크롤러 워커)"""
     try:
-        # 별도 프로세스로 Selenium 실행
-        script_path = os.path.join(os.path.dirname(__file__), 'playwright_crawler.py')
-        result = subprocess.run(
-            ['python', script_path, 'yes24'],
-            capture_output=True,
-            timeout=120,
-            cwd=os.path.dirname(__file__),
-            encoding='utf-8',
-            errors='replace'
-        )
+        data = run_crawler_job('yes24', timeout=120)
+        data['source'] = 'YES24'
+        data.setdefault('data', [])
+        return jsonify(data)
 
-        if result.returncode == 0 and result.stdout:
-            data = json.loads(result.stdout)
-            data['source'] = 'YES24'
-            return jsonify(data)
-        else:
-            return jsonify({
-                'success': False,
-                'error': result.stderr or 'No output',
-                'source': 'YES24',
-                'data': []
-            })
-
-    except subprocess.TimeoutExpired:
+    except CrawlerTimeout:
         return jsonify({'success': False, 'error': 'Timeout (2분 초과)', 'source': 'YES24', 'data': []})
     except Exception as e:
         logging.error(f"YES24 크롤링 오류: {e}", exc_info=True)
@@ -393,22 +448,83 @@ def get_yes24_tickets():
 
 
 
+def _install_cache(payload, response_entry, last_update, meta=None):
+    """응답 엔트리 + 인덱스를 캐시에 반영 (meta: 게시된 색인 필드 목록, 있으면 이것으로 색인)"""
+    fields = payload['data'] if meta is None else meta
+    index = PerformanceIndex(fields, generation=response_entry['etag'].strip('"')[:12], items=payload['data'])
+    search_index = SearchIndex(fields, items=payload['data'])
+    with cache_lock:
+        cache['data'] = payload
+        cache['response'] = response_entry
+        cache['index'] = index
+        cache['search'] = search_index
+        cache['last_update'] = last_update
+
+
+def _publish_snapshot():
+    """저장소 스냅샷으로 캐시 게시 + 다른 워커용 파일 게시 → (목록, 통계)"""
+    # 종료된 공연 필터링 + 정렬
+    filtered_list = performance_store.snapshot()
+    stats = performance_store.stats(len(filtered_list))
+
+    payload = {
+        'success': True,
+        'data': filtered_list,
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'stats': stats
+    }
+    response_entry = build_precompressed(payload)
+    last_update = datetime.now()
+    _install_cache(payload, response_entry, last_update)
+    try:
+        snapshot_store.publish(response_entry, last_update, index={
+            'meta': [index_meta(item) for item in filtered_list],
+            'timestamp': payload['timestamp'],
+            'stats': stats,
+        })
+    except Exception as e:
+        scheduler_logger.warning(f"공유 스냅샷 게시 실패: {e}")
+    performance_store.save()
+    return filtered_list, stats
+
+
+def sync_shared_cache(force=False):
+    """스케줄러 담당이 아닌 워커: 새로 게시된 스냅샷이 있으면 캐시 교체"""
+    if scheduler_lock.held and not force:
+        return
+    loaded = snapshot_store.poll(force=force)
+    if loaded:
+        payload, response_entry, last_update, meta = loaded
+        if meta is None:
+            # 색인 파일이 없는 이전 형식: 파일에서 읽은 dict 목록 → 슬롯 레코드 (워커별 상주 메모리 절감)
+            payload['data'] = [Performance(item) for item in payload['data']]
+        _install_cache(payload, response_entry, last_update, meta)
+        scheduler_logger.info(f"공유 스냅샷 로드: {len(payload['data'])}건 (세대 {snapshot_store.generation[:12]})")
+
+
+@app.before_request
+def refresh_shared_cache():
+    """API 요청 전 공유 스냅샷 세대 확인 (stat은 SHARED_CACHE_CHECK_SECONDS마다 1회)"""
+    if request.path.startswith('/api/'):
+        sync_shared_cache()
+
+
 def scheduled_update():
     """스케줄러에 의해 실행: KOPIS + 인터파크 데이터 자동 수집 (Selenium 제외)"""
     scheduler_logger.info("자동 업데이트 시작...")
     try:
         start_date = datetime.now().strftime('%Y%m%d')
         end_date = (datetime.now() + timedelta(days=60)).strftime('%Y%m%d')
-        today_str = datetime.now().strftime('%Y.%m.%d')
 
-        merged_performances = {}
-        source_counts = {'kopis': 0, 'interpark': 0, 'melon': 0, 'yes24': 0}
+        # KOPIS 3장르 전체 페이지 병렬 수집 → 도착한 페이지부터 저장소에 반영 (일부 실패 시 기존 데이터 유지)
+        try:
+            delta = performance_store.apply_stream('kopis', iter_kopis_pages(start_date, end_date))
+            scheduler_logger.info(f"KOPIS 반영: {delta}")
+        except Exception as e:
+            scheduler_logger.warning(f"KOPIS 수집 일부 실패 (받은 페이지만 반영): {e}")
 
-        # KOPIS 3장르 병렬 수집
-        kopis_results = fetch_all_kopis(start_date, end_date)
-        for perf in kopis_results:
-            merged_performances[perf['hash']] = perf
-            source_counts['kopis'] += 1
+        # KOPIS area로 학습한 공연장 지역을 인터파크 분류 전에 저장
+        venue_index.save()
 
         # 인터파크 데이터 수집
         try:
@@ -416,39 +532,33 @@ def scheduled_update():
                 interpark_response = get_interpark_tickets()
                 interpark_data = interpark_response.get_json()
                 if interpark_data.get('success'):
-                    merge_source_data(merged_performances, interpark_data['data'],
-                                      '인터파크', '#ff6464', 'interpark', source_counts)
+                    delta = performance_store.apply_source('interpark', interpark_data['data'])
+                    scheduler_logger.info(f"인터파크 반영: {delta}")
         except Exception as e:
             scheduler_logger.warning(f"인터파크 수집 실패: {e}")
 
-        # 종료된 공연 필터링 + 정렬
-        filtered_list = filter_ended_performances(list(merged_performances.values()))
-        sort_by_dday(filtered_list)
+        # 오래 갱신되지 않은 소스(멜론/YES24 수동 수집분) 정리
+        performance_store.expire_sources(timedelta(hours=SOURCE_STALE_HOURS))
 
-        # 공연 데이터 사전 번역
-        try:
-            translate_performance_data(filtered_list)
-            scheduler_logger.info(f"공연 데이터 번역 완료: {len(filtered_list)}건")
-        except Exception as e:
-            scheduler_logger.warning(f"공연 데이터 번역 실패: {e}")
+        # 번역 전 데이터를 먼저 게시 (번역은 완료 후 재게시)
+        filtered_list, stats = _publish_snapshot()
+        scheduler_logger.info(f"자동 업데이트 완료: {len(filtered_list)}건 (KOPIS: {stats['kopis']}, 인터파크: {stats['interpark']})")
 
-        # 캐시에 저장
-        with cache_lock:
-            cache['data'] = {
-                'success': True,
-                'data': filtered_list,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'stats': {
-                    'kopis': source_counts['kopis'],
-                    'interpark': source_counts['interpark'],
-                    'melon': source_counts['melon'],
-                    'yes24': source_counts['yes24'],
-                    'total': len(filtered_list)
-                }
-            }
-            cache['last_update'] = datetime.now()
+        # 임박 공연 KOPIS 상세정보 미리 받기 (백그라운드)
+        threading.Thread(target=prefetch_kopis_details, args=(filtered_list,), daemon=True).start()
 
-        scheduler_logger.info(f"자동 업데이트 완료: {len(filtered_list)}건 (KOPIS: {source_counts['kopis']}, 인터파크: {source_counts['interpark']})")
+        # 포스터 원본 + 카드 썸네일 예열 (백그라운드)
+        threading.Thread(target=prewarm_poster_cache, args=(filtered_list,), daemon=True).start()
+
+        # 새로 생기거나 바뀐 공연만 사전 번역
+        changed = performance_store.take_dirty()
+        if changed:
+            try:
+                translate_performance_data(changed)
+                _publish_snapshot()
+                scheduler_logger.info(f"공연 데이터 번역 완료: {len(changed)}건")
+            except Exception as e:
+                scheduler_logger.warning(f"공연 데이터 번역 실패: {e}")
 
     except Exception as e:
         scheduler_logger.error(f"자동 업데이트 오류: {e}")
@@ -481,29 +591,84 @@ def cache_status():
     })
 
 
+def get_paged_data():
+    """캐시 인덱스에서 필터 + 커서 페이지네이션 응답 (part/region/category/source, limit, cursor)"""
+    with cache_lock:
+        index = cache['index']
+        data = cache['data']
+    if index is None or data is None:
+        return jsonify({'success': False, 'error': '데이터를 준비 중입니다. 잠시 후 다시 시도해주세요.'})
+
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    position = index.decode_cursor(request.args.get('cursor', ''))
+    if position is None:
+        return jsonify({'success': False, 'error': '데이터가 갱신되었습니다. 처음부터 다시 조회해주세요.'})
+
+    filters = {field: request.args.get(field, '') for field in INDEXED_FIELDS}
+    items, next_position, total = index.page(filters, position, limit)
+    return compressed_json_response({
+        'success': True,
+        'data': items,
+        'total': total,
+        'next_cursor': index.encode_cursor(next_position),
+        'timestamp': data['timestamp'],
+        'stats': data['stats']
+    }, request)
+
+
+def _snapshot_response(part_filter='', region_filter=''):
+    """게시된 스냅샷으로 응답 (필터가 없으면 사전 압축 바이트 그대로)"""
+    with cache_lock:
+        response_entry = cache['response']
+        index = cache['index']
+        data = cache['data']
+    if response_entry is None or index is None:
+        return jsonify({'success': False, 'error': '데이터를 준비 중입니다. 잠시 후 다시 시도해주세요.'})
+    if not part_filter and not region_filter:
+        return precompressed_response(response_entry, request)
+
+    items, _, total = index.page({'part': part_filter, 'region': region_filter}, 0, len(index.items) or 1)
+    return compressed_json_response({
+        'success': True,
+        'data': items,
+        'timestamp': data['timestamp'],
+        'stats': dict(data['stats'], total=total)
+    }, request)
+
+
 @app.route('/api/all')
 def get_all_data():
     """모든 소스에서 데이터 통합 조회 (공연 기준 통합 + 판매처 표시)"""
     try:
+        # limit/cursor 지정 시 캐시 인덱스에서 필터된 페이지만 반환 (모바일 첫 화면용)
+        if request.args.get('limit') or request.args.get('cursor'):
+            return get_paged_data()
+
         # 캐시가 12시간 이내면 캐시 데이터 즉시 반환 (빠른 응답)
-        skip_selenium = request.args.get('skip_selenium', '') == 'true'
+        skip_selenium = request.args.get('skip_selenium', '') == 'true'  # Selenium 크롤링 스킵 (빠른 로딩용)
         with cache_lock:
-            if cache['data'] and cache['last_update']:
-                cache_age = (datetime.now() - cache['last_update']).total_seconds()
-                if cache_age < 12 * 3600 and skip_selenium:
-                    # 캐시 데이터에서 파트/지역 필터는 프론트에서 처리하므로 그대로 반환
-                    return jsonify(cache['data'])
+            response_entry = cache['response']
+            last_update = cache['last_update']
+        if response_entry and last_update and skip_selenium:
+            cache_age = (datetime.now() - last_update).total_seconds()
+            if cache_age < 12 * 3600:
+                # 캐시 데이터에서 파트/지역 필터는 프론트에서 처리하므로 사전 압축 바이트 그대로 반환
+                return precompressed_response(response_entry, request)
 
         start_date = request.args.get('start_date', datetime.now().strftime('%Y%m%d'))
         end_date = request.args.get('end_date', (datetime.now() + timedelta(days=60)).strftime('%Y%m%d'))
         genre = request.args.get('genre', '')
         part_filter = request.args.get('part', '')  # 파트 필터: concert / theater / (빈값=전체)
         region_filter = request.args.get('region', '')  # 지역 필터: 서울 / 경기·인천 / ... / (빈값=전체)
-        skip_selenium = request.args.get('skip_selenium', '') == 'true'  # Selenium 크롤링 스킵 (빠른 로딩용)
 
-        # 통합 공연 목록 (hash -> 공연 정보)
-        merged_performances = {}
-        source_counts = {'kopis': 0, 'interpark': 0, 'melon': 0, 'yes24': 0}
+        # 스케줄러 담당이 아닌 워커는 저장소가 비어 있으므로 수집/병합하지 않고 게시된 스냅샷으로 응답
+        if not scheduler_lock.held:
+            return _snapshot_response(part_filter, region_filter)
 
         # Phase 1: KOPIS 3장르 + 인터파크 병렬 수집
         def fetch_interpark_data():
@@ -517,97 +682,42 @@ def get_all_data():
                 return []
 
         with ThreadPoolExecutor(max_workers=4) as executor:
-            kopis_future = executor.submit(fetch_all_kopis, start_date, end_date)
+            kopis_future = executor.submit(performance_store.apply_stream, 'kopis', iter_kopis_pages(start_date, end_date))
             interpark_future = executor.submit(fetch_interpark_data)
 
-            # KOPIS 결과 병합
-            for perf in kopis_future.result():
-                merged_performances[perf['hash']] = perf
-                source_counts['kopis'] += 1
+            # KOPIS 결과 병합 (페이지 도착 즉시 변경분만, 일부 실패 시 기존 데이터 유지)
+            try:
+                kopis_future.result()
+            except Exception as e:
+                logging.warning(f"KOPIS 수집 일부 실패: {e}")
 
             # 인터파크 결과 병합
             interpark_items = interpark_future.result()
-            merge_source_data(merged_performances, interpark_items,
-                              '인터파크', '#ff6464', 'interpark', source_counts)
+            if interpark_items:
+                performance_store.apply_source('interpark', interpark_items)
 
         # Phase 2: 멜론 + YES24 병렬 수집 (skip_selenium이면 건너뜀)
         if not skip_selenium:
-            def fetch_melon_data():
-                """ThreadPoolExecutor 스레드에서 멜론 데이터 수집 (Flask 우회, subprocess 직접 호출)"""
-                try:
-                    script_path = os.path.join(os.path.dirname(__file__), 'playwright_crawler.py')
-                    result = subprocess.run(
-                        ['python', script_path, 'melon'],
-                        capture_output=True,
-                        timeout=120,
-                        cwd=os.path.dirname(__file__),
-                        encoding='utf-8',
-                        errors='replace'
-                    )
-                    if result.returncode == 0 and result.stdout:
-                        data = json.loads(result.stdout)
-                        return data.get('data', []) if data.get('success') else []
-                    return []
-                except Exception:
-                    return []
-
-            def fetch_yes24_data():
-                """ThreadPoolExecutor 스레드에서 YES24 데이터 수집 (Flask 우회, subprocess 직접 호출)"""
+            def fetch_crawler_data(job):
+                """ThreadPoolExecutor 스레드에서 멜론/YES24 데이터 수집 (Flask 우회, 크롤러 워커 직접 호출)"""
                 try:
-                    script_path = os.path.join(os.path.dirname(__file__), 'playwright_crawler.py')
-                    result = subprocess.run(
-                        ['python', script_path, 'yes24'],
-                        capture_output=True,
-                        timeout=120,
-                        cwd=os.path.dirname(__file__),
-                        encoding='utf-8',
-                        errors='replace'
-                    )
-                    if result.returncode == 0 and result.stdout:
-                        data = json.loads(result.stdout)
-                        return data.get('data', []) if data.get('success') else []
-                    return []
+                    data = run_crawler_job(job, timeout=120)
+                    return data.get('data', []) if data.get('success') else None
                 except Exception:
-                    return []
+                    return None
 
             with ThreadPoolExecutor(max_workers=2) as executor:
-                melon_future = executor.submit(fetch_melon_data)
-                yes24_future = executor.submit(fetch_yes24_data)
-
-                merge_source_data(merged_performances, melon_future.result(),
-                                  '멜론티켓', '#00cd3c', 'melon', source_counts)
-                merge_source_data(merged_performances, yes24_future.result(),
-                                  'YES24', '#ffc800', 'yes24', source_counts)
-
-        # 리스트 변환 + 필터 적용
-        performances_list = list(merged_performances.values())
-        if part_filter:
-            performances_list = [p for p in performances_list if p.get('part') == part_filter]
-        if region_filter:
-            performances_list = [p for p in performances_list if p.get('region') == region_filter]
-
-        # 종료된 공연 필터링 + 정렬
-        performances_list = filter_ended_performances(performances_list)
-        sort_by_dday(performances_list)
-
-        # 공연 데이터 사전 번역 (스케줄러에서 백그라운드 처리, API 응답 지연 방지)
-        # try:
-        #     translate_performance_data(performances_list)
-        # except Exception as e:
-        #     logging.warning(f"공연 데이터 번역 실패: {e}")
+                melon_future = executor.submit(fetch_crawler_data, 'melon')
+                yes24_future = executor.submit(fetch_crawler_data, 'yes24')
 
-        return jsonify({
-            'success': True,
-            'data': performances_list,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'stats': {
-                'kopis': source_counts['kopis'],
-                'interpark': source_counts['interpark'],
-                'melon': source_counts['melon'],
-                'yes24': source_counts['yes24'],
-                'total': len(performances_list)
-            }
-        })
+                for source_key, future in (('melon', melon_future), ('yes24', yes24_future)):
+                    items = future.result()
+                    if items is not None:
+                        performance_store.apply_source(source_key, items)
+
+        # 수집 결과를 캐시/공유 스냅샷으로 게시 (다른 워커와 이후 캐시 응답에도 반영)
+        _publish_snapshot()
+        return _snapshot_response(part_filter, region_filter)
 
     except Exception as e:
         logging.error(f"전체 데이터 로딩 오류: {e}", exc_info=True)
@@ -616,7 +726,7 @@ def get_all_data():
 
 @app.route('/api/proxy/image')
 def proxy_image():
-    """외부 이미지 프록시 (캐싱 지원)"""
+    """외부 이미지 프록시 (캐싱 지원, ?w=폭&format=webp|avif 로 썸네일/형식 변환)"""
     url = request.args.get('url', '')
     if not url:
         return '', 404
@@ -624,15 +734,48 @@ def proxy_image():
     if not is_safe_url(url):
         return '', 403
 
-    content, content_type, status_code = get_cached_or_download(url)
-    if content and status_code == 200:
-        return content, 200, {'Content-Type': content_type, 'Cache-Control': 'max-age=86400'}
-    return '', status_code
+    cache_path, content_type, etag, status_code = get_image_variant(
+        url, request.args.get('w'), request.args.get('format', '')
+    )
+    if not cache_path or status_code != 200:
+        return '', status_code
+
+    headers = {'ETag': f'"{etag}"', 'Cache-Control': 'public, max-age=86400'}
+    if etag_matches(request.headers.get('If-None-Match'), headers['ETag']):
+        return Response(status=304, headers=headers)
+
+    # nginx가 캐시 파일을 직접 전송 (본문은 파이썬을 거치지 않음)
+    if IMAGE_ACCEL_REDIRECT_PREFIX:
+        headers['X-Accel-Redirect'] = IMAGE_ACCEL_REDIRECT_PREFIX + os.path.basename(cache_path)
+        return Response(status=200, mimetype=content_type, headers=headers)
+
+    # sendfile(wsgi.file_wrapper)로 전송, Range/If-Modified-Since 처리 포함
+    response = send_file(cache_path, mimetype=content_type, etag=etag, conditional=True, max_age=86400)
+    response.headers['Cache-Control'] = headers['Cache-Control']
+    return response
+
+
+# 브라우저 없이 먼저 시도하는 HTTP 수집 (None이면 크롤러 워커로 넘김)
+DETAIL_FAST_PATHS = {
+    'yes24_detail': fetch_yes24_detail_http,
+}
+
+
+def _crawl_ticket_detail(cache_key, job, arg):
+    """상세 크롤링 1회 실행 (HTTP 우선, 막히면 브라우저) + 성공 시 캐시 저장"""
+    fast_path = DETAIL_FAST_PATHS.get(job)
+    data = fast_path(arg) if fast_path else None
+    if data is None:
+        data = run_crawler_job(job, arg, timeout=60)
+    data.setdefault('data', {})
+    if data.get('success'):
+        ticket_detail_cache.put(cache_key, data)
+    return data
 
 
 @app.route('/api/ticketing/detail')
 def get_ticket_detail():
-    """멜론/YES24 상세 정보 조회 (Selenium - subprocess)"""
+    """멜론/YES24 상세 정보 조회 (캐시 우선, 만료 시 이전 값 반환 + 백그라운드 갱신)"""
     try:
         source = request.args.get('source', '')
         link = request.args.get('link', '')
@@ -640,57 +783,37 @@ def get_ticket_detail():
         if not source or not link:
             return jsonify({'success': False, 'error': 'source와 link 파라미터가 필요합니다.'})
 
-        script_path = os.path.join(os.path.dirname(__file__), 'playwright_crawler.py')
-
         # 링크에서 ID 추출
         if source == 'melon' or '멜론' in source:
             # 멜론 링크에서 prodId 추출
-            import re
             match = re.search(r'prodId=(\d+)', link)
             if not match:
                 return jsonify({'success': False, 'error': 'prodId를 찾을 수 없습니다.'})
-            prod_id = match.group(1)
-
-            result = subprocess.run(
-                ['python', script_path, 'melon_detail', prod_id],
-                capture_output=True,
-                timeout=60,
-                cwd=os.path.dirname(__file__),
-                encoding='utf-8',
-                errors='replace'
-            )
+            job, arg = 'melon_detail', match.group(1)
 
         elif source == 'yes24' or 'YES24' in source:
             # YES24 링크에서 PerfCode 추출
-            import re
             match = re.search(r'/Perf/(\d+)', link) or re.search(r'PerfCode=(\d+)', link)
             if not match:
                 return jsonify({'success': False, 'error': 'PerfCode를 찾을 수 없습니다.'})
-            perf_code = match.group(1)
-
-            result = subprocess.run(
-                ['python', script_path, 'yes24_detail', perf_code],
-                capture_output=True,
-                timeout=60,
-                cwd=os.path.dirname(__file__),
-                encoding='utf-8',
-                errors='replace'
-            )
+            job, arg = 'yes24_detail', match.group(1)
 
         else:
             return jsonify({'success': False, 'error': f'지원하지 않는 소스: {source}'})
 
-        if result.returncode == 0 and result.stdout:
-            data = json.loads(result.stdout)
+        cache_key = f"{job}:{arg}"
+        cached = ticket_detail_cache.get_entry(cache_key)
+        if cached is not None:
+            data, saved_at = cached
+            if not ticket_detail_cache.is_fresh(saved_at):
+                ticket_detail_flight.do_async(cache_key, lambda: _crawl_ticket_detail(cache_key, job, arg))
             return jsonify(data)
-        else:
-            return jsonify({
-                'success': False,
-                'error': result.stderr or 'No output',
-                'data': {}
-            })
 
-    except subprocess.TimeoutExpired:
+        # 캐시 없음: 같은 공연 동시 요청은 진행 중인 크롤링 1건의 결과를 공유
+        data = ticket_detail_flight.do(cache_key, lambda: _crawl_ticket_detail(cache_key, job, arg))
+        return jsonify(data)
+
+    except CrawlerTimeout:
         return jsonify({'success': False, 'error': 'Timeout (1분 초과)', 'data': {}})
     except Exception as e:
         logging.error(f"티켓 상세 조회 오류: {e}", exc_info=True)
@@ -699,7 +822,7 @@ def get_ticket_detail():
 
 @app.route('/api/search')
 def search_all():
-    """통합 검색"""
+    """통합 검색 (메모리 역색인, 결과 없거나 kopis=true면 KOPIS 실시간 검색 병행)"""
     keyword = request.args.get('keyword', '')
 
     if not keyword:
@@ -707,11 +830,20 @@ def search_all():
 
     results = {
         'keyword': keyword,
+        'items': [],
         'kopis': [],
         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     }
 
-    # KOPIS 검색
+    # 로컬 인덱스 검색 (전체 소스)
+    with cache_lock:
+        search_index = cache['search']
+    if search_index is not None:
+        results['items'] = search_index.search(keyword)
+        if results['items'] and request.args.get('kopis', '') != 'true':
+            return jsonify({'success': True, 'data': results})
+
+    # KOPIS 검색 (폴백)
     try:
         start_date = datetime.now().strftime('%Y%m%d')
         end_date = (datetime.now() + timedelta(days=90)).strftime('%Y%m%d')
@@ -725,23 +857,18 @@ def search_all():
             'shprfnm': keyword
         }
 
-        response = requests.get(f"{KOPIS_BASE_URL}/pblprfr", params=params, timeout=10)
-
-        if response.status_code == 200:
-            root = ET.fromstring(response.content)
-            for db in root.findall('.//db'):
-                name = db.find('prfnm').text if db.find('prfnm') is not None else ''
-                results['kopis'].append({
-                    'id': db.find('mt20id').text if db.find('mt20id') is not None else '',
-                    'name': name,
-                    'venue': db.find('fcltynm').text if db.find('fcltynm') is not None else '',
-                    'start_date': db.find('prfpdfrom').text if db.find('prfpdfrom') is not None else '',
-                    'end_date': db.find('prfpdto').text if db.find('prfpdto') is not None else '',
-                    'poster': db.find('poster').text if db.find('poster') is not None else '',
-                    'genre': db.find('genrenm').text if db.find('genrenm') is not None else '',
-                    'source': 'KOPIS',
-                    'source_color': '#00d4ff'
-                })
+        for db in fetch_kopis_records('pblprfr', params):
+            results['kopis'].append({
+                'id': db.get('mt20id', ''),
+                'name': db.get('prfnm', ''),
+                'venue': db.get('fcltynm', ''),
+                'start_date': db.get('prfpdfrom', ''),
+                'end_date': db.get('prfpdto', ''),
+                'poster': db.get('poster', ''),
+                'genre': db.get('genrenm', ''),
+                'source': 'KOPIS',
+                'source_color': '#00d4ff'
+            })
     except Exception as e:
         results['kopis_error'] = str(e)
 
@@ -794,11 +921,9 @@ def translate_batch_api():
     if not texts:
         return jsonify({'success': False, 'error': '번역할 텍스트가 없습니다.'})
 
-    results = []
-    for text in texts[:50]:
-        translated = translate_text(text, from_lang, to_lang)
-        results.append({'original': text, 'translated': translated})
-        time_module.sleep(0.1)
+    texts = texts[:50]
+    translated = translate_texts(texts, from_lang, to_lang)
+    results = [{'original': t, 'translated': r} for t, r in zip(texts, translated)]
 
     return jsonify({'success': True, 'results': results, 'from': from_lang, 'to': to_lang})
 
@@ -806,13 +931,35 @@ def translate_batch_api():
 # gunicorn 호환: 모듈 로드 시 스케줄러 자동 시작
 _scheduler = None
 
-def start_scheduler_once():
-    """스케줄러 1회만 시작 (중복 방지)"""
+def _become_scheduler():
+    """스케줄러 담당이 되면 스케줄러 시작 + 최초 1회 데이터 갱신 (백그라운드)"""
     global _scheduler
-    if _scheduler is None:
-        _scheduler = init_scheduler()
-        # 최초 1회 데이터 갱신 (백그라운드)
-        threading.Thread(target=scheduled_update, daemon=True).start()
+    _scheduler = init_scheduler()
+    start_cache_maintenance()
+    kopis_detail_cache.start_compactor()
+    ticket_detail_cache.start_compactor()
+    start_image_cache_maintenance()
+    threading.Thread(target=scheduled_update, daemon=True).start()
+
+
+def _wait_for_scheduler_lock():
+    """담당 프로세스가 종료되면 잠금을 이어받아 스케줄러 승계"""
+    if scheduler_lock.acquire(blocking=True):
+        scheduler_logger.info(f"스케줄러 담당 승계 (pid {os.getpid()})")
+        _become_scheduler()
+
+
+def start_scheduler_once():
+    """워커 중 1개만 스케줄러 시작 (파일 잠금 선출), 나머지는 게시된 스냅샷 사용"""
+    if _scheduler is not None:
+        return
+    # 직전 게시 스냅샷으로 즉시 응답 가능 상태 만들기 (새 워커 콜드 스타트 방지)
+    sync_shared_cache(force=True)
+    if scheduler_lock.acquire():
+        _become_scheduler()
+    else:
+        scheduler_logger.info(f"다른 프로세스가 스케줄러 담당, 공유 스냅샷 사용 (pid {os.getpid()})")
+        threading.Thread(target=_wait_for_scheduler_lock, daemon=True).start()
 
 # gunicorn으로 실행 시에도 스케줄러 시작
 start_scheduler_once()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+공연명 분류기 벤치마크 (키워드별 정규식 순회 vs 현재 구현)
+- categorize_concert: Aho-Corasick 오토마톤 (카테고리 10여 개 × 키워드 수백 개)
+- classify_part: 연극 키워드를 합친 정규식 1개 (같은 키워드의 오토마톤과도 비교)
+test_full.json 공연명 + 키워드 경계 사례로 결과가 같은지 확인한 뒤 건당 처리 시간 비교
+
+실행: python benchmarks/bench_classifier.py [반복 횟수]
+"""
+import os
+import sys
+import json
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from constants import (  # noqa: E402
+    CONCERT_CATEGORIES, CONCERT_CATEGORY_PATTERNS, THEATER_KEYWORDS, THEATER_KEYWORD_PATTERNS,
+    categorize_concert, classify_part, _is_ascii_keyword
+)
+from utils.keyword_matcher import KeywordMatcher  # noqa: E402
+
+THEATER_KEYWORD_MATCHER = KeywordMatcher([('theater', THEATER_KEYWORDS)], word_boundary=_is_ascii_keyword)
+
+KOPIS_GENRES = ['연극', '뮤지컬', '대중음악', '서양음악(클래식)', '한국음악(국악)', '무용(서양/한국무용)', '복합', '']
+
+
+def legacy_categorize_concert(name):
+    """이전 구현: 카테고리/키워드별 정규식 순차 검색"""
+    if not name:
+        return "기타"
+    for category, patterns in CONCERT_CATEGORY_PATTERNS.items():
+        for keyword, pattern in patterns:
+            if pattern.search(name):
+                return category
+    return "기타"
+
+
+def legacy_classify_part(name, genre=''):
+    """이전 구현: 장르 → 공연명 순으로 정규식 순차 검색"""
+    if not name:
+        return 'concert'
+    if genre:
+        for kw, pattern in THEATER_KEYWORD_PATTERNS:
+            if pattern.search(genre):
+                return 'theater'
+    for kw, pattern in THEATER_KEYWORD_PATTERNS:
+        if pattern.search(name):
+            return 'theater'
+    return 'concert'
+
+
+def automaton_classify_part(name, genre=''):
+    """비교용: 연극 키워드 오토마톤"""
+    if not name:
+        return 'concert'
+    if genre and THEATER_KEYWORD_MATCHER.search(genre):
+        return 'theater'
+    if THEATER_KEYWORD_MATCHER.search(name):
+        return 'theater'
+    return 'concert'
+
+
+def load_names():
+    with open(os.path.join(ROOT, 'test_full.json'), 'r', encoding='utf-8') as f:
+        return [item.get('name', '') for item in json.load(f)['data']]
+
+
+def edge_cases():
+    """키워드를 앞뒤 문자/대소문자를 바꿔 끼운 경계 사례"""
+    keywords = THEATER_KEYWORDS + [kw for kws in CONCERT_CATEGORIES.values() for kw in kws]
+    cases = ['', ' ', 'İstanbul IVE', 'ſolo BTS']
+    for kw in keywords:
+        for text in (kw, kw.lower(), kw.upper()):
+            cases += [text, f'[{text}]', f'a{text}', f'{text}1', f'가{text}나', f'{text} 2026 콘서트', f'X{text}Y']
+    return cases
+
+
+def bench(fn, args_list, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for args in args_list:
+            fn(*args)
+    return (time.perf_counter() - start) / (repeat * len(args_list)) * 1e6
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    names = load_names()
+    corpus = names + edge_cases()
+
+    # 메모 계층을 거치지 않고 분류 자체의 비용만 비교
+    new_categorize = categorize_concert.__wrapped__
+    new_classify_part = classify_part.__wrapped__
+
+    mismatches = []
+    for name in corpus:
+        if new_categorize(name) != legacy_categorize_concert(name):
+            mismatches.append(('categorize_concert', name))
+        for genre in KOPIS_GENRES:
+            if new_classify_part(name, genre) != legacy_classify_part(name, genre):
+                mismatches.append(('classify_part', name, genre))
+            if automaton_classify_part(name, genre) != legacy_classify_part(name, genre):
+                mismatches.append(('automaton_classify_part', name, genre))
+    print(f"검증: 공연명 {len(names)}건 + 경계 사례 {len(corpus) - len(names)}건, 불일치 {len(mismatches)}건")
+    for case in mismatches[:20]:
+        print('  ', case)
+
+    name_args = [(n,) for n in names]
+    part_args = [(n, '뮤지컬' if i % 3 == 0 else '') for i, n in enumerate(names)]
+    rows = [
+        ('categorize_concert', '오토마톤', bench(legacy_categorize_concert, name_args, repeat),
+         bench(new_categorize, name_args, repeat)),
+        ('classify_part', '합친 정규식', bench(legacy_classify_part, part_args, repeat),
+         bench(new_classify_part, part_args, repeat)),
+        ('  (비교) 오토마톤', '오토마톤', bench(legacy_classify_part, part_args, repeat),
+         bench(automaton_classify_part, part_args, repeat)),
+    ]
+    print(f"\n{'함수':<20}{'구현':<10}{'이전(µs/건)':>14}{'현재(µs/건)':>14}{'배율':>8}")
+    for fn_name, impl, old, new in rows:
+        print(f"{fn_name:<20}{impl:<10}{old:>14.2f}{new:>14.2f}{old / new:>7.1f}x")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+소스 간 유사 공연 병합 벤치마크
+1) 라벨 쌍(benchmarks/fixtures/dedup_pairs.json) 기준 신뢰도 판정 정밀도/재현율
+   (기준값/감점 조정에 쓴 쌍, ambiguous 라벨은 집계에서 빼고 판정 결과만 출력)
+2) test_full.json을 소스별로 나눠 PerformanceStore에 넣었을 때 실제 병합 결과의 정밀도/재현율
+3) 조정에 쓰지 않은 검증용 쌍(benchmarks/fixtures/dedup_holdout.json) 기준 정밀도/재현율
+4) 레코드 수를 늘려 가며 LSH 후보 비교 횟수/시간 (전체 쌍 비교 대비)
+
+실행: python benchmarks/bench_dedup.py [최대 레코드 수]
+"""
+import os
+import sys
+import copy
+import json
+import time
+import random
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('SHARED_CACHE_DIR', tempfile.mkdtemp(prefix='bench_dedup_'))
+
+from services.dedup import DedupIndex, MATCH_THRESHOLD, _Entry, match_score  # noqa: E402
+from services.merge_store import PerformanceStore  # noqa: E402
+
+SOURCE_KEYS = {'인터파크': 'interpark', '멜론티켓': 'melon', 'YES24': 'yes24'}
+
+
+def load_pairs(filename):
+    with open(os.path.join(ROOT, 'benchmarks', 'fixtures', filename), 'r', encoding='utf-8') as f:
+        return json.load(f)['pairs']
+
+
+def load_data():
+    with open(os.path.join(ROOT, 'test_full.json'), 'r', encoding='utf-8') as f:
+        data = json.load(f)['data']
+    return data, load_pairs('dedup_pairs.json')
+
+
+def precision_recall(predicted, pairs):
+    tp = sum(1 for p in pairs if p['label'] == 'same' and predicted(p))
+    fp = sum(1 for p in pairs if p['label'] == 'different' and predicted(p))
+    fn = sum(1 for p in pairs if p['label'] == 'same' and not predicted(p))
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    return precision, recall, tp, fp, fn
+
+
+def pair_key(p):
+    """쌍 식별자 (항목을 직접 적은 쪽은 공연명 사용)"""
+    return tuple(side if isinstance(side, str) else side['name'] for side in (p['a'], p['b']))
+
+
+def pair_scores(data, pairs):
+    """라벨 쌍별 신뢰도 (LSH 후보에 들지 못하면 0) - 쌍의 a/b는 test_full.json hash 또는 항목 dict"""
+    by_hash = {item['hash']: item for item in data}
+    scores = {}
+    for p in pairs:
+        a, b = (by_hash[side] if isinstance(side, str) else side for side in (p['a'], p['b']))
+        index = DedupIndex()
+        index.add('b', b)
+        entry = _Entry(a)
+        candidate = 'b' in index.candidates(entry)
+        scores[pair_key(p)] = match_score(entry, index.entries['b']) if candidate else 0.0
+    return scores
+
+
+def report_pairs(title, scores, pairs):
+    """쌍 판정 정밀도/재현율 + 틀린 쌍 출력 (ambiguous는 집계 없이 판정만) → FP 수"""
+    labelled = [p for p in pairs if p['label'] != 'ambiguous']
+    precision, recall, tp, fp, fn = precision_recall(lambda p: scores[pair_key(p)] >= MATCH_THRESHOLD, labelled)
+    print(f"{title} (기준 {MATCH_THRESHOLD}, {len(labelled)}쌍): 정밀도 {precision:.2f} 재현율 {recall:.2f} "
+          f"(TP {tp} / FP {fp} / FN {fn})")
+    for p in pairs:
+        score = scores[pair_key(p)]
+        if p['label'] == 'ambiguous' or (score >= MATCH_THRESHOLD) != (p['label'] == 'same'):
+            print(f"   {p['label']:<9} {score:.3f} {p['a_name']} ↔ {p['b_name']}")
+    return fp
+
+
+def store_groups(data):
+    """소스별로 나눠 저장소에 반영 → {원본 hash: 병합된 레코드 hash}"""
+    by_source = {key: [] for key in ('kopis', 'interpark', 'melon', 'yes24')}
+    for item in data:
+        item = copy.deepcopy(item)
+        item.pop('available_sites', None)
+        by_source[SOURCE_KEYS.get(item.get('source'), 'kopis')].append(item)
+
+    store = PerformanceStore()
+    start = time.perf_counter()
+    store.apply_stream('kopis', [by_source['kopis']])
+    for key in ('interpark', 'melon', 'yes24'):
+        store.apply_source(key, by_source[key])
+    elapsed = time.perf_counter() - start
+
+    groups = {}
+    for key, entries in store.sources.items():
+        for record_hash, (_, item) in entries.items():
+            groups[item['hash']] = record_hash
+    return groups, len(store.records), elapsed
+
+
+def synthetic_names(n, rng):
+    """같은 공연의 소스별 표기 차이를 흉내 낸 (원본, 변형) 공연명 쌍"""
+    syllables = [chr(code) for code in range(0xAC00, 0xAC00 + 2000)]  # 실제 공연명처럼 음절 분포가 넓도록
+    suffixes = ['', ' 단독 콘서트', ' [서울]', ' - 앵콜', ' (2026)', ' 전국투어']
+    pairs = []
+    for _ in range(n):
+        title = ''.join(rng.choice(syllables) for _ in range(rng.randint(3, 5))) + ' ' + ''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        variant = title.replace(' ', '', 1) + rng.choice(suffixes)
+        pairs.append((title, variant))
+    return pairs
+
+
+def scaling(max_n):
+    rng = random.Random(7)
+    print(f"\n{'레코드':>8}{'후보 비교':>12}{'전체 쌍':>14}{'비율':>9}{'시간(ms)':>10}{'재현율':>8}")
+    n = 500
+    while n <= max_n:
+        index = DedupIndex()
+        names = synthetic_names(n, rng)
+        for i, (title, _) in enumerate(names):
+            index.add(str(i), {'name': title, 'start_date': '2026.05.01', 'end_date': '2026.05.03'})
+        comparisons = found = 0
+        start = time.perf_counter()
+        for i, (_, variant) in enumerate(names):
+            entry = _Entry({'name': variant, 'start_date': '2026.05.02', 'end_date': '2026.05.02'})
+            comparisons += len(index.candidates(entry))
+            match = index.match({'name': variant, 'start_date': '2026.05.02', 'end_date': '2026.05.02'})
+            found += match is not None and match[0] == str(i)
+        elapsed = (time.perf_counter() - start) * 1000
+        full = n * n
+        print(f"{n:>8}{comparisons:>12}{full:>14}{comparisons / full:>9.4f}{elapsed:>10.1f}{found / n:>8.2f}")
+        n *= 2
+
+
+def main():
+    max_n = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    data, pairs = load_data()
+
+    fp = report_pairs('쌍 판정 - 조정용', pair_scores(data, pairs), pairs)
+
+    groups, record_count, elapsed = store_groups(data)
+    precision, recall, tp, store_fp, fn = precision_recall(
+        lambda p: p['a'] in groups and groups.get(p['a']) == groups.get(p['b']),
+        [p for p in pairs if p['label'] != 'ambiguous'])
+    merged = len(data) - record_count
+    print(f"저장소 병합: 입력 {len(data)}건 → 레코드 {record_count}건 (병합 {merged}건, {elapsed * 1000:.0f}ms)")
+    print(f"   정밀도 {precision:.2f} 재현율 {recall:.2f} (TP {tp} / FP {store_fp} / FN {fn})")
+
+    holdout = load_pairs('dedup_holdout.json')
+    holdout_fp = report_pairs('쌍 판정 - 검증용', pair_scores(data, holdout), holdout)
+
+    scaling(max_n)
+    return 1 if fp or store_fp or holdout_fp else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
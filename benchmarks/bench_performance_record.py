@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+공연 레코드 메모리/직렬화 벤치마크 (dict vs Performance 슬롯 레코드)
+워커가 공유 스냅샷을 읽는 것과 같이 JSON 바이트에서 목록을 만든 뒤
+tracemalloc으로 상주 메모리를, 응답 캐시와 같은 방식의 UTF-8 JSON 직렬화 시간을 비교
+(dict: json.dumps, Performance: to_json 조각 - 최초 생성/캐시 재사용 구분)
+레코드 직렬화(캐시 재사용)가 dict 기준보다 느리면 종료 코드 1
+
+실행: python benchmarks/bench_performance_record.py [복제 배수]
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('SHARED_CACHE_DIR', tempfile.mkdtemp(prefix='bench_record_'))
+
+from services.performance import Performance, TRANSLATED_FIELDS, json_default  # noqa: E402
+
+
+def snapshot_bytes(copies):
+    """test_full.json을 복제 + 번역 필드/수집 시각을 채운 스냅샷 JSON 바이트"""
+    with open(os.path.join(ROOT, 'test_full.json'), 'r', encoding='utf-8') as f:
+        data = json.load(f)['data']
+    items = []
+    for i in range(copies):
+        for item in data:
+            item = dict(item, hash=f"{item['hash']}{i}", first_seen='2026-10-18 00:00:00',
+                        last_seen='2026-10-18 12:00:00')
+            for field in TRANSLATED_FIELDS:
+                base = item.get(field.rsplit('_', 1)[0], '')
+                item[field] = f"{base} ({field[-2:]})" if field.startswith('name_') else base
+            items.append(item)
+    return json.dumps({'data': items}, ensure_ascii=False).encode('utf-8')
+
+
+def measure(build, body):
+    tracemalloc.start()
+    start = time.perf_counter()
+    items = build(body)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return items, size, elapsed
+
+
+def dump_dicts(items):
+    return json.dumps(items, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def dump_records(items):
+    return b'[' + b','.join([item.to_json() for item in items]) + b']'
+
+
+def dump_time(dump, items, repeat=5, reset=False):
+    """최소 소요 시간 (초) - reset이면 매번 레코드 조각 캐시를 비우고 측정 (최초 직렬화)"""
+    best = float('inf')
+    for _ in range(repeat):
+        if reset:
+            for item in items:
+                item._json = None
+        start = time.perf_counter()
+        dump(items)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    body = snapshot_bytes(copies)
+
+    dicts, dict_size, dict_load = measure(lambda b: json.loads(b)['data'], body)
+    records, record_size, record_load = measure(lambda b: [Performance(item) for item in json.loads(b)['data']], body)
+
+    # 최초 직렬화 (조각 생성) → 이후 재사용, 조각 캐시가 차지하는 메모리 포함
+    dict_dump = dump_time(dump_dicts, dicts)
+    cold = dump_time(dump_records, records, reset=True)
+    record_dump = dump_time(dump_records, records)
+    same = (json.dumps(dicts, sort_keys=True) == json.dumps(records, sort_keys=True, default=json_default)
+            and all(json.loads(record.to_json()) == record.to_dict() for record in records))
+    tracemalloc.start()
+    fresh = [Performance(item) for item in json.loads(body)['data']]
+    dump_records(fresh)
+    cached_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del fresh
+
+    print(f"공연 {len(dicts)}건 (필드 평균 {sum(map(len, dicts)) / len(dicts):.1f}개), 직렬화 결과 동일: {same}")
+    print(f"\n{'':<22}{'메모리(MB)':>12}{'건당(B)':>10}{'로드(ms)':>10}{'직렬화(ms)':>12}")
+    rows = (('dict', dict_size, dict_load, dict_dump),
+            ('Performance (최초)', record_size, record_load, cold),
+            ('Performance (캐시)', cached_size, record_load, record_dump))
+    for label, size, load, dump in rows:
+        print(f"{label:<22}{size / 1e6:>12.2f}{size / len(dicts):>10.0f}{load * 1000:>10.1f}{dump * 1000:>12.1f}")
+    print(f"\n메모리 {1 - record_size / dict_size:.0%} 감소 (조각 캐시 포함 {1 - cached_size / dict_size:.0%})")
+
+    # 응답마다 반복되는 경로는 캐시 재사용, 최초 생성은 갱신(게시) 1회라 참고용으로만 출력
+    fast_enough = record_dump <= dict_dump
+    print(f"레코드 직렬화 최초 {cold / dict_dump:.2f}배 / 캐시 {record_dump / dict_dump:.2f}배 "
+          f"(dict 대비, 캐시 1 이하 통과): {'통과' if fast_enough else '실패'}")
+    return 0 if same and fast_enough else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
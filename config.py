@@ -24,6 +24,12 @@ GENRE_CODES = {
     'theater': GENRE_CODE_THEATER
 }
 
+# KOPIS 목록 페이지 수집 (총 건수를 알려주지 않으므로 마지막 페이지가 덜 찰 때까지 묶음 단위로 요청)
+KOPIS_PAGE_ROWS = 100        # 페이지당 건수
+KOPIS_PAGE_WAVE = 4          # 장르별로 한 번에 미리 요청하는 페이지 수
+KOPIS_MAX_WORKERS = 8        # 동시 요청 수
+KOPIS_RATE_PER_SEC = 10      # KOPIS 호스트 초당 요청 수
+
 # =============================================
 # 보안 설정
 # =============================================
@@ -40,8 +46,22 @@ ALLOWED_IMAGE_DOMAINS = [
 # 이미지 캐시 설정
 # =============================================
 IMAGE_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'image_cache')
-MAX_CACHE_FILES = 500       # 최대 캐시 파일 수
+MAX_CACHE_FILES = 3000      # 최대 캐시 파일 수 (원본 + 썸네일 파생 파일)
 MAX_CACHE_SIZE_MB = 200     # 최대 캐시 크기 (MB)
+IMAGE_CACHE_EVICT_SECONDS = 60  # 백그라운드 정리 주기 (초, 스케줄러 담당 프로세스만)
+IMAGE_CACHE_RECONCILE_SECONDS = 3600  # 디렉터리 전체 대조 주기 (초, 인덱스 밖 파일 등록/사라진 파일 제거)
+IMAGE_CACHE_TOUCH_SECONDS = 30  # 워커별 마지막 접근 시각 반영 주기 (초)
+# nginx 앞단 사용 시 internal location 접두사 (예: /_image_cache/ → alias image_cache/), 비우면 send_file로 직접 전송
+IMAGE_ACCEL_REDIRECT_PREFIX = os.environ.get('IMAGE_ACCEL_REDIRECT_PREFIX', '')
+IMAGE_POOL_SIZE = 8             # 업스트림 이미지 호스트별 keep-alive 연결 수
+IMAGE_NEGATIVE_CACHE_SECONDS = 6 * 3600  # 로고/없는 이미지 URL 재다운로드 방지 기간
+IMAGE_HOST_CONCURRENCY = int(os.environ.get('IMAGE_HOST_CONCURRENCY', '4'))  # 호스트별 동시 다운로드 수
+# 갱신 직후 미리 만들어 둘 카드 썸네일 (프론트 카드 그리드의 1x/2x 폭과 일치시킬 것)
+IMAGE_PREGEN_WIDTHS = (320, 640)
+IMAGE_PREGEN_FORMAT = os.environ.get('IMAGE_PREGEN_FORMAT', 'webp')
+IMAGE_PREGEN_WORKERS = int(os.environ.get('IMAGE_PREGEN_WORKERS', '2'))  # 예열 썸네일 변환 스레드 수 (Pillow 변환이 요청 처리와 CPU를 나눠 씀)
+IMAGE_PREGEN_NICE = int(os.environ.get('IMAGE_PREGEN_NICE', '10'))  # 예열 변환 스레드 nice 값 (Linux, 0이면 변경 안 함)
+IMAGE_PREGEN_IO_WORKERS = int(os.environ.get('IMAGE_PREGEN_IO_WORKERS', '16'))  # 예열 원본 다운로드 스레드 상한 (호스트별로는 IMAGE_HOST_CONCURRENCY)
 
 # =============================================
 # 번역 설정
@@ -56,10 +76,79 @@ LANG_CODES = {
     'es': 'es'
 }
 
-TRANSLATION_CACHE_FILE = os.path.join(os.path.dirname(__file__), 'translation_cache.json')
+TRANSLATION_CACHE_FILE = os.path.join(os.path.dirname(__file__), 'translation_cache.json')  # 구버전 (SQLite로 1회 이전)
+TRANSLATION_CACHE_DB = os.environ.get('TRANSLATION_CACHE_DB', os.path.join(os.path.dirname(__file__), 'translation_cache.db'))
 TRANSLATION_CACHE_TTL_DAYS = 30       # 캐시 만료 기간 (일)
-TRANSLATION_CACHE_MAX_ENTRIES = 10000  # 최대 항목 수
-TRANSLATION_CACHE_MAX_FILE_MB = 5     # 최대 파일 크기 (MB)
+TRANSLATION_CACHE_MAX_ENTRIES = 100000  # 최대 항목 수 (초과분은 백그라운드 정리 시 오래된 순 삭제)
+TRANSLATION_CACHE_COMPACT_HOURS = 6   # 백그라운드 정리 주기 (시간)
+
+# 번역 API (MyMemory 호환, 테스트 시 로컬 스텁 서버 URL로 교체 가능)
+TRANSLATION_API_URL = os.environ.get('TRANSLATION_API_URL', 'https://api.mymemory.translated.net/get')
+TRANSLATION_CONCURRENCY = int(os.environ.get('TRANSLATION_CONCURRENCY', 4))   # 동시 요청 수
+TRANSLATION_RATE_PER_SEC = float(os.environ.get('TRANSLATION_RATE_PER_SEC', 5))  # 초당 요청 수 (429 시 자동 감속)
+TRANSLATION_BATCH_SIZE = 8           # 요청 1회에 묶는 최대 구간 수
+TRANSLATION_BATCH_MAX_CHARS = 450    # 요청 1회 최대 글자 수 (MyMemory q 제한 500자)
+TRANSLATION_MAX_RETRIES = 4          # 429 재시도 횟수
+
+# =============================================
+# 데이터 갱신 설정
+# =============================================
+SOURCE_STALE_HOURS = 24  # 이 시간 이상 갱신되지 않은 소스 데이터는 병합 저장소에서 제거
+
+# 워커 간 공유 캐시: 파일 잠금을 잡은 프로세스 1개만 스케줄러 실행 + 스냅샷 게시
+SHARED_CACHE_DIR = os.environ.get('SHARED_CACHE_DIR', os.path.join(os.path.dirname(__file__), 'shared_cache'))
+SCHEDULER_LOCK_FILE = os.path.join(SHARED_CACHE_DIR, 'scheduler.lock')
+SHARED_CACHE_CHECK_SECONDS = 5  # 다른 워커의 새 스냅샷 확인 주기 (초)
+
+# 공연명 분류/정규화 결과 메모 (constants.py 키워드 테이블이 바뀌면 자동 무효화)
+CLASSIFY_MEMO_FILE = os.path.join(SHARED_CACHE_DIR, 'classify_memo.json')
+CLASSIFY_MEMO_MAX_ENTRIES = 50000
+CLASSIFY_MEMO_SAVE_SECONDS = 300  # 스냅샷 저장 주기 (초)
+
+# KOPIS area로 학습한 공연장명 → 지역 색인 (area 없는 인터파크/멜론/YES24 지역 분류용)
+VENUE_INDEX_FILE = os.path.join(SHARED_CACHE_DIR, 'venue_regions.json')
+
+# 공연별 최초 수집 시각 (재시작/스케줄러 담당 교체 후에도 first_seen 유지)
+FIRST_SEEN_FILE = os.path.join(SHARED_CACHE_DIR, 'first_seen.json')
+
+# KOPIS 상세정보 캐시 (워커 메모리 LRU + 공유 SQLite)
+DETAIL_CACHE_DB = os.path.join(SHARED_CACHE_DIR, 'details.db')
+# 이미지 캐시 인덱스 (파일별 크기/ETag/마지막 접근 시각, 워커 간 공유)
+IMAGE_CACHE_DB = os.path.join(SHARED_CACHE_DIR, 'image_cache.db')
+KOPIS_DETAIL_TTL_HOURS = 24          # 상세정보 유지 시간 (항목당 하루 1회만 KOPIS 조회)
+KOPIS_DETAIL_MAX_ENTRIES = 2000      # 워커 메모리 최대 항목 수
+KOPIS_DETAIL_PREFETCH_COUNT = 100    # 갱신 후 미리 받아 둘 임박 공연 수
+KOPIS_DETAIL_PREFETCH_WORKERS = 4    # 프리페치 동시 요청 수
+
+# 멜론/YES24 상세정보 캐시 (prodId/PerfCode 기준, 만료 후에는 이전 값을 즉시 반환하고 백그라운드 갱신)
+TICKET_DETAIL_TTL_MINUTES = int(os.environ.get('TICKET_DETAIL_TTL_MINUTES', 360))
+TICKET_DETAIL_STALE_HOURS = int(os.environ.get('TICKET_DETAIL_STALE_HOURS', 72))  # 만료 후 이전 값 제공 기간
+TICKET_DETAIL_MAX_ENTRIES = 1000
+
+# =============================================
+# 크롤러 워커 설정 (상주 Playwright 브라우저 풀)
+# =============================================
+CRAWLER_WORKER_HOST = os.environ.get('CRAWLER_WORKER_HOST', '127.0.0.1')
+CRAWLER_WORKER_PORT = int(os.environ.get('CRAWLER_WORKER_PORT', 6100))
+# 워커 인증 키 (비우면 공유 캐시 디렉터리 키 파일을 최초 1회 무작위 생성해 공유, 키 없이는 워커가 기동하지 않음)
+CRAWLER_WORKER_AUTHKEY = os.environ.get('CRAWLER_WORKER_AUTHKEY', '')
+CRAWLER_WORKER_KEY_FILE = os.path.join(SHARED_CACHE_DIR, 'crawler_worker.key')
+CRAWLER_WORKER_LOCK_FILE = os.path.join(SHARED_CACHE_DIR, 'crawler_worker.lock')  # 워커 1개만 기동/실행
+CRAWLER_WORKER_AUTOSTART = os.environ.get('CRAWLER_WORKER_AUTOSTART', 'true').lower() == 'true'
+
+# 프로필별 웜 브라우저 컨텍스트 수 (melon: 일반, yes24: stealth)
+CRAWLER_POOL_SIZES = {
+    'melon': int(os.environ.get('CRAWLER_POOL_MELON', 2)),
+    'yes24': int(os.environ.get('CRAWLER_POOL_YES24', 1)),
+}
+CRAWLER_CONTEXT_MAX_JOBS = 50  # 컨텍스트 재생성 주기 (메모리 누수 방지)
+CRAWLER_REPLY_MARGIN_SECONDS = 3  # 워커 쪽 작업 시한을 클라이언트 대기 시간보다 이만큼 짧게 (시간 초과 결과 회신 여유)
+
+# 목록 크롤링 엔진: true = playwright.async_api (장르 페이지 동시 로드), false = 기존 동기 함수
+CRAWLER_ASYNC_MODE = os.environ.get('CRAWLER_ASYNC_MODE', 'true').lower() == 'true'
+CRAWLER_ASYNC_START_SECONDS = 30  # 비동기 브라우저 기동 대기 (초과/실패 시 동기 슬롯으로 처리)
+CRAWLER_POSTER_CONCURRENCY = 8   # 포스터 보충 전체 동시 요청 수
+CRAWLER_POSTER_PER_HOST = 4      # 포스터 보충 호스트별 동시 요청 수
 
 # =============================================
 # Flask 설정
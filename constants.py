@@ -7,6 +7,11 @@ app.py와 selenium_crawler.py에서 공유
 import re
 import hashlib
 
+from config import CLASSIFY_MEMO_FILE, CLASSIFY_MEMO_MAX_ENTRIES, VENUE_INDEX_FILE
+from utils.keyword_matcher import KeywordMatcher
+from utils.memo import Memo, table_fingerprint
+from services.venue_index import VenueIndex
+
 # =============================================
 # 파트 분류 키워드 (concert / theater)
 # =============================================
@@ -120,6 +125,23 @@ for _cat, _keywords in CONCERT_CATEGORIES.items():
     CONCERT_CATEGORY_PATTERNS[_cat] = [(_kw, _build_keyword_pattern(_kw)) for _kw in _keywords]
 
 THEATER_KEYWORD_PATTERNS = [(_kw, _build_keyword_pattern(_kw)) for _kw in THEATER_KEYWORDS]
+# 연극 키워드는 라벨 1개·13개뿐이라 위 패턴을 정규식 하나로 합친 쪽이 오토마톤보다 빠름 (benchmarks/bench_classifier.py)
+THEATER_KEYWORD_REGEX = re.compile('|'.join(_pattern.pattern for _, _pattern in THEATER_KEYWORD_PATTERNS), re.IGNORECASE)
+
+# 카테고리 키워드 전체를 오토마톤 하나로 (위 패턴과 같은 우선순위/단어 경계, 문자열 1회 스캔)
+CONCERT_CATEGORY_MATCHER = KeywordMatcher(CONCERT_CATEGORIES.items(), word_boundary=_is_ascii_keyword)
+VENUE_REGION_MATCHER = KeywordMatcher(VENUE_REGION_KEYWORDS.items())
+
+# KOPIS area로 학습한 공연장명 → 지역 (키워드에 없는 공연장용, 실행 간 유지)
+venue_index = VenueIndex(VENUE_INDEX_FILE)
+
+# 분류/정규화 결과 메모 (키워드 테이블 내용 해시가 버전 → 테이블 수정 시 스냅샷 폐기)
+CLASSIFIER_VERSION = 3  # 분류 로직(테이블 외) 변경 시 증가
+classification_memo = Memo(
+    CLASSIFY_MEMO_FILE,
+    table_fingerprint(CLASSIFIER_VERSION, THEATER_KEYWORDS, CONCERT_CATEGORIES, VENUE_REGION_KEYWORDS),
+    CLASSIFY_MEMO_MAX_ENTRIES
+)
 
 
 # =============================================
@@ -130,6 +152,7 @@ def get_cache_key(data):
     return hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]
 
 
+@classification_memo.wrap('normalize_name')
 def normalize_name(name):
     """공연명 정규화 (매칭 정확도 향상)"""
     if not name:
@@ -138,49 +161,49 @@ def normalize_name(name):
     return normalized
 
 
+@classification_memo.wrap('classify_part')
 def classify_part(name, genre=''):
     """공연명/장르로 파트 분류 (concert / theater)"""
     if not name:
         return 'concert'
 
-    if genre:
-        for kw, pattern in THEATER_KEYWORD_PATTERNS:
-            if pattern.search(genre):
-                return 'theater'
+    if genre and THEATER_KEYWORD_REGEX.search(genre):
+        return 'theater'
 
-    for kw, pattern in THEATER_KEYWORD_PATTERNS:
-        if pattern.search(name):
-            return 'theater'
+    if THEATER_KEYWORD_REGEX.search(name):
+        return 'theater'
 
     return 'concert'
 
 
+@classification_memo.wrap('region_keyword')
+def _region_by_keyword(text):
+    """지역 키워드 포함 여부로 권역 분류 (대소문자 무시, 앞 권역 우선) - 없으면 None"""
+    return VENUE_REGION_MATCHER.first(text)
+
+
 def classify_region(venue_name='', area=''):
-    """공연장/지역으로 지역 분류 (7개 권역)"""
+    """공연장/지역으로 지역 분류 (7개 권역)
+
+    area → 학습된 공연장명(이름 일치) → 공연장명 지역 키워드 → 학습된 공연장명(앞부분 일치) 순
+    (area로 정해진 지역은 공연장명과 함께 학습)
+    """
     if area:
-        for region, keywords in VENUE_REGION_KEYWORDS.items():
-            for kw in keywords:
-                if kw in area:
-                    return region
+        region = _region_by_keyword(area)
+        if region:
+            venue_index.learn(venue_name, region)
+            return region
 
     if venue_name:
-        venue_upper = venue_name.upper()
-        for region, keywords in VENUE_REGION_KEYWORDS.items():
-            for kw in keywords:
-                if kw.upper() in venue_upper:
-                    return region
+        region = (venue_index.lookup(venue_name) or _region_by_keyword(venue_name)
+                  or venue_index.lookup_prefix(venue_name))
+        if region:
+            return region
 
     return '미분류'
 
 
+@classification_memo.wrap('categorize_concert')
 def categorize_concert(name):
-    """공연명으로 콘서트 세부 장르 분류 (정규식 단어 경계 매칭)"""
-    if not name:
-        return "기타"
-
-    for category, patterns in CONCERT_CATEGORY_PATTERNS.items():
-        for keyword, pattern in patterns:
-            if pattern.search(name):
-                return category
-
-    return "기타"
+    """공연명으로 콘서트 세부 장르 분류 (영문 키워드는 단어 경계 매칭, 앞 카테고리 우선)"""
+    return CONCERT_CATEGORY_MATCHER.first(name, "기타")
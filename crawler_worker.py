@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+Playwright 크롤러 워커 (상주 프로세스)
+프로필별(일반/stealth) 웜 브라우저 컨텍스트 풀을 유지하고
+로컬 소켓으로 크롤링 작업을 받아 결과 반환
+
+실행: python crawler_worker.py
+"""
+
+import sys
+import os
+import time
+import queue
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from multiprocessing.connection import Listener
+
+# 프로젝트 루트를 path에 추가 (subprocess 실행 시 import 지원)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config import (
+    CRAWLER_WORKER_HOST, CRAWLER_WORKER_PORT, CRAWLER_WORKER_LOCK_FILE,
+    CRAWLER_POOL_SIZES, CRAWLER_CONTEXT_MAX_JOBS, CRAWLER_REPLY_MARGIN_SECONDS,
+    CRAWLER_ASYNC_MODE, CRAWLER_ASYNC_START_SECONDS, CLASSIFY_MEMO_SAVE_SECONDS
+)
+from constants import classification_memo
+from services.crawler_client import CrawlJob, CrawlResult, CRAWL_JOBS, load_worker_authkey
+from services.shared_cache import SchedulerLock
+import playwright_crawler as pc
+
+from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='[크롤러 워커] %(asctime)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# 작업명 → (브라우저 프로필, 실행 함수)
+JOB_HANDLERS = {
+    'melon': ('melon', lambda page, arg: pc.crawl_melon(page)),
+    'yes24': ('yes24', lambda page, arg: pc.crawl_yes24(page)),
+    'melon_detail': ('melon', lambda page, arg: pc.crawl_melon_detail(arg, page)),
+    'yes24_detail': ('yes24', lambda page, arg: pc.crawl_yes24_detail(arg, page)),
+}
+
+# 프로필별 작업 큐 (슬롯 스레드들이 공유) - 항목: (CrawlJob, 회신 큐, 취소 Event)
+job_queues = {profile: queue.Queue() for profile in pc.BROWSER_PROFILES}
+
+# 비동기 모드 목록 크롤링은 슬롯 밖 상주 이벤트 루프에서 실행 (사이트별 동시 1건)
+list_crawl_locks = {site: threading.Lock() for site in pc.ASYNC_LIST_CRAWLERS}
+
+
+class BrowserSlot(threading.Thread):
+    """웜 브라우저 1개를 소유하고 작업을 순차 처리하는 슬롯
+
+    Playwright sync API는 스레드 간 공유가 불가하므로 슬롯마다 별도 인스턴스 사용
+    """
+
+    def __init__(self, profile, index):
+        super().__init__(name=f'{profile}-{index}', daemon=True)
+        self.profile = profile
+        self.jobs = job_queues[profile]
+        self.browser = None
+        self.page = None
+        self.handled = 0
+
+    def _launch(self, pw):
+        self._close()
+        self.browser, _, self.page = pc.get_browser_context(pw, **pc.BROWSER_PROFILES[self.profile])
+        self.handled = 0
+
+    def _close(self):
+        if self.browser is not None:
+            try:
+                self.browser.close()
+            except Exception:
+                pass
+        self.browser = None
+        self.page = None
+
+    def run(self):
+        with sync_playwright() as pw:
+            self._launch(pw)
+            logging.info(f"슬롯 준비 완료: {self.name}")
+            while True:
+                job, reply, cancelled = self.jobs.get()
+                if cancelled.is_set():
+                    # 클라이언트가 이미 시간 초과로 돌아간 작업은 실행하지 않음
+                    logging.info(f"{self.name} 취소된 작업 건너뜀 ({job.name})")
+                    continue
+                started = time.monotonic()
+                try:
+                    if self.page is None or self.handled >= CRAWLER_CONTEXT_MAX_JOBS:
+                        self._launch(pw)
+                    _, handler = JOB_HANDLERS[job.name]
+                    payload = handler(self.page, job.arg)
+                    self.handled += 1
+                    result = CrawlResult(True, payload, None, time.monotonic() - started)
+                except Exception as e:
+                    # 브라우저 상태를 알 수 없으므로 다음 작업 전에 재기동
+                    logging.warning(f"{self.name} 작업 실패 ({job.name}): {e}")
+                    self._close()
+                    result = CrawlResult(False, None, str(e), time.monotonic() - started)
+                reply.put(result)
+
+
+class AsyncListCrawler(threading.Thread):
+    """상주 이벤트 루프 + 사이트(프로필)별 웜 비동기 브라우저 (목록 크롤링 전용)
+
+    sync API 슬롯 스레드와 이벤트 루프가 섞이지 않도록 별도 스레드에서 루프를 돌리고,
+    브라우저는 CRAWLER_CONTEXT_MAX_JOBS건마다 또는 실패 시에만 재기동
+    기동(async_playwright) 실패 시 error에 예외를 남기고 루프를 돌리지 않음 → 목록 작업은 동기 슬롯으로
+    """
+
+    def __init__(self):
+        super().__init__(name='async-list', daemon=True)
+        self.loop = asyncio.new_event_loop()
+        self.ready = threading.Event()
+        self.error = None
+        self.playwright = None
+        self.browsers = {}  # 사이트 → [browser, context, 처리 건수]
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._start())
+        except BaseException as e:
+            self.error = e
+            logging.error(f"비동기 목록 크롤러 기동 실패 (동기 슬롯 사용): {e}")
+        finally:
+            self.ready.set()
+        if self.error is None:
+            self.loop.run_forever()
+
+    def usable(self, timeout):
+        """기동을 최대 timeout초 기다린 뒤 사용 가능 여부 (기동 중/실패면 False)"""
+        return self.ready.wait(timeout) and self.error is None
+
+    async def _start(self):
+        self.playwright = await async_playwright().start()
+        for site in pc.ASYNC_LIST_CRAWLERS:
+            try:
+                await self._context(site)
+            except Exception as e:
+                logging.warning(f"비동기 브라우저 준비 실패 ({site}): {e}")
+        logging.info(f"비동기 목록 브라우저 준비 완료: {list(self.browsers)}")
+
+    async def _context(self, site):
+        entry = self.browsers.get(site)
+        if entry is not None and entry[2] < CRAWLER_CONTEXT_MAX_JOBS:
+            return entry
+        await self._close(site)
+        browser, context = await pc.get_async_browser_context(self.playwright, **pc.BROWSER_PROFILES[site])
+        entry = self.browsers[site] = [browser, context, 0]
+        return entry
+
+    async def _close(self, site):
+        entry = self.browsers.pop(site, None)
+        if entry is not None:
+            try:
+                await entry[0].close()
+            except Exception:
+                pass
+
+    async def _crawl(self, site):
+        entry = await self._context(site)
+        try:
+            payload = await pc.crawl_list_async(site, entry[1])
+        except BaseException:
+            # 브라우저 상태를 알 수 없으므로 다음 작업 전에 재기동 (취소 포함)
+            await self._close(site)
+            raise
+        entry[2] += 1
+        if not payload.get('success'):
+            await self._close(site)
+        return payload
+
+    def crawl(self, site, timeout):
+        """다른 스레드에서 호출: 목록 크롤링 실행 → 결과 dict (시간 초과 시 작업 취소 후 TimeoutError)"""
+        if not self.usable(0):
+            raise RuntimeError(f"비동기 목록 크롤러 사용 불가: {self.error}")
+        future = asyncio.run_coroutine_threadsafe(self._crawl(site), self.loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(site)
+
+
+async_list_crawler = None
+
+
+def run_async_list_crawl(site, timeout):
+    """상주 비동기 브라우저로 목록 크롤링 (연결 스레드에서 호출)"""
+    started = time.monotonic()
+    lock = list_crawl_locks[site]
+    if not lock.acquire(timeout=timeout):
+        return CrawlResult(False, None, 'Timeout', float(timeout))
+    try:
+        payload = async_list_crawler.crawl(site, max(0.1, timeout - (time.monotonic() - started)))
+        return CrawlResult(True, payload, None, time.monotonic() - started)
+    except TimeoutError:
+        return CrawlResult(False, None, 'Timeout', float(timeout))
+    except Exception as e:
+        logging.warning(f"목록 크롤링 실패 ({site}): {e}")
+        return CrawlResult(False, None, str(e), time.monotonic() - started)
+    finally:
+        lock.release()
+
+
+def handle_connection(conn):
+    """클라이언트 연결 1건 처리: CrawlJob 수신 → 풀 큐에 투입 → CrawlResult 회신"""
+    try:
+        job = conn.recv()
+        if not isinstance(job, CrawlJob) or job.name not in CRAWL_JOBS:
+            conn.send(CrawlResult(False, None, f'Unknown job: {job!r}', 0.0))
+            return
+        if CRAWL_JOBS[job.name] and not job.arg:
+            conn.send(CrawlResult(False, None, 'id required', 0.0))
+            return
+
+        # 클라이언트가 기다리는 시간보다 짧게 끊어 시간 초과 결과라도 회신되도록
+        deadline = time.monotonic() + max(1.0, job.timeout - CRAWLER_REPLY_MARGIN_SECONDS)
+
+        if (CRAWLER_ASYNC_MODE and job.name in list_crawl_locks and async_list_crawler is not None
+                and async_list_crawler.usable(min(CRAWLER_ASYNC_START_SECONDS, deadline - time.monotonic()))):
+            conn.send(run_async_list_crawl(job.name, max(1.0, deadline - time.monotonic())))
+            return
+
+        profile, _ = JOB_HANDLERS[job.name]
+        reply = queue.Queue(maxsize=1)
+        cancelled = threading.Event()
+        job_queues[profile].put((job, reply, cancelled))
+        try:
+            result = reply.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            cancelled.set()
+            result = CrawlResult(False, None, 'Timeout', float(job.timeout))
+        conn.send(result)
+    except (EOFError, OSError):
+        pass
+    finally:
+        conn.close()
+
+
+def main():
+    global async_list_crawler
+    # 워커는 1개만: 기동한 웹 프로세스가 넘긴 잠금을 이어받거나, 직접 실행이면 잠금 획득
+    os.makedirs(os.path.dirname(CRAWLER_WORKER_LOCK_FILE), exist_ok=True)
+    worker_lock = SchedulerLock(CRAWLER_WORKER_LOCK_FILE)
+    inherited_fd = os.environ.pop('CRAWLER_WORKER_LOCK_FD', '')
+    if inherited_fd:
+        worker_lock.adopt(int(inherited_fd))
+    elif not worker_lock.acquire():
+        logging.error("이미 실행 중인 크롤러 워커가 있습니다.")
+        sys.exit(1)
+
+    # 인증 키가 없으면 기동하지 않음 (연결마다 pickle을 받으므로 알려진 키로는 열지 않음)
+    authkey = load_worker_authkey()
+    if not authkey:
+        logging.error("인증 키 없음: CRAWLER_WORKER_AUTHKEY 환경변수 또는 키 파일이 필요합니다.")
+        sys.exit(1)
+    listener = Listener((CRAWLER_WORKER_HOST, CRAWLER_WORKER_PORT), authkey=authkey)
+    logging.info(f"대기 중: {CRAWLER_WORKER_HOST}:{CRAWLER_WORKER_PORT} (풀: {CRAWLER_POOL_SIZES})")
+
+    for profile, size in CRAWLER_POOL_SIZES.items():
+        for i in range(max(1, size)):
+            BrowserSlot(profile, i).start()
+
+    # 비동기 모드: 목록 크롤링용 웜 브라우저를 상주 이벤트 루프에 유지
+    if CRAWLER_ASYNC_MODE:
+        async_list_crawler = AsyncListCrawler()
+        async_list_crawler.start()
+
+    # 목록 크롤링의 분류/정규화 메모 스냅샷 주기적 저장
+    classification_memo.start(CLASSIFY_MEMO_SAVE_SECONDS)
+
+    while True:
+        try:
+            conn = listener.accept()
+        except Exception as e:
+            logging.warning(f"연결 수락 실패: {e}")
+            continue
+        threading.Thread(target=handle_connection, args=(conn,), daemon=True).start()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,115 +5,221 @@ KOPIS API 크롤러
 import logging
 import requests
 import xml.etree.ElementTree as ET
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
-from config import KOPIS_API_KEY, KOPIS_BASE_URL, GENRE_CODE_CONCERT, GENRE_CODE_MUSICAL, GENRE_CODE_THEATER
+from config import (
+    KOPIS_API_KEY, KOPIS_BASE_URL, GENRE_CODE_CONCERT, GENRE_CODE_MUSICAL, GENRE_CODE_THEATER,
+    KOPIS_PAGE_ROWS, KOPIS_PAGE_WAVE, KOPIS_MAX_WORKERS, KOPIS_RATE_PER_SEC
+)
 from constants import get_cache_key, normalize_name, classify_part, classify_region, categorize_concert
+from utils.rate_limit import TokenBucket
+
+
+class KopisFetchError(Exception):
+    """일부 KOPIS 페이지 수집 실패 (받은 페이지까지는 이미 전달됨)"""
+
+
+class KopisApiError(Exception):
+    """KOPIS API HTTP 오류"""
+
+    def __init__(self, status_code):
+        super().__init__(f"KOPIS API 오류: {status_code}")
+        self.status_code = status_code
+
+
+# KOPIS 호스트 공용 세션 + 속도 제한
+_session = requests.Session()
+_session.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=KOPIS_MAX_WORKERS))
+_rate_limiter = TokenBucket(KOPIS_RATE_PER_SEC, capacity=KOPIS_MAX_WORKERS)
+
+# <db> 직속 필드가 아닌 태그 (묶음/하위 항목은 'relate', 'styurl' 종료 시 함께 처리)
+NESTED_TAGS = {'dbs', 'relates', 'styurls', 'relatenm', 'relateurl'}
+
+
+def iter_kopis_records(chunks):
+    """KOPIS XML 바이트 조각 → <db> 레코드 dict를 도착 순서대로 yield
+
+    종료 이벤트만 받는 단일 패스: <db> 직속 필드는 {태그: 텍스트}, 예매처는 'relates': [{'relatenm', 'relateurl'}],
+    소개 이미지는 'styurls': [url]로 모으고, 다 읽은 <db>는 바로 비워 메모리 사용량 일정 유지
+    """
+    parser = ET.XMLPullParser(events=('end',))
+    record = {}
+
+    def drain():
+        nonlocal record
+        for _, elem in parser.read_events():
+            tag = elem.tag
+            if tag == 'db':
+                yield record
+                record = {}
+                elem.clear()
+            elif tag == 'relate':
+                record.setdefault('relates', []).append({child.tag: child.text or '' for child in elem})
+            elif tag == 'styurl':
+                if elem.text:
+                    record.setdefault('styurls', []).append(elem.text)
+            elif tag not in NESTED_TAGS:
+                record[tag] = elem.text or ''
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def fetch_kopis_records(path, params, timeout=10, session=None):
+    """KOPIS API 요청 → 레코드 목록 (응답 본문을 조각 단위로 받으며 파싱, HTTP 오류 시 KopisApiError)"""
+    with (session or requests).get(f"{KOPIS_BASE_URL}/{path}", params=params, timeout=timeout, stream=True) as response:
+        if response.status_code != 200:
+            raise KopisApiError(response.status_code)
+        return list(iter_kopis_records(response.iter_content(chunk_size=16384)))
+
+
+KOPIS_GENRES = [
+    (GENRE_CODE_CONCERT, 'concert'),
+    (GENRE_CODE_MUSICAL, 'theater'),
+    (GENRE_CODE_THEATER, 'theater')
+]
+
+
+def _parse_list_item(record, part_type):
+    """목록 레코드 → 공연 dict"""
+    name = record.get('prfnm', '')
+    genre_name = record.get('genrenm', '')
+    venue_name = record.get('fcltynm', '')
+    area = record.get('area', '')
+    perf_hash = get_cache_key(normalize_name(name))
+    sub_category = categorize_concert(name)
+    perf_part = classify_part(name, genre_name) if part_type == 'concert' else part_type
+
+    return {
+        'id': record.get('mt20id', ''),
+        'name': name,
+        'start_date': record.get('prfpdfrom', ''),
+        'end_date': record.get('prfpdto', ''),
+        'venue': venue_name,
+        'poster': record.get('poster', ''),
+        'genre': genre_name,
+        'category': sub_category,
+        'part': perf_part,
+        'region': classify_region(venue_name, area),
+        'state': record.get('prfstate', ''),
+        'hash': perf_hash,
+        'available_sites': [{'name': 'KOPIS', 'link': '', 'color': '#00d4ff'}]
+    }
+
+
+def fetch_kopis_page(genre_code, part_type, start_date, end_date, page, rows=KOPIS_PAGE_ROWS):
+    """KOPIS 목록 1페이지 수집 (실패 시 예외)"""
+    params = {
+        'service': KOPIS_API_KEY,
+        'stdate': start_date,
+        'eddate': end_date,
+        'cpage': str(page),
+        'rows': str(rows),
+        'shcate': genre_code
+    }
+    _rate_limiter.acquire()
+    records = fetch_kopis_records('pblprfr', params, session=_session)
+    return [_parse_list_item(record, part_type) for record in records]
+
+
+def iter_kopis_pages(start_date, end_date, genres=KOPIS_GENRES):
+    """KOPIS 장르별 전체 페이지 병렬 수집, 도착하는 페이지 순서대로 목록 yield
+
+    장르마다 KOPIS_PAGE_WAVE 페이지씩 미리 요청하고, 마지막 페이지가 꽉 차 있으면 다음 묶음 요청
+    일부 페이지가 실패하면 나머지를 모두 yield한 뒤 KopisFetchError 발생
+    """
+    failed = []
+    with ThreadPoolExecutor(max_workers=KOPIS_MAX_WORKERS) as executor:
+        pending = {}
+        last_page = {}
+
+        def submit_wave(genre_code, part_type):
+            first = last_page.get(genre_code, 0) + 1
+            for page in range(first, first + KOPIS_PAGE_WAVE):
+                future = executor.submit(fetch_kopis_page, genre_code, part_type, start_date, end_date, page)
+                pending[future] = (genre_code, part_type, page)
+            last_page[genre_code] = first + KOPIS_PAGE_WAVE - 1
+
+        for genre_code, part_type in genres:
+            submit_wave(genre_code, part_type)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                genre_code, part_type, page = pending.pop(future)
+                try:
+                    items = future.result()
+                except Exception as e:
+                    logging.warning(f"KOPIS 수집 실패 ({genre_code} {page}페이지): {e}")
+                    failed.append((genre_code, page))
+                    continue
+                if len(items) >= KOPIS_PAGE_ROWS and page == last_page[genre_code]:
+                    submit_wave(genre_code, part_type)
+                if items:
+                    yield items
+
+    if failed:
+        raise KopisFetchError(f"KOPIS 페이지 {len(failed)}개 수집 실패: {failed}")
 
 
 def fetch_kopis_genre(genre_code, part_type, start_date, end_date):
-    """KOPIS 단일 장르 데이터 수집 (병렬 실행용)"""
+    """KOPIS 단일 장르 전체 페이지 수집"""
     results = []
     try:
-        params = {
-            'service': KOPIS_API_KEY,
-            'stdate': start_date,
-            'eddate': end_date,
-            'cpage': '1',
-            'rows': '50',
-            'shcate': genre_code
-        }
-        response = requests.get(f"{KOPIS_BASE_URL}/pblprfr", params=params, timeout=10)
-        if response.status_code == 200:
-            root = ET.fromstring(response.content)
-            for db in root.findall('.//db'):
-                name = db.find('prfnm').text if db.find('prfnm') is not None else ''
-                genre_name = db.find('genrenm').text if db.find('genrenm') is not None else ''
-                venue_name = db.find('fcltynm').text if db.find('fcltynm') is not None else ''
-                area = db.find('area').text if db.find('area') is not None else ''
-                perf_hash = get_cache_key(normalize_name(name))
-                sub_category = categorize_concert(name)
-                perf_part = classify_part(name, genre_name) if part_type == 'concert' else part_type
-
-                perf = {
-                    'id': db.find('mt20id').text if db.find('mt20id') is not None else '',
-                    'name': name,
-                    'start_date': db.find('prfpdfrom').text if db.find('prfpdfrom') is not None else '',
-                    'end_date': db.find('prfpdto').text if db.find('prfpdto') is not None else '',
-                    'venue': venue_name,
-                    'poster': db.find('poster').text if db.find('poster') is not None else '',
-                    'genre': genre_name,
-                    'category': sub_category,
-                    'part': perf_part,
-                    'region': classify_region(venue_name, area),
-                    'state': db.find('prfstate').text if db.find('prfstate') is not None else '',
-                    'hash': perf_hash,
-                    'available_sites': [{'name': 'KOPIS', 'link': '', 'color': '#00d4ff'}]
-                }
-                results.append(perf)
+        for items in iter_kopis_pages(start_date, end_date, genres=[(genre_code, part_type)]):
+            results.extend(items)
     except Exception as e:
         logging.warning(f"KOPIS 수집 실패 ({genre_code}): {e}")
     return results
 
 
 def fetch_all_kopis(start_date, end_date):
-    """KOPIS 3장르 병렬 수집"""
-    kopis_genres = [
-        (GENRE_CODE_CONCERT, 'concert'),
-        (GENRE_CODE_MUSICAL, 'theater'),
-        (GENRE_CODE_THEATER, 'theater')
-    ]
+    """KOPIS 3장르 전체 페이지 병렬 수집 (일부 페이지 실패 시 받은 만큼 반환)"""
     all_results = []
-    with ThreadPoolExecutor(max_workers=3) as executor:
-        futures = {
-            executor.submit(fetch_kopis_genre, gc, pt, start_date, end_date): gc
-            for gc, pt in kopis_genres
-        }
-        for future in as_completed(futures):
-            all_results.extend(future.result())
+    try:
+        for items in iter_kopis_pages(start_date, end_date):
+            all_results.extend(items)
+    except Exception as e:
+        logging.warning(f"KOPIS 수집 실패: {e}")
     return all_results
 
 
+def fetch_kopis_detail_record(perf_id):
+    """KOPIS 상세 레코드 1건 (공용 세션 + 속도 제한, 없으면 None)"""
+    _rate_limiter.acquire()
+    records = fetch_kopis_records(f"pblprfr/{perf_id}", {'service': KOPIS_API_KEY}, session=_session)
+    return records[0] if records else None
+
+
 def fetch_kopis_detail(perf_id):
     """KOPIS 공연 상세정보 조회"""
     try:
-        params = {'service': KOPIS_API_KEY}
-        response = requests.get(f"{KOPIS_BASE_URL}/pblprfr/{perf_id}", params=params, timeout=10)
-
-        if response.status_code == 200:
-            root = ET.fromstring(response.content)
-            db = root.find('.//db')
-            if db is not None:
-                detail = {
-                    'id': perf_id,
-                    'name': db.find('prfnm').text if db.find('prfnm') is not None else '',
-                    'start_date': db.find('prfpdfrom').text if db.find('prfpdfrom') is not None else '',
-                    'end_date': db.find('prfpdto').text if db.find('prfpdto') is not None else '',
-                    'venue': db.find('fcltynm').text if db.find('fcltynm') is not None else '',
-                    'poster': db.find('poster').text if db.find('poster') is not None else '',
-                    'genre': db.find('genrenm').text if db.find('genrenm') is not None else '',
-                    'state': db.find('prfstate').text if db.find('prfstate') is not None else '',
-                    'cast': db.find('prfcast').text if db.find('prfcast') is not None else '',
-                    'price': db.find('pcseguidance').text if db.find('pcseguidance') is not None else '',
-                    'runtime': db.find('prfruntime').text if db.find('prfruntime') is not None else '',
-                    'schedule': db.find('dtguidance').text if db.find('dtguidance') is not None else '',
-                    'booking_links': [],
-                    'poster_images': []
-                }
-
+        db = fetch_kopis_detail_record(perf_id)
+        if db:
+            return {
+                'id': perf_id,
+                'name': db.get('prfnm', ''),
+                'start_date': db.get('prfpdfrom', ''),
+                'end_date': db.get('prfpdto', ''),
+                'venue': db.get('fcltynm', ''),
+                'poster': db.get('poster', ''),
+                'genre': db.get('genrenm', ''),
+                'state': db.get('prfstate', ''),
+                'cast': db.get('prfcast', ''),
+                'price': db.get('pcseguidance', ''),
+                'runtime': db.get('prfruntime', ''),
+                'schedule': db.get('dtguidance', ''),
                 # 예매처 링크
-                for relate in db.findall('.//relate'):
-                    rel_name = relate.find('relatenm').text if relate.find('relatenm') is not None else ''
-                    rel_url = relate.find('relateurl').text if relate.find('relateurl') is not None else ''
-                    if rel_name and rel_url:
-                        detail['booking_links'].append({'name': rel_name, 'url': rel_url})
-
+                'booking_links': [
+                    {'name': r.get('relatenm', ''), 'url': r.get('relateurl', '')}
+                    for r in db.get('relates', []) if r.get('relatenm') and r.get('relateurl')
+                ],
                 # 포스터 이미지
-                for styurl in db.findall('.//styurl'):
-                    if styurl.text:
-                        detail['poster_images'].append(styurl.text)
-
-                return detail
+                'poster_images': db.get('styurls', [])
+            }
     except Exception as e:
         logging.error(f"KOPIS 상세 조회 오류 ({perf_id}): {e}")
     return None
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+YES24 상세 페이지 파서 + HTTP 우선 수집
+상세 페이지는 대부분 일반 HTTP 요청만으로 필요한 영역이 내려오므로, 브라우저는 차단/빈 응답일 때만 사용
+"""
+import logging
+
+from bs4 import BeautifulSoup
+
+from utils.http import get_session
+
+YES24_DETAIL_URL = "https://ticket.yes24.com/Perf/{perf_code}"
+
+# 상세 정보가 들어 있는 영역 (하나라도 있어야 HTTP 응답을 사용)
+DETAIL_SELECTORS = '.rn-product-area1, .rn-product-info, .product-info'
+
+
+def parse_yes24_detail(html):
+    """YES24 상세 페이지 HTML → 상세정보 dict"""
+    return _parse_detail_soup(BeautifulSoup(html, 'html.parser'))
+
+
+def _parse_detail_soup(soup):
+    """파싱된 상세 페이지 → 상세정보 dict"""
+    result = {
+        'date': '',
+        'venue': '',
+        'price': '',
+        'cast': '',
+        'runtime': '',
+        'age': ''
+    }
+
+    # rn-product-area1 영역에서 정보 추출
+    info_area = soup.select_one('.rn-product-area1')
+    if info_area:
+        dts = info_area.select('dt')
+        dds = info_area.select('dd')
+
+        for i, dt in enumerate(dts):
+            label = dt.get_text(strip=True)
+            if i < len(dds):
+                value = dds[i].get_text(strip=True)
+
+                if '기간' in label or '일시' in label or '일자' in label:
+                    result['date'] = value
+                elif '장소' in label or '공연장' in label:
+                    result['venue'] = value
+                elif '가격' in label:
+                    result['price'] = value
+                elif '출연' in label or '기연' in label or '캐스팅' in label or '아티스트' in label:
+                    result['cast'] = value
+                elif '관람시간' in label or '런타임' in label or '시간' in label:
+                    result['runtime'] = value
+                elif '관람가' in label or '등급' in label or '연령' in label:
+                    result['age'] = value
+
+    # 대체: 전체 페이지에서 찾기
+    if not result['date']:
+        schedule_items = soup.select('.rn-product-info dt, .rn-product-info dd, .product-info dt, .product-info dd')
+        current_label = ''
+        for item in schedule_items:
+            text = item.get_text(strip=True)
+            if item.name == 'dt':
+                current_label = text
+            elif item.name == 'dd' and current_label:
+                if '기간' in current_label or '일시' in current_label:
+                    result['date'] = text
+                elif '장소' in current_label:
+                    result['venue'] = text
+                elif '가격' in current_label:
+                    result['price'] = text
+                elif '출연' in current_label or '기연' in current_label:
+                    result['cast'] = text
+
+    # 가격 정보 별도 추출 시도
+    if not result['price']:
+        price_area = soup.select_one('.rn-price-area, .price-info, [class*="price"]')
+        if price_area:
+            result['price'] = price_area.get_text(strip=True)[:200]
+
+    return result
+
+
+def fetch_yes24_detail_http(perf_code, timeout=5):
+    """HTTP 세션으로 상세 조회 → {'success', 'data'} (차단/영역 없음/가격·출연진 없음이면 None → 브라우저로 재시도)"""
+    try:
+        resp = get_session('yes24').get(YES24_DETAIL_URL.format(perf_code=perf_code), timeout=timeout)
+        if resp.status_code != 200:
+            return None
+        soup = BeautifulSoup(resp.text, 'html.parser')
+        # 필요한 상세 영역이 없으면 차단/봇 확인 페이지로 보고 브라우저로 넘김
+        if soup.select_one(DETAIL_SELECTORS) is None:
+            return None
+        result = _parse_detail_soup(soup)
+        # 가격/출연진은 상세 영역이 내려온 뒤 AJAX로 채워짐 → 비어 있으면 브라우저(networkidle)로 넘김
+        if not result['price'] or not result['cast']:
+            return None
+        return {'success': True, 'data': result}
+    except Exception as e:
+        logging.debug(f"YES24 상세 HTTP 조회 실패 ({perf_code}): {e}")
+        return None
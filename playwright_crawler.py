@@ -9,33 +9,89 @@ import sys
 import json
 import os
 import re
-import requests
+import asyncio
+import contextlib
+from urllib.parse import urlparse
 from concurrent.futures import ThreadPoolExecutor
 
 # 프로젝트 루트를 path에 추가 (subprocess 실행 시 import 지원)
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config import CRAWLER_ASYNC_MODE, CRAWLER_POSTER_CONCURRENCY, CRAWLER_POSTER_PER_HOST
 from constants import get_cache_key, normalize_name, classify_part, categorize_concert
+from crawlers.yes24 import parse_yes24_detail, YES24_DETAIL_URL
+from utils.http import get_session
 
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright, TimeoutError as AsyncPlaywrightTimeoutError
 from bs4 import BeautifulSoup
 
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 
-def get_browser_context(playwright, headless=True, stealth=False):
+BROWSER_LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+]
+
+# playwright-stealth 미설치 시 주입하는 기본 stealth 스크립트
+STEALTH_INIT_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+    Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+    Object.defineProperty(navigator, 'languages', {get: () => ['ko-KR', 'ko', 'en-US', 'en']});
+    window.chrome = { runtime: {} };
+"""
+
+# =============================================
+# 리소스 차단 규칙 (사이트별)
+# 목록/상세 파서는 HTML(page.content())만 읽으므로 렌더링용 리소스와 트래커는 받지 않음
+# img 태그의 src/data-src 속성은 HTML에 그대로 남으므로 포스터 URL 추출에는 영향 없음
+# =============================================
+TRACKER_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'googlesyndication.com',
+    'doubleclick.net', 'facebook.net', 'facebook.com', 'criteo.com', 'criteo.net',
+    'wcs.naver.net', 'wcs.naver.com', 'clarity.ms', 'hotjar.com', 'adnxs.com',
+    'mobon.net', 'dable.io',
+)
+
+RESOURCE_BLOCK_RULES = {
+    'melon': {
+        'types': {'image', 'media', 'font', 'stylesheet'},
+        'hosts': TRACKER_HOSTS,
+    },
+    # YES24: stealth 탐지 회피를 위해 스타일시트는 허용
+    'yes24': {
+        'types': {'image', 'media', 'font'},
+        'hosts': TRACKER_HOSTS,
+    },
+}
+
+# 목록 파서가 필요로 하는 선택자 (networkidle 대신 이 요소가 나타날 때까지만 대기)
+MELON_LIST_SELECTOR = 'div.show_infor'
+YES24_LIST_SELECTOR = 'a[href*="PerfCode"], a[href*="Perf/"]'
+LIST_SELECTOR_TIMEOUT_MS = 15000
+
+
+def _is_blocked_request(request, rule):
+    """차단 규칙에 해당하는 요청인지 확인 (리소스 타입 또는 트래커 호스트)"""
+    if request.resource_type in rule['types']:
+        return True
+    host = urlparse(request.url).hostname or ''
+    return any(host == h or host.endswith('.' + h) for h in rule['hosts'])
+
+
+def get_browser_context(playwright, headless=True, stealth=False, block=None):
     """Playwright 브라우저 + 컨텍스트 생성
 
     Args:
         playwright: Playwright 인스턴스
         headless: 헤드리스 모드 (멜론: True, YES24: False)
         stealth: stealth 플러그인 적용 여부 (YES24: True)
+        block: 리소스 차단 규칙 (RESOURCE_BLOCK_RULES 항목, None이면 차단 없음)
 
     Returns:
         (browser, context, page) 튜플
     """
-    launch_args = [
-        '--no-sandbox',
-        '--disable-dev-shm-usage',
-        '--disable-gpu',
-    ]
+    launch_args = list(BROWSER_LAUNCH_ARGS)
 
     if not headless:
         # 창을 화면 밖으로 이동 (headless 대신)
@@ -48,7 +104,7 @@ def get_browser_context(playwright, headless=True, stealth=False):
 
     context = browser.new_context(
         viewport={'width': 1920, 'height': 1080},
-        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        user_agent=USER_AGENT,
     )
 
     # YES24 봇 차단 우회: playwright-stealth 적용
@@ -58,419 +114,562 @@ def get_browser_context(playwright, headless=True, stealth=False):
             Stealth().apply_stealth_sync(context)
         except ImportError:
             # playwright-stealth 미설치 시 기본 stealth 스크립트 주입
-            context.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-                Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
-                Object.defineProperty(navigator, 'languages', {get: () => ['ko-KR', 'ko', 'en-US', 'en']});
-                window.chrome = { runtime: {} };
-            """)
+            context.add_init_script(STEALTH_INIT_SCRIPT)
+
+    # 파서가 쓰지 않는 리소스 요청 차단
+    if block:
+        def _route_handler(route):
+            if _is_blocked_request(route.request, block):
+                route.abort()
+            else:
+                route.continue_()
+        context.route('**/*', _route_handler)
 
     page = context.new_page()
     return browser, context, page
 
 
-def crawl_melon():
-    """멜론티켓 콘서트 크롤링"""
-    tickets = []
+# 사이트별 브라우저 프로필 (crawler_worker.py 풀 구성에도 사용)
+BROWSER_PROFILES = {
+    'melon': {'headless': True, 'stealth': False, 'block': RESOURCE_BLOCK_RULES['melon']},   # 일반 풀
+    'yes24': {'headless': False, 'stealth': True, 'block': RESOURCE_BLOCK_RULES['yes24']},   # stealth 풀
+}
+
 
+def run_with_browser(crawl_func, profile):
+    """단발성 브라우저를 띄워 크롤링 함수 실행 (subprocess 모드)"""
     with sync_playwright() as pw:
-        browser, context, page = get_browser_context(pw, headless=True, stealth=False)
+        browser, context, page = get_browser_context(pw, **BROWSER_PROFILES[profile])
         try:
-            page.goto("https://ticket.melon.com/concert/index.htm", wait_until='domcontentloaded')
-            page.wait_for_load_state('networkidle')
-
-            soup = BeautifulSoup(page.content(), 'html.parser')
-
-            # show_infor div에서 공연 정보 추출
-            show_infors = soup.select('div.show_infor')
-
-            for info in show_infors:
-                try:
-                    # 링크 찾기
-                    link = info.select_one('a[href*="prodId"]')
-                    if not link:
-                        continue
-
-                    href = link.get('href', '')
-                    prod_match = re.search(r'prodId=(\d+)', href)
-                    if not prod_match:
-                        continue
-                    prod_id = prod_match.group(1)
-
-                    # 제목 - show_infor 전체 텍스트에서 추출
-                    full_text = info.get_text(strip=True, separator=' ')
-
-                    # 특수문자 제거 (nbsp 등)
-                    full_text = full_text.replace('\xa0', ' ').replace('\u200b', '')
-
-                    # "판매중" 또는 "단독판매" 등의 태그 제거
-                    title = full_text
-                    for tag in ['단독판매', '판매중', '판매예정', '판매종료']:
-                        title = title.replace(tag, '')
-                    title = ' '.join(title.split())  # 공백 정리
-
-                    if not title or len(title) < 3:
-                        continue
-
-                    # 카테고리 메뉴 필터
-                    if title in ['콘서트', '뮤지컬/연극', '클래식', '전시/행사']:
-                        continue
-
-                    # 이미지 찾기
-                    poster = ''
-                    img = info.select_one('img')
-                    if img:
-                        poster = img.get('src', '') or img.get('data-src', '')
-                        if poster and poster.startswith('//'):
-                            poster = 'https:' + poster
-
-                    # 링크 생성
-                    full_link = f'https://ticket.melon.com/performance/index.htm?prodId={prod_id}'
-
-                    tickets.append({
-                        'name': title[:100],
-                        'date': '',
-                        'venue': '',
-                        'poster': poster,
-                        'source': '멜론티켓',
-                        'source_color': '#00cd3c',
-                        'link': full_link,
-                        'category': categorize_concert(title),
-                        'part': classify_part(title),
-                        'hash': get_cache_key(normalize_name(title))
-                    })
-                except Exception:
-                    continue
-
-        except Exception as e:
-            return {'success': False, 'error': str(e), 'data': []}
+            return crawl_func(page)
         finally:
             browser.close()
 
-    # 중복 제거
+
+def dedupe_by_hash(tickets):
+    """hash 기준 중복 제거 (먼저 나온 항목 유지)"""
     seen = set()
-    unique = [t for t in tickets if not (t['hash'] in seen or seen.add(t['hash']))]
+    return [t for t in tickets if not (t['hash'] in seen or seen.add(t['hash']))]
 
-    return {'success': True, 'data': unique, 'count': len(unique)}
 
+def parse_melon_list(html):
+    """멜론티켓 콘서트 목록 HTML 파싱"""
+    tickets = []
+    soup = BeautifulSoup(html, 'html.parser')
 
-def crawl_yes24():
-    """YES24 콘서트/뮤지컬/연극 크롤링 (playwright-stealth)"""
+    # show_infor div에서 공연 정보 추출
+    show_infors = soup.select('div.show_infor')
+
+    for info in show_infors:
+        try:
+            # 링크 찾기
+            link = info.select_one('a[href*="prodId"]')
+            if not link:
+                continue
+
+            href = link.get('href', '')
+            prod_match = re.search(r'prodId=(\d+)', href)
+            if not prod_match:
+                continue
+            prod_id = prod_match.group(1)
+
+            # 제목 - show_infor 전체 텍스트에서 추출
+            full_text = info.get_text(strip=True, separator=' ')
+
+            # 특수문자 제거 (nbsp 등)
+            full_text = full_text.replace('\xa0', ' ').replace('\u200b', '')
+
+            # "판매중" 또는 "단독판매" 등의 태그 제거
+            title = full_text
+            for tag in ['단독판매', '판매중', '판매예정', '판매종료']:
+                title = title.replace(tag, '')
+            title = ' '.join(title.split())  # 공백 정리
+
+            if not title or len(title) < 3:
+                continue
+
+            # 카테고리 메뉴 필터
+            if title in ['콘서트', '뮤지컬/연극', '클래식', '전시/행사']:
+                continue
+
+            # 이미지 찾기
+            poster = ''
+            img = info.select_one('img')
+            if img:
+                poster = img.get('src', '') or img.get('data-src', '')
+                if poster and poster.startswith('//'):
+                    poster = 'https:' + poster
+
+            # 링크 생성
+            full_link = f'https://ticket.melon.com/performance/index.htm?prodId={prod_id}'
+
+            tickets.append({
+                'name': title[:100],
+                'date': '',
+                'venue': '',
+                'poster': poster,
+                'source': '멜론티켓',
+                'source_color': '#00cd3c',
+                'link': full_link,
+                'category': categorize_concert(title),
+                'part': classify_part(title),
+                'hash': get_cache_key(normalize_name(title))
+            })
+        except Exception:
+            continue
+
+    return tickets
+
+
+def parse_yes24_genre(html, default_part, seen_codes):
+    """YES24 장르 페이지 HTML 파싱 (seen_codes: 장르 간 PerfCode 중복 방지용 집합)"""
     tickets = []
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # 링크에서 공연 정보 추출
+    perf_links = soup.select('a[href*="PerfCode"], a[href*="Perf/"], a[href*="/New/Perf"]')
+
+    for link in perf_links:
+        try:
+            href = link.get('href', '')
+            if not href:
+                continue
+
+            # PerfCode 추출
+            code_match = re.search(r'PerfCode=(\d+)', href) or re.search(r'/Perf/(\d+)', href)
+            if not code_match:
+                continue
+            perf_code = code_match.group(1)
+
+            if perf_code in seen_codes:
+                continue
+            seen_codes.add(perf_code)
+
+            # 제목 찾기
+            title = link.get('title', '')
+            if not title:
+                title = link.get_text(strip=True)
+
+            # 부모에서 제목 찾기
+            if not title or len(title) < 3:
+                parent = link.parent
+                for _ in range(3):
+                    if parent:
+                        title_el = parent.select_one('.goods-name, .tit, .title, strong, h3, h4, p')
+                        if title_el:
+                            title = title_el.get_text(strip=True)
+                            if title and len(title) >= 3:
+                                break
+                        parent = parent.parent
+
+            if not title or len(title) < 3:
+                continue
+
+            # 특수문자 정리
+            title = title.replace('\xa0', ' ').replace('\u200b', '')
+            title = ' '.join(title.split())
+
+            # 필터
+            if any(kw in title for kw in ['프로모션', '혜택', '이벤트', '광고']):
+                continue
+
+            # 이미지 찾기 (여러 레벨에서 탐색)
+            poster = ''
+            img = link.select_one('img')
+
+            # 링크 안에 없으면 부모들에서 찾기
+            if not img:
+                parent = link.parent
+                for _ in range(5):
+                    if parent:
+                        img = parent.select_one('img')
+                        if img:
+                            break
+                        parent = parent.parent
+
+            if img:
+                poster = (img.get('src', '') or
+                          img.get('data-src', '') or
+                          img.get('data-original', '') or
+                          img.get('data-lazy-src', ''))
+
+                if poster:
+                    # noimg 플레이스홀더 필터링 (YES24 기본 로고)
+                    if 'noimg' in poster.lower():
+                        poster = ''
+                    elif poster.startswith('//'):
+                        poster = 'https:' + poster
+                    elif not poster.startswith('http'):
+                        poster = 'https://ticket.yes24.com' + poster
+
+            # 날짜/장소 찾기 (부모에서)
+            date_text = ''
+            venue = ''
+            parent = link.parent
+            if parent:
+                date_el = parent.select_one('.date, .period, [class*="date"]')
+                if date_el:
+                    date_text = date_el.get_text(strip=True)
+                venue_el = parent.select_one('.place, .venue, [class*="place"]')
+                if venue_el:
+                    venue = venue_el.get_text(strip=True)
+
+            full_link = f'https://ticket.yes24.com/Perf/{perf_code}'
+
+            # 파트 분류: 기본값 사용하되, 제목으로 재분류
+            item_part = classify_part(title) if default_part == 'concert' else default_part
+
+            tickets.append({
+                'name': title[:100],
+                'date': date_text,
+                'venue': venue,
+                'poster': poster,
+                'source': 'YES24',
+                'source_color': '#ffc800',
+                'link': full_link,
+                'category': categorize_concert(title),
+                'part': item_part,
+                'hash': get_cache_key(normalize_name(title))
+            })
+        except Exception:
+            continue
+
+    return tickets
+
+
+def parse_yes24_poster(html):
+    """YES24 상세 페이지 HTML에서 포스터 URL 추출 (없으면 빈 문자열)"""
+    detail_soup = BeautifulSoup(html, 'html.parser')
+    # .rn-product-imgbox img에서 포스터 추출
+    poster_img = detail_soup.select_one('.rn-product-imgbox img')
+    if poster_img:
+        src = poster_img.get('src', '') or poster_img.get('data-src', '')
+        if src and 'noimg' not in src.lower():
+            if src.startswith('//'):
+                src = 'https:' + src
+            elif not src.startswith('http'):
+                src = 'https://ticket.yes24.com' + src
+            return src
+    return ''
+
+# YES24 크롤링 장르: (URL, 파트)
+YES24_GENRE_URLS = [
+    ("https://ticket.yes24.com/New/Genre/GenreMain.aspx?genre=15457", "concert"),   # 콘서트
+    ("https://ticket.yes24.com/New/Genre/GenreMain.aspx?genre=15458", "theater"),    # 뮤지컬
+    ("https://ticket.yes24.com/New/Genre/GenreMain.aspx?genre=15459", "theater"),    # 연극
+]
+MELON_CONCERT_URL = "https://ticket.melon.com/concert/index.htm"
+
+
+def wait_for_list(page, selector):
+    """목록 선택자가 DOM에 붙을 때까지 대기 (시간 초과 시 현재 HTML 그대로 파싱)"""
+    try:
+        page.wait_for_selector(selector, state='attached', timeout=LIST_SELECTOR_TIMEOUT_MS)
+    except PlaywrightTimeoutError:
+        pass
+
+
+def crawl_melon(page=None):
+    """멜론티켓 콘서트 크롤링 (page 전달 시 워커의 웜 컨텍스트 재사용)"""
+    if page is None:
+        return run_with_browser(crawl_melon, 'melon')
+
+    try:
+        page.goto(MELON_CONCERT_URL, wait_until='domcontentloaded')
+        wait_for_list(page, MELON_LIST_SELECTOR)
+        tickets = parse_melon_list(page.content())
+    except Exception as e:
+        return {'success': False, 'error': str(e), 'data': []}
+
+    unique = dedupe_by_hash(tickets)
+    return {'success': True, 'data': unique, 'count': len(unique)}
+
 
-    # 크롤링할 장르들: (URL, 파트)
-    genre_urls = [
-        ("https://ticket.yes24.com/New/Genre/GenreMain.aspx?genre=15457", "concert"),   # 콘서트
-        ("https://ticket.yes24.com/New/Genre/GenreMain.aspx?genre=15458", "theater"),    # 뮤지컬
-        ("https://ticket.yes24.com/New/Genre/GenreMain.aspx?genre=15459", "theater"),    # 연극
-    ]
+def crawl_yes24(page=None):
+    """YES24 콘서트/뮤지컬/연극 크롤링 (playwright-stealth)"""
+    if page is None:
+        return run_with_browser(crawl_yes24, 'yes24')
 
+    tickets = []
     seen_codes = set()
 
-    with sync_playwright() as pw:
-        browser, context, page = get_browser_context(pw, headless=False, stealth=True)
-        try:
-            for genre_url, default_part in genre_urls:
-                try:
-                    page.goto(genre_url, wait_until='domcontentloaded')
-                    page.wait_for_load_state('networkidle')
-
-                    soup = BeautifulSoup(page.content(), 'html.parser')
-
-                    # 링크에서 공연 정보 추출
-                    perf_links = soup.select('a[href*="PerfCode"], a[href*="Perf/"], a[href*="/New/Perf"]')
-
-                    for link in perf_links:
-                        try:
-                            href = link.get('href', '')
-                            if not href:
-                                continue
-
-                            # PerfCode 추출
-                            code_match = re.search(r'PerfCode=(\d+)', href) or re.search(r'/Perf/(\d+)', href)
-                            if not code_match:
-                                continue
-                            perf_code = code_match.group(1)
-
-                            if perf_code in seen_codes:
-                                continue
-                            seen_codes.add(perf_code)
-
-                            # 제목 찾기
-                            title = link.get('title', '')
-                            if not title:
-                                title = link.get_text(strip=True)
-
-                            # 부모에서 제목 찾기
-                            if not title or len(title) < 3:
-                                parent = link.parent
-                                for _ in range(3):
-                                    if parent:
-                                        title_el = parent.select_one('.goods-name, .tit, .title, strong, h3, h4, p')
-                                        if title_el:
-                                            title = title_el.get_text(strip=True)
-                                            if title and len(title) >= 3:
-                                                break
-                                        parent = parent.parent
-
-                            if not title or len(title) < 3:
-                                continue
-
-                            # 특수문자 정리
-                            title = title.replace('\xa0', ' ').replace('\u200b', '')
-                            title = ' '.join(title.split())
-
-                            # 필터
-                            if any(kw in title for kw in ['프로모션', '혜택', '이벤트', '광고']):
-                                continue
-
-                            # 이미지 찾기 (여러 레벨에서 탐색)
-                            poster = ''
-                            img = link.select_one('img')
-
-                            # 링크 안에 없으면 부모들에서 찾기
-                            if not img:
-                                parent = link.parent
-                                for _ in range(5):
-                                    if parent:
-                                        img = parent.select_one('img')
-                                        if img:
-                                            break
-                                        parent = parent.parent
-
-                            if img:
-                                poster = (img.get('src', '') or
-                                          img.get('data-src', '') or
-                                          img.get('data-original', '') or
-                                          img.get('data-lazy-src', ''))
-
-                                if poster:
-                                    # noimg 플레이스홀더 필터링 (YES24 기본 로고)
-                                    if 'noimg' in poster.lower():
-                                        poster = ''
-                                    elif poster.startswith('//'):
-                                        poster = 'https:' + poster
-                                    elif not poster.startswith('http'):
-                                        poster = 'https://ticket.yes24.com' + poster
-
-                            # 날짜/장소 찾기 (부모에서)
-                            date_text = ''
-                            venue = ''
-                            parent = link.parent
-                            if parent:
-                                date_el = parent.select_one('.date, .period, [class*="date"]')
-                                if date_el:
-                                    date_text = date_el.get_text(strip=True)
-                                venue_el = parent.select_one('.place, .venue, [class*="place"]')
-                                if venue_el:
-                                    venue = venue_el.get_text(strip=True)
-
-                            full_link = f'https://ticket.yes24.com/Perf/{perf_code}'
-
-                            # 파트 분류: 기본값 사용하되, 제목으로 재분류
-                            item_part = classify_part(title) if default_part == 'concert' else default_part
-
-                            tickets.append({
-                                'name': title[:100],
-                                'date': date_text,
-                                'venue': venue,
-                                'poster': poster,
-                                'source': 'YES24',
-                                'source_color': '#ffc800',
-                                'link': full_link,
-                                'category': categorize_concert(title),
-                                'part': item_part,
-                                'hash': get_cache_key(normalize_name(title))
-                            })
-                        except Exception:
-                            continue
-                except Exception:
-                    continue  # 개별 장르 페이지 오류 시 다음으로
-
-        except Exception as e:
-            return {'success': False, 'error': str(e), 'data': []}
-        finally:
-            browser.close()
+    try:
+        for genre_url, default_part in YES24_GENRE_URLS:
+            try:
+                page.goto(genre_url, wait_until='domcontentloaded')
+                wait_for_list(page, YES24_LIST_SELECTOR)
+                tickets.extend(parse_yes24_genre(page.content(), default_part, seen_codes))
+            except Exception:
+                continue  # 개별 장르 페이지 오류 시 다음으로
+
+    except Exception as e:
+        return {'success': False, 'error': str(e), 'data': []}
 
     # 2차 패스: 포스터 없는 항목은 requests로 빠르게 보충 (병렬, ~2-3초)
     no_poster_items = [t for t in tickets if not t.get('poster')]
     if no_poster_items:
         def _fetch_poster(item):
             try:
-                code_match = re.search(r'/Perf/(\d+)', item['link'])
-                if not code_match:
-                    return
-                url = item['link']
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                }
-                resp = requests.get(url, headers=headers, timeout=10)
+                resp = get_session('yes24').get(item['link'], timeout=10)
                 if resp.status_code != 200:
                     return
-                detail_soup = BeautifulSoup(resp.text, 'html.parser')
-                # .rn-product-imgbox img에서 포스터 추출
-                poster_img = detail_soup.select_one('.rn-product-imgbox img')
-                if poster_img:
-                    src = poster_img.get('src', '') or poster_img.get('data-src', '')
-                    if src and 'noimg' not in src.lower():
-                        if src.startswith('//'):
-                            src = 'https:' + src
-                        elif not src.startswith('http'):
-                            src = 'https://ticket.yes24.com' + src
-                        item['poster'] = src
+                poster = parse_yes24_poster(resp.text)
+                if poster:
+                    item['poster'] = poster
             except Exception:
                 pass
 
         with ThreadPoolExecutor(max_workers=5) as executor:
             executor.map(_fetch_poster, no_poster_items)
 
-    seen = set()
-    unique = [t for t in tickets if not (t['hash'] in seen or seen.add(t['hash']))]
-
+    unique = dedupe_by_hash(tickets)
     return {'success': True, 'data': unique, 'count': len(unique)}
 
 
-def crawl_melon_detail(prod_id):
-    """멜론티켓 상세 페이지 크롤링"""
+# =============================================
+# 비동기 크롤링 (playwright.async_api)
+# 장르 페이지를 한 브라우저 안의 여러 페이지로 동시에 열고,
+# 포스터 보충은 호스트별 동시성 제한을 둔 비동기 HTTP 태스크로 처리
+# =============================================
+async def get_async_browser_context(playwright, headless=True, stealth=False, block=None):
+    """get_browser_context의 비동기 버전 → (browser, context) 튜플"""
+    launch_args = list(BROWSER_LAUNCH_ARGS)
+    if not headless:
+        launch_args.append('--window-position=-2400,-2400')
 
-    with sync_playwright() as pw:
-        browser, context, page = get_browser_context(pw, headless=True, stealth=False)
+    browser = await playwright.chromium.launch(headless=headless, args=launch_args)
+    context = await browser.new_context(
+        viewport={'width': 1920, 'height': 1080},
+        user_agent=USER_AGENT,
+    )
+
+    if stealth:
         try:
-            url = f"https://ticket.melon.com/performance/index.htm?prodId={prod_id}"
-            page.goto(url, wait_until='domcontentloaded')
-            page.wait_for_load_state('networkidle')
+            from playwright_stealth import Stealth
+            await Stealth().apply_stealth_async(context)
+        except ImportError:
+            await context.add_init_script(STEALTH_INIT_SCRIPT)
 
-            soup = BeautifulSoup(page.content(), 'html.parser')
+    if block:
+        async def _route_handler(route):
+            if _is_blocked_request(route.request, block):
+                await route.abort()
+            else:
+                await route.continue_()
+        await context.route('**/*', _route_handler)
 
-            result = {
-                'date': '',
-                'venue': '',
-                'price': '',
-                'cast': '',
-                'runtime': '',
-                'age': ''
-            }
-
-            # 공연 정보 테이블에서 추출
-            info_items = soup.select('.box_consert_info dt, .box_consert_info dd, .info_data dt, .info_data dd')
-            current_label = ''
-            for item in info_items:
-                text = item.get_text(strip=True)
-                if item.name == 'dt':
-                    current_label = text
-                elif item.name == 'dd' and current_label:
-                    if '기간' in current_label or '일시' in current_label or '공연기간' in current_label:
-                        result['date'] = text
-                    elif '장소' in current_label or '공연장' in current_label:
-                        result['venue'] = text
-                    elif '가격' in current_label or '티켓' in current_label:
-                        result['price'] = text
-                    elif '출연' in current_label or '아티스트' in current_label or '캐스팅' in current_label:
-                        result['cast'] = text
-                    elif '관람시간' in current_label or '런타임' in current_label:
-                        result['runtime'] = text
-                    elif '관람등급' in current_label or '연령' in current_label:
-                        result['age'] = text
-
-            # 대체 선택자로 시도
-            if not result['date']:
-                date_el = soup.select_one('.txt_consert_date, .show_date, [class*="date"]')
-                if date_el:
-                    result['date'] = date_el.get_text(strip=True)
+    return browser, context
 
-            if not result['venue']:
-                venue_el = soup.select_one('.txt_consert_place, .show_place, [class*="place"]')
-                if venue_el:
-                    result['venue'] = venue_el.get_text(strip=True)
 
-            if not result['price']:
-                price_el = soup.select_one('.txt_consert_price, .show_price, [class*="price"]')
-                if price_el:
-                    result['price'] = price_el.get_text(strip=True)
+async def _fetch_page_html(context, url, selector):
+    """새 페이지에서 URL 로드 → 목록 선택자 대기 후 HTML 반환 (페이지는 즉시 닫음)"""
+    page = await context.new_page()
+    try:
+        await page.goto(url, wait_until='domcontentloaded')
+        try:
+            await page.wait_for_selector(selector, state='attached', timeout=LIST_SELECTOR_TIMEOUT_MS)
+        except AsyncPlaywrightTimeoutError:
+            pass
+        return await page.content()
+    finally:
+        await page.close()
 
-            return {'success': True, 'data': result}
 
-        except Exception as e:
-            return {'success': False, 'error': str(e), 'data': {}}
-        finally:
-            browser.close()
+class HostLimiter:
+    """전체 + 호스트별 동시 요청 수 제한 (asyncio.Semaphore)"""
 
+    def __init__(self, total, per_host):
+        self.total = asyncio.Semaphore(total)
+        self.per_host = per_host
+        self.hosts = {}
 
-def crawl_yes24_detail(perf_code):
-    """YES24 상세 페이지 크롤링"""
+    @contextlib.asynccontextmanager
+    async def slot(self, url):
+        host = urlparse(url).hostname or ''
+        host_sem = self.hosts.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with self.total, host_sem:
+            yield
 
-    with sync_playwright() as pw:
-        browser, context, page = get_browser_context(pw, headless=False, stealth=True)
+
+async def _backfill_posters_async(context, items):
+    """포스터 없는 YES24 항목을 상세 페이지 HTTP 요청으로 보충 (브라우저 렌더링 없음)"""
+    limiter = HostLimiter(CRAWLER_POSTER_CONCURRENCY, CRAWLER_POSTER_PER_HOST)
+
+    async def _fetch_poster(item):
         try:
-            url = f"https://ticket.yes24.com/Perf/{perf_code}"
-            page.goto(url, wait_until='domcontentloaded')
-            page.wait_for_load_state('networkidle')
+            async with limiter.slot(item['link']):
+                resp = await context.request.get(item['link'], timeout=10000)
+                if resp.status != 200:
+                    return
+                html = await resp.text()
+            poster = parse_yes24_poster(html)
+            if poster:
+                item['poster'] = poster
+        except Exception:
+            pass
 
-            soup = BeautifulSoup(page.content(), 'html.parser')
+    await asyncio.gather(*(_fetch_poster(item) for item in items))
 
-            result = {
-                'date': '',
-                'venue': '',
-                'price': '',
-                'cast': '',
-                'runtime': '',
-                'age': ''
-            }
-
-            # rn-product-area1 영역에서 정보 추출
-            info_area = soup.select_one('.rn-product-area1')
-            if info_area:
-                dts = info_area.select('dt')
-                dds = info_area.select('dd')
-
-                for i, dt in enumerate(dts):
-                    label = dt.get_text(strip=True)
-                    if i < len(dds):
-                        value = dds[i].get_text(strip=True)
-
-                        if '기간' in label or '일시' in label or '일자' in label:
-                            result['date'] = value
-                        elif '장소' in label or '공연장' in label:
-                            result['venue'] = value
-                        elif '가격' in label:
-                            result['price'] = value
-                        elif '출연' in label or '기연' in label or '캐스팅' in label or '아티스트' in label:
-                            result['cast'] = value
-                        elif '관람시간' in label or '런타임' in label or '시간' in label:
-                            result['runtime'] = value
-                        elif '관람가' in label or '등급' in label or '연령' in label:
-                            result['age'] = value
-
-            # 대체: 전체 페이지에서 찾기
-            if not result['date']:
-                schedule_items = soup.select('.rn-product-info dt, .rn-product-info dd, .product-info dt, .product-info dd')
-                current_label = ''
-                for item in schedule_items:
-                    text = item.get_text(strip=True)
-                    if item.name == 'dt':
-                        current_label = text
-                    elif item.name == 'dd' and current_label:
-                        if '기간' in current_label or '일시' in current_label:
-                            result['date'] = text
-                        elif '장소' in current_label:
-                            result['venue'] = text
-                        elif '가격' in current_label:
-                            result['price'] = text
-                        elif '출연' in current_label or '기연' in current_label:
-                            result['cast'] = text
-
-            # 가격 정보 별도 추출 시도
-            if not result['price']:
-                price_area = soup.select_one('.rn-price-area, .price-info, [class*="price"]')
-                if price_area:
-                    result['price'] = price_area.get_text(strip=True)[:200]
-
-            return {'success': True, 'data': result}
-
-        except Exception as e:
-            return {'success': False, 'error': str(e), 'data': {}}
+
+async def _melon_list_async(context):
+    """컨텍스트 1개로 멜론티켓 목록 수집 → 크롤러 결과 dict"""
+    try:
+        tickets = parse_melon_list(await _fetch_page_html(context, MELON_CONCERT_URL, MELON_LIST_SELECTOR))
+    except Exception as e:
+        return {'success': False, 'error': str(e), 'data': []}
+
+    unique = dedupe_by_hash(tickets)
+    return {'success': True, 'data': unique, 'count': len(unique)}
+
+
+async def _yes24_list_async(context):
+    """컨텍스트 1개로 YES24 장르 페이지 동시 수집 → 크롤러 결과 dict"""
+    tickets = []
+    seen_codes = set()
+    try:
+        pages = await asyncio.gather(
+            *(_fetch_page_html(context, url, YES24_LIST_SELECTOR) for url, _ in YES24_GENRE_URLS),
+            return_exceptions=True
+        )
+        # 파싱은 장르 순서대로 (동기 버전과 동일한 중복 제거 결과 보장)
+        for html, (_, default_part) in zip(pages, YES24_GENRE_URLS):
+            if isinstance(html, Exception):
+                continue  # 개별 장르 페이지 오류 시 다음으로
+            tickets.extend(parse_yes24_genre(html, default_part, seen_codes))
+
+        # 2차 패스: 포스터 없는 항목 보충 (브라우저 컨텍스트의 HTTP 클라이언트 사용)
+        no_poster_items = [t for t in tickets if not t.get('poster')]
+        if no_poster_items:
+            await _backfill_posters_async(context, no_poster_items)
+    except Exception as e:
+        return {'success': False, 'error': str(e), 'data': []}
+
+    unique = dedupe_by_hash(tickets)
+    return {'success': True, 'data': unique, 'count': len(unique)}
+
+
+# 사이트 → 비동기 목록 수집 함수 (사이트명 = 브라우저 프로필명)
+ASYNC_LIST_CRAWLERS = {
+    'melon': _melon_list_async,
+    'yes24': _yes24_list_async,
+}
+
+
+async def crawl_list_async(site, context=None):
+    """비동기 목록 크롤링
+
+    context를 주면 그 컨텍스트를 재사용 (크롤러 워커의 상주 브라우저),
+    없으면 브라우저를 띄워 1회 수집 후 종료 (단독 실행용)
+    """
+    if context is not None:
+        return await ASYNC_LIST_CRAWLERS[site](context)
+    async with async_playwright() as pw:
+        browser, context = await get_async_browser_context(pw, **BROWSER_PROFILES[site])
+        try:
+            return await ASYNC_LIST_CRAWLERS[site](context)
         finally:
-            browser.close()
+            await browser.close()
+
+
+async def crawl_melon_async():
+    """멜론티켓 콘서트 크롤링 (비동기)"""
+    return await crawl_list_async('melon')
+
+
+async def crawl_yes24_async():
+    """YES24 콘서트/뮤지컬/연극 크롤링 (비동기, 장르 페이지 동시 로드)"""
+    return await crawl_list_async('yes24')
+
+
+def run_list_crawl(site):
+    """목록 크롤링 1회 실행 (단독 실행용: CRAWLER_ASYNC_MODE면 비동기 엔진, 아니면 기존 동기 함수)
+
+    크롤러 워커는 이 함수 대신 상주 이벤트 루프의 웜 브라우저로 crawl_list_async를 실행
+    """
+    if CRAWLER_ASYNC_MODE:
+        return asyncio.run(crawl_list_async(site))
+    return crawl_melon() if site == 'melon' else crawl_yes24()
+
+
+def crawl_melon_detail(prod_id, page=None):
+    """멜론티켓 상세 페이지 크롤링"""
+    if page is None:
+        return run_with_browser(lambda p: crawl_melon_detail(prod_id, p), 'melon')
+
+    try:
+        url = f"https://ticket.melon.com/performance/index.htm?prodId={prod_id}"
+        page.goto(url, wait_until='domcontentloaded')
+        page.wait_for_load_state('networkidle')
+
+        soup = BeautifulSoup(page.content(), 'html.parser')
+
+        result = {
+            'date': '',
+            'venue': '',
+            'price': '',
+            'cast': '',
+            'runtime': '',
+            'age': ''
+        }
+
+        # 공연 정보 테이블에서 추출
+        info_items = soup.select('.box_consert_info dt, .box_consert_info dd, .info_data dt, .info_data dd')
+        current_label = ''
+        for item in info_items:
+            text = item.get_text(strip=True)
+            if item.name == 'dt':
+                current_label = text
+            elif item.name == 'dd' and current_label:
+                if '기간' in current_label or '일시' in current_label or '공연기간' in current_label:
+                    result['date'] = text
+                elif '장소' in current_label or '공연장' in current_label:
+                    result['venue'] = text
+                elif '가격' in current_label or '티켓' in current_label:
+                    result['price'] = text
+                elif '출연' in current_label or '아티스트' in current_label or '캐스팅' in current_label:
+                    result['cast'] = text
+                elif '관람시간' in current_label or '런타임' in current_label:
+                    result['runtime'] = text
+                elif '관람등급' in current_label or '연령' in current_label:
+                    result['age'] = text
+
+        # 대체 선택자로 시도
+        if not result['date']:
+            date_el = soup.select_one('.txt_consert_date, .show_date, [class*="date"]')
+            if date_el:
+                result['date'] = date_el.get_text(strip=True)
+
+        if not result['venue']:
+            venue_el = soup.select_one('.txt_consert_place, .show_place, [class*="place"]')
+            if venue_el:
+                result['venue'] = venue_el.get_text(strip=True)
+
+        if not result['price']:
+            price_el = soup.select_one('.txt_consert_price, .show_price, [class*="price"]')
+            if price_el:
+                result['price'] = price_el.get_text(strip=True)
+
+        return {'success': True, 'data': result}
+
+    except Exception as e:
+        return {'success': False, 'error': str(e), 'data': {}}
+
+
+def crawl_yes24_detail(perf_code, page=None):
+    """YES24 상세 페이지 크롤링 (브라우저, HTTP 우선 수집이 막혔을 때 사용)"""
+    if page is None:
+        return run_with_browser(lambda p: crawl_yes24_detail(perf_code, p), 'yes24')
+
+    try:
+        page.goto(YES24_DETAIL_URL.format(perf_code=perf_code), wait_until='domcontentloaded')
+        # 가격/출연진은 AJAX로 늦게 채워지므로 상세 영역이 아니라 네트워크 유휴까지 대기
+        page.wait_for_load_state('networkidle')
+
+        result = parse_yes24_detail(page.content())
+        return {'success': True, 'data': result}
+
+    except Exception as e:
+        return {'success': False, 'error': str(e), 'data': {}}
 
 
 if __name__ == '__main__':
@@ -483,10 +682,8 @@ if __name__ == '__main__':
 
     site = sys.argv[1].lower()
 
-    if site == 'melon':
-        result = crawl_melon()
-    elif site == 'yes24':
-        result = crawl_yes24()
+    if site in ('melon', 'yes24'):
+        result = run_list_crawl(site)
     elif site == 'melon_detail':
         if len(sys.argv) < 3:
             result = {'error': 'prod_id required'}
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+크롤러 워커 클라이언트
+상주 워커(crawler_worker.py)에 작업 전달, 미가동 시 subprocess 폴백
+"""
+import os
+import sys
+import json
+import logging
+import secrets
+import time
+import subprocess
+import threading
+from collections import namedtuple
+from multiprocessing.connection import Client
+
+from config import (
+    CRAWLER_WORKER_HOST, CRAWLER_WORKER_PORT, CRAWLER_WORKER_AUTHKEY, CRAWLER_WORKER_KEY_FILE,
+    CRAWLER_WORKER_LOCK_FILE, CRAWLER_WORKER_AUTOSTART
+)
+from services.shared_cache import SchedulerLock
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CRAWLER_SCRIPT = os.path.join(PROJECT_ROOT, 'playwright_crawler.py')
+WORKER_SCRIPT = os.path.join(PROJECT_ROOT, 'crawler_worker.py')
+
+# 워커 통신 메시지 (양쪽 프로세스에서 pickle로 주고받음)
+CrawlJob = namedtuple('CrawlJob', ['name', 'arg', 'timeout'])
+CrawlResult = namedtuple('CrawlResult', ['success', 'payload', 'error', 'elapsed'])
+
+# 작업명 → 필수 인자 여부
+CRAWL_JOBS = {
+    'melon': False,
+    'yes24': False,
+    'melon_detail': True,
+    'yes24_detail': True,
+}
+
+SPAWN_RETRY_SECONDS = 30  # 같은 프로세스에서 워커 기동 재시도 간격
+
+_spawn_lock = threading.Lock()
+_next_spawn = 0.0
+_authkey = None
+
+
+class CrawlerTimeout(Exception):
+    """크롤링 작업 시간 초과"""
+
+
+def load_worker_authkey(create=False):
+    """워커 인증 키 (환경변수 → 키 파일 순) → bytes, 없으면 None
+
+    create면 키 파일이 없을 때 무작위 키를 만들어 소유자만 읽을 수 있게 저장 (gunicorn 워커/크롤러 워커 공유)
+    """
+    if CRAWLER_WORKER_AUTHKEY:
+        return CRAWLER_WORKER_AUTHKEY.encode('utf-8')
+    try:
+        with open(CRAWLER_WORKER_KEY_FILE, 'rb') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        if not create:
+            return None
+    except OSError as e:
+        logging.warning(f"크롤러 워커 키 읽기 실패: {e}")
+        return None
+
+    key = secrets.token_hex(32).encode('ascii')
+    try:
+        os.makedirs(os.path.dirname(CRAWLER_WORKER_KEY_FILE), exist_ok=True)
+        fd = os.open(CRAWLER_WORKER_KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return load_worker_authkey()  # 다른 프로세스가 먼저 생성
+    except OSError as e:
+        logging.warning(f"크롤러 워커 키 생성 실패: {e}")
+        return None
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    return key
+
+
+def _client_authkey():
+    global _authkey
+    if _authkey is None:
+        _authkey = load_worker_authkey(create=True)
+    return _authkey
+
+
+def _spawn_worker(authkey):
+    """상주 워커 프로세스 기동
+
+    워커 잠금 파일을 먼저 잡은 gunicorn 워커 1개만 기동하고, 잠금은 워커 프로세스가 이어받아 유지
+    (워커가 떠 있거나 다른 프로세스가 기동 중이면 잠금 실패로 건너뜀)
+    """
+    global _next_spawn
+    with _spawn_lock:
+        now = time.monotonic()
+        if now < _next_spawn:
+            return
+        _next_spawn = now + SPAWN_RETRY_SECONDS
+
+    lock = SchedulerLock(CRAWLER_WORKER_LOCK_FILE)
+    try:
+        os.makedirs(os.path.dirname(CRAWLER_WORKER_LOCK_FILE), exist_ok=True)
+        if not lock.acquire():
+            return
+    except OSError as e:
+        logging.warning(f"크롤러 워커 잠금 실패: {e}")
+        return
+    fd = lock.handover()
+    try:
+        subprocess.Popen(
+            [sys.executable, WORKER_SCRIPT],
+            cwd=PROJECT_ROOT,
+            env=dict(os.environ, CRAWLER_WORKER_AUTHKEY=authkey.decode('utf-8'), CRAWLER_WORKER_LOCK_FD=str(fd)),
+            pass_fds=(fd,) if fd >= 0 else (),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        logging.info("크롤러 워커 기동 요청")
+    except Exception as e:
+        logging.warning(f"크롤러 워커 기동 실패: {e}")
+    finally:
+        if fd >= 0:
+            os.close(fd)
+
+
+def _run_subprocess(job, arg, timeout):
+    """기존 방식: 작업마다 playwright_crawler.py 프로세스 실행"""
+    cmd = [sys.executable, CRAWLER_SCRIPT, job]
+    if arg is not None:
+        cmd.append(str(arg))
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            timeout=timeout,
+            cwd=PROJECT_ROOT,
+            encoding='utf-8',
+            errors='replace'
+        )
+    except subprocess.TimeoutExpired:
+        raise CrawlerTimeout(job)
+
+    if result.returncode == 0 and result.stdout:
+        return json.loads(result.stdout)
+    return {'success': False, 'error': result.stderr or 'No output'}
+
+
+def run_crawler_job(job, arg=None, timeout=120):
+    """크롤링 작업 실행 → 크롤러 결과 dict 반환 (시간 초과 시 CrawlerTimeout)"""
+    if job not in CRAWL_JOBS:
+        return {'success': False, 'error': f'Unknown job: {job}'}
+
+    authkey = _client_authkey()
+    if authkey is None:
+        return _run_subprocess(job, arg, timeout)
+
+    try:
+        conn = Client((CRAWLER_WORKER_HOST, CRAWLER_WORKER_PORT), authkey=authkey)
+    except OSError:
+        if CRAWLER_WORKER_AUTOSTART:
+            _spawn_worker(authkey)
+        return _run_subprocess(job, arg, timeout)
+
+    try:
+        conn.send(CrawlJob(job, arg, timeout))
+        if not conn.poll(timeout):
+            raise CrawlerTimeout(job)
+        result = conn.recv()
+    except (EOFError, OSError) as e:
+        logging.warning(f"크롤러 워커 통신 실패, subprocess로 재시도: {e}")
+        return _run_subprocess(job, arg, timeout)
+    finally:
+        conn.close()
+
+    if not result.success:
+        return {'success': False, 'error': result.error}
+    return result.payload
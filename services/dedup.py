@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+소스 간 유사 공연 중복 제거 색인
+공연명이 조금씩 다른 같은 공연(예: KOPIS '롤링 31주년 기념 공연, AxMxP 단독 콘서트: DO IT MY WAY'
+↔ 멜론 'AxMxP 단독 콘서트 ‘DO IT MY WAY’ : 롤링 31주년 기념 공연')을 찾아 한 카드로 병합
+
+1단계(후보): 공연명 글자 2-gram MinHash + LSH 밴드 버킷 → 전체 쌍 비교 없이 유사 후보만 추출
+2단계(검증): 공연명 유사도 + 지역/공연장/공연 기간으로 신뢰도 계산, 기준 이상만 병합
+"""
+import os
+import re
+import zlib
+import random
+import threading
+from datetime import datetime
+
+from constants import normalize_name, VENUE_REGION_MATCHER
+
+# MinHash/LSH 파라미터: 밴드 12 × 2행 → Jaccard 약 0.3 이상이면 높은 확률로 후보
+LSH_BANDS = 12
+LSH_ROWS = 2
+MATCH_THRESHOLD = 0.75  # 이 신뢰도 이상이면 같은 공연으로 병합
+TAIL_PENALTY = 0.3  # 앞부분(시리즈/페스티벌명)만 같고 뒷부분이 다른 제목 감점
+MIN_SHARED_PREFIX = 4
+VENUE_MISMATCH_PENALTY = 0.3  # 같은 제목이라도 공연장이 전혀 다르면 다른 회차
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20260101)  # 프로세스 간 같은 서명이 나오도록 고정 시드
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(LSH_BANDS * LSH_ROWS)]
+
+# 공연명에서 빼는 일반 단어 (서로 다른 공연끼리 유사도를 높이는 말)
+_GENERIC_WORDS = re.compile(r'(?:19|20)\d{2}(?:-\d{2})?|뮤지컬|연극|단독|공연|콘서트|내한|일반|티켓|앵콜|encore', re.IGNORECASE)
+_BRACKETS = re.compile(r'\[[^\]]*\]|\([^)]*\)')
+_NON_WORD = re.compile(r'[^\w가-힣]')
+# 제목 앞/뒤 [지역] 표기 (KOPIS '공연명 [대전]', YES24 '[강릉] 공연명')
+_REGION_TAG = re.compile(r'^\s*\[([^\]]{1,10})\]|\[([^\]]{1,10})\]\s*$')
+_HANGUL_TAG = re.compile(r'[가-힣]{2,3}')
+# 공연장 필드가 없는 소스의 제목 끝 공연장 표기 ('... - 아이러브아트센터')
+_VENUE_SUFFIX = re.compile(r'\s[-–－]\s*([^-–－]+)$')
+MIN_VENUE_SUFFIX = 4  # 이보다 짧은 꼬리('- 부산')는 공연장이 아니라 지역 표기로 봄
+
+
+def _bigrams(text):
+    """정규화 문자열 → 글자 2-gram 집합 (1글자면 그대로)"""
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def name_key(name):
+    """공연명 → 비교용 정규화 문자열 (연도/일반 단어 제외)"""
+    return normalize_name(_GENERIC_WORDS.sub(' ', name or ''))
+
+
+def name_shingles(name):
+    """공연명 → 비교용 2-gram 집합"""
+    return _bigrams(name_key(name))
+
+
+def region_tag(name):
+    """공연명 앞/뒤 [지역] 표기 → 권역 (표기가 없으면 None, 키워드에 없는 지명은 '기타')"""
+    for match in _REGION_TAG.finditer(name or ''):
+        tag = (match.group(1) or match.group(2)).strip()
+        region = VENUE_REGION_MATCHER.first(tag)
+        if region:
+            return region
+        if _HANGUL_TAG.fullmatch(tag) and not _GENERIC_WORDS.fullmatch(tag):
+            return '기타'
+    return None
+
+
+def venue_shingles(venue):
+    """공연장명 → 2-gram 집합 (괄호 안 별칭/관 이름 제외)"""
+    return _bigrams(_NON_WORD.sub('', _BRACKETS.sub('', venue or '')).lower())
+
+
+def minhash(shingles):
+    """MinHash 서명 (순열 수 = 밴드 × 행)"""
+    hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles]
+    return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def _parse_date(value):
+    """'YYYY.MM.DD' → 서수 (없거나 형식이 다르면 None)"""
+    try:
+        return datetime.strptime(value[:10], '%Y.%m.%d').toordinal() if value else None
+    except ValueError:
+        return None
+
+
+class _Entry:
+    """색인 항목 1건의 비교용 특징"""
+    __slots__ = ('name', 'key', 'shingles', 'signature', 'venue', 'start', 'end', 'region', 'local_tag')
+
+    def __init__(self, item, previous=None):
+        self.name = item.get('name', '')
+        venue = item.get('venue', '')
+        title = self.name
+        suffix = _VENUE_SUFFIX.search(title) if not venue else None
+        if suffix and len(_NON_WORD.sub('', suffix.group(1))) >= MIN_VENUE_SUFFIX:
+            # 제목 끝 공연장 표기는 공연명에서 빼고 공연장으로 비교
+            venue, title = suffix.group(1), title[:suffix.start()]
+        if previous is not None and previous.name == self.name:
+            # 공연명이 그대로면 서명 재계산 생략
+            self.key, self.shingles, self.signature = previous.key, previous.shingles, previous.signature
+        else:
+            self.key = name_key(title)
+            self.shingles = _bigrams(self.key)
+            self.signature = minhash(self.shingles) if self.shingles else None
+        self.venue = venue_shingles(venue)
+        self.start = _parse_date(item.get('start_date', ''))
+        self.end = _parse_date(item.get('end_date', '')) or self.start
+        region = item.get('region', '')
+        if not region or region == '미분류':
+            # 지역 정보가 없으면 공연명의 지역 표기 사용 ('[강릉]', '- 부산' 등)
+            region = VENUE_REGION_MATCHER.first(self.name)
+        self.region = region
+        # 서울 외 지역 회차 표기 ('[대전]', '[여주]') - 근거 없는 항목을 특정 지역 회차에 붙이지 않도록
+        tag = region_tag(self.name)
+        self.local_tag = tag is not None and tag != '서울'
+
+    @property
+    def has_evidence(self):
+        """공연 기간/공연장/지역 중 하나라도 있는지"""
+        return bool(self.start or self.venue or self.region)
+
+
+def match_score(a, b):
+    """두 항목이 같은 공연일 신뢰도 (0~1, 지역/기간이 어긋나면 0)"""
+    if not a.shingles or not b.shingles:
+        return 0.0
+    if a.region and b.region and a.region != b.region:
+        return 0.0
+    if a.start and b.start and (a.start > b.end + 1 or b.start > a.end + 1):
+        return 0.0
+    if (a.local_tag and not b.has_evidence) or (b.local_tag and not a.has_evidence):
+        # 기간/공연장/지역 근거 없이 공연명만으로 특정 지역 회차에 병합하지 않음
+        return 0.0
+
+    common = len(a.shingles & b.shingles)
+    smaller = min(len(a.shingles), len(b.shingles))
+    jaccard = common / (len(a.shingles) + len(b.shingles) - common)
+    # 한쪽 제목이 다른 쪽에 포함되는 경우(부제/지역 표기 생략)를 반영하되, 아주 짧은 제목은 Jaccard만 사용
+    score = jaccard if smaller < 3 else 0.5 * jaccard + 0.5 * common / smaller
+
+    # 시리즈/페스티벌명 등 앞부분만 같고 뒷부분(작품명)이 전혀 다른 제목
+    prefix = len(os.path.commonprefix((a.key, b.key)))
+    if prefix >= MIN_SHARED_PREFIX:
+        tail_a, tail_b = _bigrams(a.key[prefix:]), _bigrams(b.key[prefix:])
+        if len(a.key) - prefix >= 2 and len(b.key) - prefix >= 2 and not tail_a & tail_b:
+            score -= TAIL_PENALTY
+
+    if a.start and b.start:
+        score += 0.05
+    if a.region and a.region == b.region:
+        score += 0.05
+    if a.venue and b.venue:
+        venue_sim = len(a.venue & b.venue) / len(a.venue | b.venue)
+        if venue_sim >= 0.5:
+            score += 0.1
+        elif venue_sim < 0.15:
+            score -= VENUE_MISMATCH_PENALTY
+    else:
+        # 공연장 필드가 없는 쪽은 제목에 공연장명이 들어 있는 경우가 많음 ('... - 아이러브아트센터')
+        venue, other = (a.venue, b.shingles) if a.venue else (b.venue, a.shingles)
+        if venue and len(venue & other) / len(venue) >= 0.6:
+            score += 0.1
+    return max(0.0, min(1.0, score))
+
+
+class DedupIndex:
+    """병합 레코드 유사도 색인
+
+    entries: {키(hash): _Entry}
+    buckets: 밴드별 {밴드 서명: {키, ...}} - 같은 버킷에 든 키만 후보로 비교
+    """
+
+    def __init__(self, threshold=MATCH_THRESHOLD):
+        self.threshold = threshold
+        self.entries = {}
+        self.buckets = [{} for _ in range(LSH_BANDS)]
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _bands(signature):
+        return [signature[i * LSH_ROWS:(i + 1) * LSH_ROWS] for i in range(LSH_BANDS)]
+
+    def add(self, key, item):
+        """항목 추가/갱신"""
+        with self.lock:
+            previous = self.entries.get(key)
+            entry = _Entry(item, previous)
+            if previous is not None and previous.signature == entry.signature:
+                self.entries[key] = entry
+                return
+            self._remove(key)
+            self.entries[key] = entry
+            if entry.signature is not None:
+                for bucket, band in zip(self.buckets, self._bands(entry.signature)):
+                    bucket.setdefault(band, set()).add(key)
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None or entry.signature is None:
+            return
+        for bucket, band in zip(self.buckets, self._bands(entry.signature)):
+            keys = bucket.get(band)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del bucket[band]
+
+    def remove(self, key):
+        """항목 제거"""
+        with self.lock:
+            self._remove(key)
+
+    def candidates(self, entry):
+        """LSH 버킷이 하나라도 겹치는 키"""
+        found = set()
+        if entry.signature is None:
+            return found
+        for bucket, band in zip(self.buckets, self._bands(entry.signature)):
+            keys = bucket.get(band)
+            if keys:
+                found |= keys
+        return found
+
+    def match(self, item, exclude=None):
+        """item과 같은 공연으로 보이는 키 → (키, 신뢰도) (기준 미달이면 None)
+
+        exclude(키) → True인 후보는 제외 (같은 소스가 이미 들어 있는 레코드 등)
+        """
+        entry = _Entry(item)
+        best = None
+        with self.lock:
+            keys = self.candidates(entry)
+            scored = [(match_score(entry, self.entries[key]), key) for key in keys]
+        for score, key in sorted(scored, reverse=True):
+            if score < self.threshold:
+                break
+            if exclude is not None and exclude(key):
+                continue
+            best = (key, round(score, 3))
+            break
+        return best
+
+    def __len__(self):
+        return len(self.entries)
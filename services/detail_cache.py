@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+상세정보 캐시 (TTL + LRU)
+워커 메모리(LRU)를 1차, 워커 간 공유 SQLite를 2차로 사용
+"""
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+from utils.kv_store import SqliteStore
+
+
+class DetailCache:
+    """키별 상세정보 캐시
+
+    memory: {key: (저장 시각, 값)} - 최근 사용 순 (OrderedDict)
+    store: 워커 간 공유 SQLite (다른 워커가 받아 둔 상세정보 재사용)
+    """
+
+    def __init__(self, db_path, table, ttl, max_entries, stale_ttl=None):
+        self.ttl = ttl
+        self.stale_ttl = max(ttl, stale_ttl or ttl)  # 만료 후에도 get_entry로 꺼낼 수 있는 기간
+        self.max_entries = max_entries
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.store = SqliteStore(db_path, table)
+
+    def start_compactor(self):
+        """공유 SQLite 만료 항목 주기적 정리 시작 (워커 간 경합이 없도록 스케줄러 담당 프로세스에서만 호출)"""
+        return self.store.start_compactor(self.ttl, max_age=self.stale_ttl)
+
+    def _remember(self, key, value, saved_at):
+        """메모리 LRU에 저장 (lock 보유 상태에서 호출)"""
+        self.memory[key] = (saved_at, value)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def get_entry(self, key, max_age=None):
+        """캐시 조회 → (값, 저장 시각) (max_age초보다 오래됐거나 없으면 None, 기본 max_age는 stale_ttl)"""
+        max_age = self.stale_ttl if max_age is None else max_age
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None and now - entry[0] < max_age:
+                self.memory.move_to_end(key)
+                return entry[1], entry[0]
+
+        try:
+            row = self.store.get_entry(key, max_age)
+        except Exception as e:
+            logging.warning(f"상세 캐시 조회 실패: {e}")
+            return None
+        if row is None:
+            return None
+        value, saved_at = row
+        with self.lock:
+            self._remember(key, value, saved_at)
+        return value, saved_at
+
+    def get(self, key):
+        """캐시 조회 (만료/없음이면 None)"""
+        entry = self.get_entry(key, self.ttl)
+        return entry[0] if entry is not None else None
+
+    def is_fresh(self, saved_at):
+        """저장 시각이 TTL 이내인지"""
+        return time.time() - saved_at < self.ttl
+
+    def put(self, key, value):
+        """캐시 저장 (메모리 + 공유 저장소)"""
+        now = time.time()
+        with self.lock:
+            self._remember(key, value, now)
+        try:
+            self.store.put(key, value, now)
+        except Exception as e:
+            logging.warning(f"상세 캐시 저장 실패: {e}")
+
+    def missing(self, keys):
+        """keys 중 캐시에 없거나 만료된 키 목록 (프리페치 대상 선정용)"""
+        now = time.time()
+        with self.lock:
+            fresh = {k for k in keys if k in self.memory and now - self.memory[k][0] < self.ttl}
+        rest = [k for k in keys if k not in fresh]
+        try:
+            fresh |= set(self.store.get_many(rest, self.ttl))
+        except Exception as e:
+            logging.warning(f"상세 캐시 조회 실패: {e}")
+        return [k for k in keys if k not in fresh]
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+이미지 캐시 인덱스
+파일별 크기/수정 시각/ETag/마지막 접근 시각을 워커 간 공유 SQLite 하나에 두고, 요청 경로에서는 기본키 조회 1회만 수행
+ETag는 파일을 쓸 때 계산해 함께 등록 (요청 경로에서 파일 해시 계산 없음)
+정리(만료 + 접근 시각 기준 LRU 삭제, 디렉터리 대조)는 스케줄러 담당 프로세스의 백그라운드 스레드에서만 처리
+"""
+import os
+import time
+import hashlib
+import logging
+import threading
+
+from utils.kv_store import SqliteStore
+
+
+def content_etag(data):
+    """내용 해시 기반 강한 ETag 값 (따옴표 제외)"""
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def file_etag(path):
+    """파일 내용 해시 ETag (조각 단위로 읽어 계산)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+class ImageCacheIndex:
+    """캐시 디렉터리 인덱스 (공유 SQLite)
+
+    행: 키 = 파일명, 값 = [크기, 수정 시각, ETag], 저장 시각 = 마지막 접근 시각
+    접근 시각은 워커 메모리에 모았다가 flush()에서 한 트랜잭션으로 반영
+    """
+
+    def __init__(self, directory, db_path, max_files, max_bytes, max_age):
+        self.directory = directory
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.store = SqliteStore(db_path, 'image_cache')
+        self.touched = {}  # 파일명 → 마지막 접근 시각 (flush 전)
+        self.lock = threading.Lock()
+
+    def lookup(self, name):
+        """캐시 파일이 유효하면 접근 시각 기록 후 (경로, ETag) 반환, 없거나 만료면 None"""
+        try:
+            entry = self.store.get_entry(name)
+        except Exception as e:
+            logging.warning(f"이미지 캐시 인덱스 조회 실패: {e}")
+            return None
+        if entry is None:
+            return None
+        (size, mtime, etag), _ = entry
+        now = time.time()
+        if now - mtime > self.max_age:
+            return None
+        with self.lock:
+            self.touched[name] = now
+        return os.path.join(self.directory, name), etag
+
+    def add(self, name, size, etag, mtime=None):
+        """새 캐시 파일 등록 (쓰면서 계산한 ETag와 함께, 가장 최근 사용으로)"""
+        now = time.time()
+        try:
+            self.store.put(name, [size, mtime or now, etag], now)
+        except Exception as e:
+            logging.warning(f"이미지 캐시 인덱스 등록 실패 ({name}): {e}")
+
+    def remove(self, name):
+        """캐시 파일 삭제 + 인덱스 제거"""
+        self.store.delete(name)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
+
+    def flush(self):
+        """모아 둔 접근 시각을 공유 인덱스에 반영"""
+        with self.lock:
+            touched, self.touched = self.touched, {}
+        if not touched:
+            return
+        try:
+            self.store.touch_many(touched)
+        except Exception as e:
+            logging.warning(f"이미지 캐시 접근 시각 반영 실패: {e}")
+
+    def evict(self):
+        """만료 파일 삭제 후 파일 수/총 크기 제한을 넘으면 오래 안 쓴 순으로 삭제 → 삭제 건수"""
+        self.flush()
+        now = time.time()
+        rows = self.store.items()
+        victims = []
+        kept = []
+        for name, (size, mtime, _), _ in rows:
+            if now - mtime > self.max_age:
+                victims.append(name)
+            else:
+                kept.append((name, size))
+        files = len(kept)
+        total = sum(size for _, size in kept)
+        for name, size in kept:
+            if files <= self.max_files and total <= self.max_bytes:
+                break
+            victims.append(name)
+            files -= 1
+            total -= size
+        if not victims:
+            return 0
+
+        self.store.delete_many(victims)
+        for name in victims:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.warning(f"캐시 파일 삭제 실패 ({name}): {e}")
+        return len(victims)
+
+    def reconcile(self):
+        """캐시 디렉터리를 훑어 인덱스를 실제 파일과 맞춤 → (추가, 제거) 건수
+
+        인덱스 밖 파일(이전 버전이 남긴 파일, 등록 실패)은 여기서만 해시를 계산해 등록
+        """
+        # 목록을 먼저 읽어 두어야 대조 중 새로 등록된 파일을 사라진 것으로 지우지 않음
+        known = {name: value for name, value, _ in self.store.items()}
+        found = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for item in it:
+                    if item.name.startswith('.'):
+                        continue
+                    try:
+                        found[item.name] = item.stat()
+                    except OSError:
+                        continue
+        except OSError as e:
+            logging.warning(f"이미지 캐시 디렉터리 확인 실패: {e}")
+            return 0, 0
+
+        gone = [name for name in known if name not in found]
+        self.store.delete_many(gone)
+        added = 0
+        for name, st in found.items():
+            value = known.get(name)
+            if value is not None and value[0] == st.st_size:
+                continue
+            try:
+                etag = file_etag(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            self.store.put(name, [st.st_size, st.st_mtime, etag], max(st.st_atime, st.st_mtime))
+            added += 1
+        return added, len(gone)
+
+    def start_flusher(self, interval):
+        """접근 시각 주기적 반영 스레드 시작 (워커마다)"""
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.flush()
+
+        thread = threading.Thread(target=loop, daemon=True)
+        thread.start()
+        return thread
+
+    def start(self, evict_interval, reconcile_interval):
+        """백그라운드 정리(만료/제한 초과 삭제 + 가끔 디렉터리 대조) 스레드 시작 (스케줄러 담당 프로세스에서만 호출)"""
+        def loop():
+            last_reconcile = 0.0
+            while True:
+                try:
+                    if time.monotonic() - last_reconcile >= reconcile_interval:
+                        last_reconcile = time.monotonic()
+                        added, gone = self.reconcile()
+                        if added or gone:
+                            logging.info(f"이미지 캐시 인덱스 대조: {added}건 등록, {gone}건 제거")
+                    removed = self.evict()
+                    if removed:
+                        logging.info(f"이미지 캐시 정리: {removed}건 삭제")
+                except Exception as e:
+                    logging.warning(f"이미지 캐시 정리 실패: {e}")
+                time.sleep(evict_interval)
+
+        thread = threading.Thread(target=loop, daemon=True)
+        thread.start()
+        return thread
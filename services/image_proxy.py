@@ -3,63 +3,152 @@
 이미지 프록시 + 캐시 서비스
 """
 import os
+import sys
+import time
 import hashlib
 import logging
-from datetime import datetime
-import requests
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
-from config import IMAGE_CACHE_DIR, MAX_CACHE_FILES, MAX_CACHE_SIZE_MB
+from config import (
+    IMAGE_CACHE_DIR, IMAGE_CACHE_DB, MAX_CACHE_FILES, MAX_CACHE_SIZE_MB,
+    IMAGE_CACHE_EVICT_SECONDS, IMAGE_CACHE_RECONCILE_SECONDS, IMAGE_CACHE_TOUCH_SECONDS,
+    IMAGE_PREGEN_WIDTHS, IMAGE_PREGEN_FORMAT, IMAGE_PREGEN_WORKERS, IMAGE_PREGEN_NICE, IMAGE_PREGEN_IO_WORKERS,
+    IMAGE_POOL_SIZE, IMAGE_NEGATIVE_CACHE_SECONDS, IMAGE_HOST_CONCURRENCY
+)
+from services.image_cache import ImageCacheIndex, content_etag
+from services.image_variants import normalize_request, variant_name, variant_mime, safe_render_variant
+from utils.helpers import atomic_write
+from utils.http import get_session
+from utils.singleflight import SingleFlight
 
 IMAGE_CACHE_HOURS = 24  # 캐시 유효 시간
 
+EXT_TO_MIME = {'.jpg': 'image/jpeg', '.png': 'image/png', '.gif': 'image/gif', '.webp': 'image/webp'}
+
 # 캐시 폴더 생성
 if not os.path.exists(IMAGE_CACHE_DIR):
     os.makedirs(IMAGE_CACHE_DIR)
+os.makedirs(os.path.dirname(IMAGE_CACHE_DB), exist_ok=True)
+
+
+# 캐시 인덱스 (워커 간 공유 SQLite, 요청 경로는 기본키 조회만, 정리는 스케줄러 담당 프로세스에서)
+image_cache_index = ImageCacheIndex(
+    IMAGE_CACHE_DIR, IMAGE_CACHE_DB, MAX_CACHE_FILES, MAX_CACHE_SIZE_MB * 1024 * 1024, IMAGE_CACHE_HOURS * 3600
+)
+image_cache_index.start_flusher(IMAGE_CACHE_TOUCH_SECONDS)
+
+# 같은 캐시 파일의 동시 다운로드/변환을 1회로 합침
+_download_flight = SingleFlight()
+
+# 로고(너무 작은 이미지)/없는 이미지 URL: {캐시 파일명: (확인 시각, 상태 코드)}
+NEGATIVE_CACHE_MAX_ENTRIES = 5000
+_negative_cache = OrderedDict()
+_negative_lock = threading.Lock()
+
+# 업스트림 호스트별 동시 다운로드 슬롯
+_host_slots_map = {}
+_host_slots_lock = threading.Lock()
+
+
+def start_image_cache_maintenance():
+    """이미지 캐시 백그라운드 정리 시작 (스케줄러 담당 프로세스에서만 호출)"""
+    return image_cache_index.start(IMAGE_CACHE_EVICT_SECONDS, IMAGE_CACHE_RECONCILE_SECONDS)
 
 
 def cleanup_old_cache():
-    """오래된 캐시 파일 삭제 + 크기/수량 제한"""
+    """오래된 캐시 파일 삭제 + 크기/수량 제한 (마지막 접근 기준 LRU)"""
     try:
-        now = datetime.now()
-        files = []
-        total_size = 0
-
-        for filename in os.listdir(IMAGE_CACHE_DIR):
-            filepath = os.path.join(IMAGE_CACHE_DIR, filename)
-            if os.path.isfile(filepath):
-                file_time = datetime.fromtimestamp(os.path.getmtime(filepath))
-                file_size = os.path.getsize(filepath)
-
-                if (now - file_time).total_seconds() > IMAGE_CACHE_HOURS * 3600:
-                    os.remove(filepath)
-                    continue
-
-                files.append((filepath, file_time, file_size))
-                total_size += file_size
-
-        if len(files) > MAX_CACHE_FILES:
-            files.sort(key=lambda x: x[1])
-            for filepath, _, file_size in files[:len(files) - MAX_CACHE_FILES]:
-                if os.path.exists(filepath):
-                    os.remove(filepath)
-                    total_size -= file_size
-
-        if total_size > MAX_CACHE_SIZE_MB * 1024 * 1024:
-            remaining = [(f, t, s) for f, t, s in files if os.path.exists(f)]
-            remaining.sort(key=lambda x: x[1])
-            for filepath, _, file_size in remaining:
-                if total_size <= MAX_CACHE_SIZE_MB * 1024 * 1024:
-                    break
-                if os.path.exists(filepath):
-                    os.remove(filepath)
-                    total_size -= file_size
-
+        image_cache_index.evict()
     except Exception as e:
         logging.warning(f"캐시 정리 실패: {e}")
 
 
-def get_cached_or_download(url):
-    """이미지를 캐시에서 반환하거나 다운로드 (content, content_type, status_code 반환)"""
+def _referer_for(host):
+    """원본 사이트 Referer (핫링크 차단 회피)"""
+    if 'melon' in host:
+        return 'https://ticket.melon.com/'
+    if 'interpark' in host:
+        return 'https://tickets.interpark.com/'
+    return 'https://ticket.yes24.com/'
+
+
+def _image_session(host):
+    """업스트림 호스트별 keep-alive 세션"""
+    return get_session(f'image:{host}', pool_size=IMAGE_POOL_SIZE, headers={
+        'Referer': _referer_for(host),
+        'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
+    })
+
+
+def _host_slots(host):
+    """업스트림 호스트별 동시 다운로드 제한 세마포어"""
+    with _host_slots_lock:
+        slots = _host_slots_map.get(host)
+        if slots is None:
+            slots = _host_slots_map[host] = threading.BoundedSemaphore(IMAGE_HOST_CONCURRENCY)
+    return slots
+
+
+def _remember_missing(cache_name, status_code):
+    """로고/없는 이미지 결과 기억 (같은 URL 재다운로드 방지)"""
+    with _negative_lock:
+        _negative_cache[cache_name] = (time.time(), status_code)
+        _negative_cache.move_to_end(cache_name)
+        while len(_negative_cache) > NEGATIVE_CACHE_MAX_ENTRIES:
+            _negative_cache.popitem(last=False)
+
+
+def _known_missing(cache_name):
+    """기억된 실패 상태 코드 (없거나 만료면 None)"""
+    with _negative_lock:
+        entry = _negative_cache.get(cache_name)
+        if entry is None:
+            return None
+        if time.time() - entry[0] > IMAGE_NEGATIVE_CACHE_SECONDS:
+            del _negative_cache[cache_name]
+            return None
+        return entry[1]
+
+
+def _download(url, cache_name):
+    """업스트림에서 받아 캐시에 원자적으로 저장 → (cache_path, etag, status_code)"""
+    host = urlparse(url).hostname or ''
+    try:
+        with _host_slots(host):
+            response = _image_session(host).get(url, timeout=10)
+    except Exception:
+        return None, None, 500
+
+    if response.status_code in (404, 410):
+        _remember_missing(cache_name, 404)
+        return None, None, 404
+    if response.status_code != 200:
+        return None, None, response.status_code
+
+    content = response.content
+
+    # 너무 작은 이미지는 로고로 간주
+    if len(content) < 3000:
+        _remember_missing(cache_name, 404)
+        return None, None, 404
+
+    # 임시 파일에 쓴 뒤 rename (동시에 읽는 쪽이 잘린 파일을 보지 않도록)
+    cache_path = os.path.join(IMAGE_CACHE_DIR, cache_name)
+    etag = content_etag(content)
+    try:
+        atomic_write(cache_path, content)
+    except OSError as e:
+        logging.warning(f"이미지 캐시 저장 실패: {e}")
+        return None, None, 500
+    image_cache_index.add(cache_name, len(content), etag=etag)
+    return cache_path, etag, 200
+
+
+def _cache_name(url):
+    """URL → (캐시 파일명, content_type)"""
     url_hash = hashlib.md5(url.encode()).hexdigest()
     ext = '.jpg'
     if '.png' in url.lower():
@@ -68,58 +157,148 @@ def get_cached_or_download(url):
         ext = '.gif'
     elif '.webp' in url.lower():
         ext = '.webp'
+    return url_hash + ext, EXT_TO_MIME.get(ext, 'image/jpeg')
 
-    cache_path = os.path.join(IMAGE_CACHE_DIR, url_hash + ext)
 
-    ext_to_mime = {'.jpg': 'image/jpeg', '.png': 'image/png', '.gif': 'image/gif', '.webp': 'image/webp'}
+def get_cached_or_download(url):
+    """이미지를 캐시에서 찾거나 다운로드 후 캐시에 저장 (cache_path, content_type, etag, status_code 반환)
+
+    본문은 읽지 않고 캐시 파일 경로만 돌려주므로 전송은 send_file/X-Accel-Redirect로 처리
+    같은 URL 동시 요청은 다운로드 1회를 공유
+    """
+    cache_name, content_type = _cache_name(url)
 
     # 캐시 히트
-    if os.path.exists(cache_path):
-        try:
-            with open(cache_path, 'rb') as f:
-                content = f.read()
-            return content, ext_to_mime.get(ext, 'image/jpeg'), 200
-        except Exception:
-            pass
+    cached = image_cache_index.lookup(cache_name)
+    if cached:
+        cache_path, etag = cached
+        return cache_path, content_type, etag, 200
 
     # noimg 플레이스홀더 URL 차단 (YES24 기본 로고)
     if 'noimg' in url.lower():
-        return None, None, 404
+        return None, None, None, 404
 
-    # 다운로드
+    # 로고/없는 이미지로 확인된 URL
+    missing_status = _known_missing(cache_name)
+    if missing_status is not None:
+        return None, None, None, missing_status
+
+    # 다운로드 (진행 중이면 그 결과를 기다림)
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Referer': 'https://ticket.yes24.com/',
-            'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8'
-        }
-
-        if 'melon' in url:
-            headers['Referer'] = 'https://ticket.melon.com/'
-
-        response = requests.get(url, headers=headers, timeout=10)
-
-        if response.status_code == 200:
-            content = response.content
-            content_type = response.headers.get('Content-Type', 'image/jpeg')
-
-            # 너무 작은 이미지는 로고로 간주
-            if len(content) < 3000:
-                return None, None, 404
-
-            # 캐시에 저장
-            try:
-                with open(cache_path, 'wb') as f:
-                    f.write(content)
-            except Exception:
-                pass
-
-            # 가끔 오래된 캐시 정리
-            if hash(url) % 100 == 0:
-                cleanup_old_cache()
-
-            return content, content_type, 200
-        else:
-            return None, None, response.status_code
-    except Exception:
-        return None, None, 500
+        cache_path, etag, status_code = _download_flight.do(
+            cache_name, lambda: _download(url, cache_name), timeout=15
+        )
+    except TimeoutError:
+        return None, None, None, 504
+    if status_code != 200:
+        return None, None, None, status_code
+    return cache_path, content_type, etag, 200
+
+
+def get_image_variant(url, width=None, fmt=''):
+    """리사이즈/형식 변환된 이미지 (cache_path, content_type, etag, status_code 반환)
+
+    원본을 먼저 캐시한 뒤 파생 파일을 원본 옆에 만들어 둠
+    변환할 수 없으면(Pillow 미설치, 변환 실패) 원본을 그대로 반환
+    """
+    width, fmt = normalize_request(width, fmt)
+    cache_path, content_type, etag, status = get_cached_or_download(url)
+    if status != 200 or not fmt:
+        return cache_path, content_type, etag, status
+
+    name = variant_name(os.path.basename(cache_path), width, fmt)
+    cached = image_cache_index.lookup(name)
+    if cached:
+        variant_path, variant_etag = cached
+        return variant_path, variant_mime(fmt), variant_etag, 200
+
+    def render():
+        data = safe_render_variant(cache_path, width, fmt)
+        if data is None:
+            return None
+        variant_path = os.path.join(IMAGE_CACHE_DIR, name)
+        variant_etag = content_etag(data)
+        try:
+            atomic_write(variant_path, data)
+        except OSError as e:
+            logging.warning(f"파생 이미지 저장 실패: {e}")
+            return None
+        image_cache_index.add(name, len(data), etag=variant_etag)
+        return variant_path, variant_etag
+
+    try:
+        rendered = _download_flight.do(name, render, timeout=15)
+    except TimeoutError:
+        rendered = None
+    if rendered is None:
+        return cache_path, content_type, etag, status
+    return rendered[0], variant_mime(fmt), rendered[1], 200
+
+
+def _lower_thread_priority():
+    """예열 스레드 CPU 우선순위 낮춤 (Linux는 nice가 스레드별로 적용되어 요청 처리 스레드는 그대로)"""
+    if not IMAGE_PREGEN_NICE or not sys.platform.startswith('linux'):
+        return
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), IMAGE_PREGEN_NICE)
+    except OSError as e:
+        logging.warning(f"예열 스레드 우선순위 변경 실패: {e}")
+
+
+def _interleave_by_host(urls):
+    """호스트별로 번갈아 나오도록 재배열 (한 호스트 슬롯 대기로 다운로드 스레드가 몰려 막히지 않도록)"""
+    by_host = OrderedDict()
+    for url in urls:
+        by_host.setdefault(urlparse(url).netloc, []).append(url)
+    queues = list(by_host.values())
+    ordered = []
+    for i in range(max(map(len, queues), default=0)):
+        ordered.extend(queue[i] for queue in queues if i < len(queue))
+    return ordered, len(by_host)
+
+
+def prewarm_posters(urls, widths=IMAGE_PREGEN_WIDTHS, fmt=IMAGE_PREGEN_FORMAT, workers=IMAGE_PREGEN_WORKERS):
+    """포스터 일괄 예열 (캐시에 없는 원본 병렬 다운로드 + 카드 썸네일 생성) → 통계
+
+    첫 화면 요청이 다운로드/변환을 기다리지 않도록 갱신 직후 백그라운드에서 실행
+    다운로드(I/O)와 썸네일 변환(CPU)은 풀을 나눔
+    - 다운로드: 호스트 수 × IMAGE_HOST_CONCURRENCY 스레드 (상한 IMAGE_PREGEN_IO_WORKERS, 호스트별 제한은 _download의 호스트 슬롯)
+    - 변환: 웹/스케줄러 프로세스에서 도므로 스레드 수는 적게, 우선순위는 낮게 (IMAGE_PREGEN_WORKERS/NICE)
+    반환: {'total', 'hits', 'fetched', 'failed', 'bytes', 'hit_ratio'}
+    """
+    urls = list(dict.fromkeys(u for u in urls if u))
+    stats = {'total': len(urls), 'hits': 0, 'fetched': 0, 'failed': 0, 'bytes': 0, 'hit_ratio': 0.0}
+    if not urls:
+        return stats
+    stats_lock = threading.Lock()
+    urls, host_count = _interleave_by_host(urls)
+    io_workers = max(1, min(IMAGE_PREGEN_IO_WORKERS, host_count * IMAGE_HOST_CONCURRENCY))
+
+    with ThreadPoolExecutor(max_workers=workers, initializer=_lower_thread_priority) as render_pool:
+        def fetch(url):
+            hit = image_cache_index.lookup(_cache_name(url)[0]) is not None
+            cache_path, _, _, status = get_cached_or_download(url)
+            size = 0
+            if status == 200 and not hit:
+                try:
+                    size = os.path.getsize(cache_path)
+                except OSError:
+                    pass
+            with stats_lock:
+                if status != 200:
+                    stats['failed'] += 1
+                elif hit:
+                    stats['hits'] += 1
+                else:
+                    stats['fetched'] += 1
+                    stats['bytes'] += size
+            if status == 200:
+                # 원본이 준비된 것부터 변환 풀로 넘기고 다음 다운로드 진행
+                for width in widths:
+                    render_pool.submit(get_image_variant, url, width, fmt)
+
+        with ThreadPoolExecutor(max_workers=io_workers) as io_pool:
+            list(io_pool.map(fetch, urls))
+    image_cache_index.flush()
+    stats['hit_ratio'] = round(stats['hits'] / stats['total'], 3)
+    return stats
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+포스터 파생 이미지 (리사이즈 + WebP/AVIF 변환)
+원본 캐시 파일 옆에 {원본명}_w{폭}.{형식} 으로 저장하고 같은 캐시 인덱스로 관리
+Pillow 미설치 시 파생 이미지 없이 원본을 그대로 사용
+"""
+import io
+import logging
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+    features = None
+
+# 허용 폭 (임의 값으로 파생 파일이 무한히 늘어나지 않도록 제한)
+ALLOWED_WIDTHS = (160, 320, 480, 640)
+
+# 형식 → (확장자, MIME, 저장 옵션)
+FORMATS = {
+    'webp': ('webp', 'image/webp', {'format': 'WEBP', 'quality': 80, 'method': 4}),
+    'avif': ('avif', 'image/avif', {'format': 'AVIF', 'quality': 60}),
+    'jpeg': ('jpg', 'image/jpeg', {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def _supported_formats():
+    """현재 Pillow 빌드에서 저장 가능한 형식"""
+    if Image is None:
+        return set()
+    supported = {'jpeg'}
+    for name in ('webp', 'avif'):
+        try:
+            if features.check(name):
+                supported.add(name)
+        except Exception:
+            pass
+    return supported
+
+
+SUPPORTED_FORMATS = _supported_formats()
+
+
+def normalize_request(width, fmt):
+    """요청 폭/형식 정규화 → (폭 또는 None, 형식 또는 '') - (None, '')이면 원본 그대로 제공
+
+    폭은 허용 폭 중 요청 이상인 가장 작은 값, 형식은 지원하지 않으면 webp → jpeg 순으로 대체
+    """
+    if Image is None:
+        return None, ''
+    try:
+        width = int(width) if width else None
+    except (TypeError, ValueError):
+        width = None
+    if width:
+        width = next((w for w in ALLOWED_WIDTHS if w >= width), ALLOWED_WIDTHS[-1])
+
+    fmt = (fmt or '').lower()
+    if fmt and fmt not in SUPPORTED_FORMATS:
+        fmt = 'webp' if 'webp' in SUPPORTED_FORMATS else 'jpeg'
+    if width and not fmt:
+        fmt = 'jpeg'
+    return width, fmt
+
+
+def variant_name(original_name, width, fmt):
+    """파생 이미지 캐시 파일명"""
+    base = original_name.rsplit('.', 1)[0]
+    return f"{base}_w{width or 0}.{FORMATS[fmt][0]}"
+
+
+def variant_mime(fmt):
+    return FORMATS[fmt][1]
+
+
+def render_variant(source_path, width, fmt):
+    """원본 파일 → 파생 이미지 바이트 (원본보다 크게 늘리지 않음)"""
+    with Image.open(source_path) as img:
+        if width and fmt == 'jpeg':
+            # JPEG은 디코딩 단계에서 축소 (큰 포스터 처리 시간 단축)
+            img.draft('RGB', (width, width * 4))
+        img.seek(0)
+        frame = img.convert('RGBA' if fmt != 'jpeg' and img.mode in ('RGBA', 'LA', 'P') else 'RGB')
+
+    if width and frame.width > width:
+        height = max(1, round(frame.height * width / frame.width))
+        frame = frame.resize((width, height), Image.LANCZOS)
+
+    out = io.BytesIO()
+    frame.save(out, **FORMATS[fmt][2])
+    return out.getvalue()
+
+
+def safe_render_variant(source_path, width, fmt):
+    """render_variant 예외 처리 버전 (실패 시 None)"""
+    try:
+        return render_variant(source_path, width, fmt)
+    except Exception as e:
+        logging.warning(f"파생 이미지 생성 실패 ({source_path}, w={width}, {fmt}): {e}")
+        return None
@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+"""
+증분 병합 저장소
+소스별 변경분(추가/변경/삭제)만 반영하고, 공연 식별자(hash)는 갱신 간에 유지
+"""
+import os
+import json
+import atexit
+import hashlib
+import logging
+import threading
+from datetime import datetime
+
+from config import FIRST_SEEN_FILE
+from constants import get_cache_key, normalize_name, classify_part, classify_region
+from services.merger import merge_performance_data
+from services.dedup import DedupIndex
+from services.performance import Performance, TRANSLATED_FIELDS, make_site, make_sites
+from utils.helpers import atomic_write, filter_ended_performances, sort_by_dday
+
+# 병합 우선순위 (앞쪽 소스가 기본 레코드가 됨)
+SOURCE_ORDER = ['kopis', 'interpark', 'melon', 'yes24']
+
+# 소스 키 → (판매처 표시명, 색상)
+SOURCE_INFO = {
+    'kopis': ('KOPIS', '#00d4ff'),
+    'interpark': ('인터파크', '#ff6464'),
+    'melon': ('멜론티켓', '#00cd3c'),
+    'yes24': ('YES24', '#ffc800'),
+}
+
+
+def item_fingerprint(item):
+    """소스 항목 내용 지문 (변경 감지용, 항목마다 다른 값이라 메모하지 않음)"""
+    encoded = json.dumps(item, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+class PerformanceStore:
+    """hash(get_cache_key(normalize_name(name))) 기준 공연 저장소
+
+    sources: 소스별 {hash: (fingerprint, item)} - 마지막으로 받은 원본 (hash는 병합된 레코드 기준)
+    records: {hash: 병합 레코드(Performance)} - 변경된 hash만 다시 만듦
+    dedup: 레코드 유사도 색인 (공연명이 조금 다른 다른 소스 항목을 기존 레코드에 병합)
+    aliases: 소스별 {항목 자체 hash: (병합된 레코드 hash, 신뢰도)} - 갱신 간 같은 레코드 유지
+    first_seen: {hash: 최초 수집 시각} - path 파일에 저장, 처음 레코드를 만들 때 로드 (스케줄러 담당 교체 대비)
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.first_seen = None
+        self.first_seen_dirty = False
+        self.lock = threading.Lock()
+        self.sources = {key: {} for key in SOURCE_ORDER}
+        self.source_counts = {key: 0 for key in SOURCE_ORDER}
+        self.source_updated = {key: None for key in SOURCE_ORDER}
+        self.records = {}
+        self.dirty = set()
+        self.dedup = DedupIndex()
+        self.aliases = {key: {} for key in SOURCE_ORDER}
+        self.match_scores = {key: {} for key in SOURCE_ORDER}  # 소스별 {레코드 hash: 신뢰도} (aliases 역방향)
+
+    def _resolve(self, source_key, pairs, claimed):
+        """(항목 hash, item) 목록 → [(레코드 hash, item)] (lock 보유 상태에서 호출)
+
+        hash가 같은 레코드가 있으면 그대로, 없으면 이전 병합 결과 → 유사 레코드 순으로 찾음
+        유사 후보는 신뢰도 높은 쌍부터 배정하고, 레코드 하나에 같은 소스 항목은 1건만 병합
+        claimed: 이번 갱신에서 이 소스가 이미 차지한 레코드 hash (배정 시 추가)
+        """
+        own = self.sources[source_key]
+        aliases = self.aliases[source_key]
+        resolved = [None] * len(pairs)
+        proposals = []
+        for i, (perf_hash, item) in enumerate(pairs):
+            alias = aliases.get(perf_hash)
+            if perf_hash in self.records or perf_hash in claimed:
+                resolved[i] = perf_hash
+            elif alias is not None and alias[0] in self.records and alias[0] not in claimed:
+                resolved[i] = alias[0]
+            else:
+                found = self.dedup.match(item, exclude=lambda key: key in claimed or key in own)
+                if found is not None:
+                    proposals.append((found[1], i, found[0]))
+                continue
+            claimed.add(resolved[i])
+
+        for score, i, target in sorted(proposals, reverse=True):
+            if target not in claimed:
+                resolved[i] = target
+                claimed.add(target)
+                aliases[pairs[i][0]] = (target, score)
+
+        result = []
+        for i, (perf_hash, item) in enumerate(pairs):
+            if resolved[i] is None:
+                resolved[i] = perf_hash
+                claimed.add(perf_hash)
+            if resolved[i] == perf_hash:
+                aliases.pop(perf_hash, None)
+            result.append((resolved[i], item))
+        self.match_scores[source_key] = {target: score for target, score in aliases.values()}
+        return result
+
+    def apply_source(self, source_key, items):
+        """소스 전체 목록을 받아 이전 목록과의 차이만 반영 → {'added', 'changed', 'removed'} 건수"""
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        incoming = {}
+        for item in items:
+            perf_hash = item.get('hash') or get_cache_key(normalize_name(item.get('name', '')))
+            if perf_hash in incoming and source_key != 'kopis':
+                # 같은 소스 내 중복: 먼저 나온 항목에 빠진 정보만 보충
+                _fill_missing(incoming[perf_hash], item)
+            else:
+                incoming[perf_hash] = item
+
+        with self.lock:
+            return self._replace_source(source_key, incoming, len(items), now)
+
+    def _replace_source(self, source_key, incoming, count, now):
+        """소스 목록 교체 + 변경분 레코드 재생성 (lock 보유 상태에서 호출)"""
+        self.aliases[source_key] = {h: a for h, a in self.aliases[source_key].items() if h in incoming}
+        resolved = self._resolve(source_key, list(incoming.items()), set())
+        previous = self.sources[source_key]
+        current = {}
+        added, changed = [], []
+        for perf_hash, item in resolved:
+            fp = item_fingerprint(item)
+            current[perf_hash] = (fp, item)
+            if perf_hash not in previous:
+                added.append(perf_hash)
+            elif previous[perf_hash][0] != fp:
+                changed.append(perf_hash)
+        removed = [h for h in previous if h not in current]
+
+        self.sources[source_key] = current
+        self.source_counts[source_key] = count
+        self.source_updated[source_key] = datetime.now()
+
+        for perf_hash in added + changed + removed:
+            self._rebuild(perf_hash, now)
+        for perf_hash in current:
+            record = self.records.get(perf_hash)
+            if record is not None:
+                record.last_seen = now
+
+        return {'added': len(added), 'changed': len(changed), 'removed': len(removed)}
+
+    def apply_stream(self, source_key, batches):
+        """소스 목록을 묶음(페이지) 단위로 받는 즉시 반영 → {'added', 'changed', 'removed'} 건수
+
+        끝까지 받은 경우에만 이번에 나오지 않은 항목을 삭제 (중간에 예외가 나면 받은 만큼만 반영 후 예외 전파)
+        """
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self.lock:
+            previous = {h: fp for h, (fp, _) in self.sources[source_key].items()}
+        seen = {}
+        claimed = set()
+        added, changed = set(), set()
+        total = 0
+
+        for batch in batches:
+            total += len(batch)
+            with self.lock:
+                current = self.sources[source_key]
+                pairs = {}
+                for item in batch:
+                    perf_hash = item.get('hash') or get_cache_key(normalize_name(item.get('name', '')))
+                    if perf_hash in seen and source_key != 'kopis':
+                        # 같은 소스 내 중복: 먼저 나온 항목에 빠진 정보만 보충
+                        _fill_missing(seen[perf_hash], item)
+                        item = seen[perf_hash]
+                    seen[perf_hash] = item
+                    pairs[perf_hash] = item
+                for perf_hash, item in self._resolve(source_key, list(pairs.items()), claimed):
+                    fp = item_fingerprint(item)
+                    if perf_hash in current and current[perf_hash][0] == fp:
+                        continue
+                    current[perf_hash] = (fp, item)
+                    if perf_hash not in previous:
+                        added.add(perf_hash)
+                    elif previous[perf_hash] != fp:
+                        changed.add(perf_hash)
+                    else:
+                        changed.discard(perf_hash)
+                    self._rebuild(perf_hash, now)
+
+        with self.lock:
+            current = self.sources[source_key]
+            removed = [h for h in current if h not in claimed]
+            for perf_hash in removed:
+                del current[perf_hash]
+                self._rebuild(perf_hash, now)
+            self.aliases[source_key] = {h: a for h, a in self.aliases[source_key].items() if h in seen}
+            self.source_counts[source_key] = total
+            self.source_updated[source_key] = datetime.now()
+            for perf_hash in claimed:
+                record = self.records.get(perf_hash)
+                if record is not None:
+                    record.last_seen = now
+
+        return {'added': len(added), 'changed': len(changed), 'removed': len(removed)}
+
+    def expire_sources(self, max_age):
+        """max_age(timedelta) 이상 갱신되지 않은 소스의 항목 제거 (멜론/YES24 수동 수집분 등)"""
+        now = datetime.now()
+        stamp = now.strftime('%Y-%m-%d %H:%M:%S')
+        with self.lock:
+            for key in SOURCE_ORDER:
+                updated = self.source_updated[key]
+                if updated and now - updated > max_age and self.sources[key]:
+                    self._replace_source(key, {}, 0, stamp)
+
+    def _rebuild(self, perf_hash, now):
+        """hash 1건의 병합 레코드 재생성 (lock 보유 상태에서 호출)"""
+        parts = [(key, self.sources[key][perf_hash][1]) for key in SOURCE_ORDER if perf_hash in self.sources[key]]
+        previous = self.records.get(perf_hash)
+        self.dirty.add(perf_hash)
+
+        first_seen = self._first_seen()
+        if not parts:
+            self.records.pop(perf_hash, None)
+            self.dedup.remove(perf_hash)
+            if first_seen.pop(perf_hash, None) is not None:
+                self.first_seen_dirty = True
+            return
+
+        base_key, base_item = parts[0]
+        record = Performance(base_item)
+        if base_key == 'kopis' and base_item.get('available_sites'):
+            record.available_sites = make_sites(base_item['available_sites'])
+        else:
+            name, color = SOURCE_INFO[base_key]
+            record.available_sites = (make_site(name, base_item.get('link', ''), color),)
+        record.hash = perf_hash
+
+        for key, item in parts[1:]:
+            merge_performance_data(record, item, SOURCE_INFO[key][0])
+
+        # 공연명이 달라 유사도로 병합된 경우 가장 낮은 신뢰도 기록
+        scores = [self.match_scores[key][perf_hash] for key, _ in parts if perf_hash in self.match_scores[key]]
+        if scores:
+            record.match_score = min(scores)
+
+        if 'part' not in record:
+            record['part'] = classify_part(record.get('name', ''))
+        if 'region' not in record:
+            record['region'] = classify_region(record.get('venue', ''))
+
+        if previous is not None:
+            if previous.name == record.name and previous.venue == record.venue:
+                for field in TRANSLATED_FIELDS:
+                    setattr(record, field, getattr(previous, field))
+        if perf_hash not in first_seen:
+            first_seen[perf_hash] = now
+            self.first_seen_dirty = True
+        record.first_seen = first_seen[perf_hash]
+        record.last_seen = now
+
+        self.records[perf_hash] = record
+        self.dedup.add(perf_hash, record)
+
+    def _first_seen(self):
+        """최초 수집 시각 사전 (첫 호출 시 파일에서 로드, lock 보유 상태에서 호출)"""
+        if self.first_seen is None:
+            self.first_seen = {}
+            if self.path:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        self.first_seen = json.load(f)
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    logging.warning(f"최초 수집 시각 로드 실패: {e}")
+        return self.first_seen
+
+    def save(self):
+        """변경된 최초 수집 시각을 디스크에 저장"""
+        with self.lock:
+            if not self.path or not self.first_seen_dirty:
+                return
+            data = json.dumps(self.first_seen, ensure_ascii=False).encode('utf-8')
+            self.first_seen_dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            atomic_write(self.path, data)
+        except Exception as e:
+            logging.warning(f"최초 수집 시각 저장 실패: {e}")
+
+    def take_dirty(self):
+        """마지막 호출 이후 새로 생기거나 바뀐 레코드 목록 반환 (번역 등 후속 처리 대상)"""
+        with self.lock:
+            dirty = [self.records[h] for h in self.dirty if h in self.records]
+            self.dirty = set()
+        return dirty
+
+    def snapshot(self, part='', region=''):
+        """현재 레코드 목록 (종료 공연 제외 + D-day 정렬)"""
+        with self.lock:
+            # 얕은 복사: 직렬화 중 번역 필드가 추가되어도 안전
+            performances = [p.copy() for p in self.records.values()]
+        if part:
+            performances = [p for p in performances if p.get('part') == part]
+        if region:
+            performances = [p for p in performances if p.get('region') == region]
+        performances = filter_ended_performances(performances)
+        sort_by_dday(performances)
+        return performances
+
+    def stats(self, total):
+        """응답용 소스별 건수"""
+        stats = dict(self.source_counts)
+        stats['total'] = total
+        return stats
+
+
+def _fill_missing(base, item):
+    """같은 소스 중복 항목의 예매오픈일/포스터 보충"""
+    if item.get('ticket_open') and not base.get('ticket_open'):
+        base['ticket_open'] = item['ticket_open']
+        base['dday'] = item.get('dday')
+    if not base.get('poster') and item.get('poster'):
+        base['poster'] = item['poster']
+
+
+# 모듈 로드 시 저장소 초기화 (스케줄러 + /api/all 공용)
+performance_store = PerformanceStore(FIRST_SEEN_FILE)
+atexit.register(performance_store.save)
@@ -2,7 +2,6 @@
 """
 데이터 통합 + 소스 병합 서비스
 """
-from constants import get_cache_key, normalize_name, classify_part, classify_region
 
 
 def merge_performance_data(base, new_item, source_name):
@@ -13,12 +12,10 @@ def merge_performance_data(base, new_item, source_name):
         'color': new_item.get('source_color', '#888')
     }
 
-    if 'available_sites' not in base:
-        base['available_sites'] = []
-
-    existing_sites = [s['name'] for s in base['available_sites']]
-    if source_name not in existing_sites:
-        base['available_sites'].append(site_info)
+    # dict(list) / Performance(Site 튜플) 모두 지원: 목록을 새로 만들어 교체
+    sites = base.get('available_sites') or []
+    if all(s['name'] != source_name for s in sites):
+        base['available_sites'] = [*sites, site_info]
 
     if new_item.get('ticket_open') and not base.get('ticket_open'):
         base['ticket_open'] = new_item['ticket_open']
@@ -29,22 +26,3 @@ def merge_performance_data(base, new_item, source_name):
 
     return base
 
-
-def merge_source_data(merged_performances, items, source_name, source_color, source_counts_key, source_counts):
-    """소스 데이터를 merged_performances에 병합하는 공통 함수"""
-    for item in items:
-        perf_hash = get_cache_key(normalize_name(item.get('name', '')))
-        source_counts[source_counts_key] += 1
-
-        if perf_hash in merged_performances:
-            merged_performances[perf_hash] = merge_performance_data(
-                merged_performances[perf_hash], item, source_name
-            )
-        else:
-            item['available_sites'] = [{'name': source_name, 'link': item.get('link', ''), 'color': source_color}]
-            item['hash'] = perf_hash
-            if 'part' not in item:
-                item['part'] = classify_part(item.get('name', ''))
-            if 'region' not in item:
-                item['region'] = classify_region(item.get('venue', ''))
-            merged_performances[perf_hash] = item
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+공연 레코드 (__slots__)
+병합 저장소/응답 캐시가 워커마다 공연 수 × 필드 수만큼 dict를 들고 있으므로
+고정 필드는 슬롯으로, 반복되는 값(파트/지역/카테고리/판매처/공연장 등)은 sys.intern으로 공유
+
+기존 코드가 dict처럼 다룰 수 있도록 get / [] / in / keys / items 지원,
+응답 JSON은 to_dict()(또는 json_default)로 기존과 같은 형태로 직렬화
+응답 캐시 경로는 to_json()으로 dict를 거치지 않고 슬롯에서 바로 JSON 조각을 만들고, 값이 바뀔 때까지 재사용
+"""
+import sys
+import json
+from collections import namedtuple
+from operator import attrgetter
+from json.encoder import encode_basestring
+
+from config import SUPPORTED_LANGS
+
+# 번역 필드 (name_en, venue_ja, ...)
+TRANSLATED_FIELDS = tuple(f"{field}_{lang}" for field in ('name', 'venue') for lang in SUPPORTED_LANGS if lang != 'ko')
+
+# 슬롯 필드 (응답 JSON 키 순서)
+FIELDS = ('id', 'name', 'date', 'start_date', 'end_date', 'venue', 'poster', 'genre', 'category', 'part',
+          'region', 'state', 'source', 'source_color', 'link', 'ticket_open', 'dday', 'hash',
+          'available_sites', 'match_score', 'first_seen', 'last_seen') + TRANSLATED_FIELDS
+
+# 값 종류가 적고 여러 공연이 같은 문자열을 갖는 필드 → 같은 str 객체 하나만 유지
+INTERNED_FIELDS = frozenset(('date', 'start_date', 'end_date', 'venue', 'genre', 'category', 'part', 'region',
+                             'state', 'source', 'source_color', 'first_seen', 'last_seen')
+                            + tuple(f for f in TRANSLATED_FIELDS if f.startswith('venue_')))
+
+_FIELD_SET = frozenset(FIELDS)
+_get_fields = attrgetter(*FIELDS)
+
+# 생성 시 필드 종류별 처리 순서 (available_sites는 따로)
+_PLAIN_FIELDS = tuple(f for f in FIELDS if f not in INTERNED_FIELDS and f != 'available_sites')
+_INTERNED_FIELDS = tuple(f for f in FIELDS if f in INTERNED_FIELDS)
+
+# to_json: 필드별 '"키":' 조각 (FIELDS 순서)
+_KEY_PREFIXES = tuple(encode_basestring(field) + ':' for field in FIELDS)
+_encode_value = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+class _Missing:
+    """값이 없는 슬롯 표시 (None은 dday 등의 실제 값이므로 구분)"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return '<missing>'
+
+
+MISSING = _Missing()
+
+
+class Site(namedtuple('Site', ('name', 'link', 'color'))):
+    """판매처 1건 (이름, 예매 링크, 색상) - site['name'] / site.get('name')도 지원"""
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self._fields else default
+
+    def to_dict(self):
+        return {'name': self.name, 'link': self.link, 'color': self.color}
+
+    def to_json(self):
+        """to_dict()와 같은 JSON 문자열"""
+        return (f'{{"name":{encode_basestring(self.name)},"link":{encode_basestring(self.link)},'
+                f'"color":{encode_basestring(self.color)}}}')
+
+
+def make_site(name, link='', color='#888'):
+    """판매처 생성 (이름/색상은 intern)"""
+    return Site(sys.intern(name or ''), link or '', sys.intern(color or '#888'))
+
+
+def make_sites(sites):
+    """판매처 목록(dict/Site) → Site 튜플"""
+    if not sites:
+        return ()
+    return tuple(s if isinstance(s, Site) else make_site(s.get('name', ''), s.get('link', ''), s.get('color', '#888'))
+                 for s in sites)
+
+
+class Performance:
+    """공연 1건
+
+    FIELDS에 없는 키(크롤러별 부가 정보)는 extra dict에 보관
+    available_sites는 Site 튜플 (추가 시 새 튜플로 교체)
+    _json: to_json() 결과 캐시 ([]/pop으로 값이 바뀌면 비움, 슬롯 직접 대입은 직렬화 전 레코드 생성 중에만)
+    """
+    __slots__ = FIELDS + ('extra', '_json')
+
+    def __init__(self, data=None):
+        self.extra = None
+        self._json = None
+        if not data:
+            for field in FIELDS:
+                setattr(self, field, MISSING)
+            return
+        get = data.get
+        for field in _PLAIN_FIELDS:
+            setattr(self, field, get(field, MISSING))
+        for field in _INTERNED_FIELDS:
+            value = get(field, MISSING)
+            setattr(self, field, sys.intern(value) if type(value) is str else value)
+        sites = get('available_sites', MISSING)
+        self.available_sites = sites if sites is MISSING else make_sites(sites)
+        if not _FIELD_SET.issuperset(data):
+            self.extra = {key: value for key, value in data.items() if key not in _FIELD_SET}
+
+    def __setitem__(self, key, value):
+        self._json = None
+        if key in _FIELD_SET:
+            if key in INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            elif key == 'available_sites':
+                value = make_sites(value)
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            if value is MISSING:
+                raise KeyError(key)
+            return value
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            return default if value is MISSING else value
+        return default if self.extra is None else self.extra.get(key, default)
+
+    def __contains__(self, key):
+        if key in _FIELD_SET:
+            return getattr(self, key) is not MISSING
+        return self.extra is not None and key in self.extra
+
+    def pop(self, key, default=MISSING):
+        try:
+            value = self[key]
+        except KeyError:
+            if default is MISSING:
+                raise
+            return default
+        self._json = None
+        if key in _FIELD_SET:
+            setattr(self, key, MISSING)
+        else:
+            del self.extra[key]
+        return value
+
+    def keys(self):
+        keys = [field for field, value in zip(FIELDS, _get_fields(self)) if value is not MISSING]
+        if self.extra:
+            keys.extend(self.extra)
+        return keys
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def copy(self):
+        """얕은 복사 (필드 값/판매처 튜플은 공유)"""
+        other = Performance.__new__(Performance)
+        for field, value in zip(FIELDS, _get_fields(self)):
+            setattr(other, field, value)
+        other.extra = dict(self.extra) if self.extra else None
+        other._json = self._json
+        return other
+
+    def to_dict(self):
+        """응답 JSON 형태의 dict"""
+        data = {field: value for field, value in zip(FIELDS, _get_fields(self)) if value is not MISSING}
+        sites = data.get('available_sites')
+        if sites is not None:
+            data['available_sites'] = [site.to_dict() for site in sites]
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def to_json(self):
+        """to_dict()를 직렬화한 것과 같은 UTF-8 JSON 바이트 (슬롯에서 바로 생성, 변경 전까지 캐시)"""
+        encoded = self._json
+        if encoded is None:
+            parts = []
+            for prefix, value in zip(_KEY_PREFIXES, _get_fields(self)):
+                if value is MISSING:
+                    continue
+                if type(value) is str:
+                    parts.append(prefix + encode_basestring(value))
+                elif type(value) is tuple:
+                    parts.append(prefix + '[' + ','.join([site.to_json() for site in value]) + ']')
+                else:
+                    parts.append(prefix + _encode_value(value))
+            if self.extra:
+                for key, value in self.extra.items():
+                    parts.append(encode_basestring(key) + ':' + _encode_value(value))
+            encoded = self._json = ('{' + ','.join(parts) + '}').encode('utf-8')
+        return encoded
+
+    def __repr__(self):
+        return f"Performance({self.get('hash')!r}, {self.get('name')!r})"
+
+
+def json_default(obj):
+    """json.dumps(default=...)용: Performance → dict"""
+    if isinstance(obj, Performance):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+/api/all 필터/페이지네이션 인덱스
+갱신 시 D-day 정렬 순서 그대로 위치를 매기고, 필드 값별 비트맵(int)을 만들어 두어
+요청 시에는 비트 AND + 커서 이후 비트 순회만 수행
+"""
+from services.merge_store import SOURCE_INFO
+from services.search_index import FIELD_WEIGHTS
+
+# 판매처 표시명/소스 키 → 소스 키
+SOURCE_KEYS = {name: key for key, (name, _) in SOURCE_INFO.items()}
+SOURCE_KEYS.update({key: key for key in SOURCE_INFO})
+
+INDEXED_FIELDS = ['part', 'region', 'category', 'source']
+DEFAULT_PAGE_SIZE = 30
+MAX_PAGE_SIZE = 200
+
+# 다른 워커가 전체 스냅샷 대신 읽는 항목별 필드 (필터 + 검색 색인용)
+META_FIELDS = tuple(dict.fromkeys(INDEXED_FIELDS + list(FIELD_WEIGHTS)))
+
+
+def index_meta(item):
+    """공연 1건 → 색인용 필드만 담은 dict (판매처는 이름만)"""
+    meta = {field: item.get(field) for field in META_FIELDS if item.get(field)}
+    sites = item.get('available_sites')
+    if sites:
+        meta['available_sites'] = [{'name': site.get('name', '')} for site in sites]
+    return meta
+
+
+def _item_values(item, field):
+    """항목의 인덱스 값 목록 (source는 판매처가 여러 개일 수 있음)"""
+    if field == 'source':
+        sites = item.get('available_sites') or [{'name': item.get('source', '')}]
+        return [SOURCE_KEYS.get(s.get('name', ''), s.get('name', '')) for s in sites]
+    if field == 'part':
+        return [item.get('part') or 'concert']
+    return [item.get(field) or '']
+
+
+class PerformanceIndex:
+    """D-day 정렬된 공연 목록 위의 비트맵 인덱스
+
+    postings[field][value]: 해당 값을 가진 항목 위치의 비트맵 (bit i = items[i])
+    items를 따로 주면 performances(색인용 필드)로 색인하고 결과는 items에서 꺼냄
+    """
+
+    def __init__(self, performances, generation='', items=None):
+        self.items = performances if items is None else items
+        self.generation = generation
+        self.all_bits = (1 << len(performances)) - 1
+        self.postings = {field: {} for field in INDEXED_FIELDS}
+        for pos, item in enumerate(performances):
+            bit = 1 << pos
+            for field in INDEXED_FIELDS:
+                bucket = self.postings[field]
+                for value in _item_values(item, field):
+                    bucket[value] = bucket.get(value, 0) | bit
+
+    def match(self, filters):
+        """필터 {field: value} 조건을 모두 만족하는 비트맵"""
+        bits = self.all_bits
+        for field, value in filters.items():
+            if not value or field not in self.postings:
+                continue
+            if field == 'source':
+                value = SOURCE_KEYS.get(value, value)
+            bits &= self.postings[field].get(value, 0)
+            if not bits:
+                break
+        return bits
+
+    def page(self, filters, cursor=0, limit=DEFAULT_PAGE_SIZE):
+        """필터 결과 중 cursor 위치부터 limit건 → (items, next_cursor, total)"""
+        bits = self.match(filters)
+        total = bin(bits).count('1')
+        remaining = bits >> cursor << cursor
+        page_items = []
+        next_cursor = None
+        while remaining:
+            low = remaining & -remaining
+            pos = low.bit_length() - 1
+            if len(page_items) == limit:
+                next_cursor = pos
+                break
+            page_items.append(self.items[pos])
+            remaining ^= low
+        return page_items, next_cursor, total
+
+    def encode_cursor(self, pos):
+        """세대(ETag) 정보를 포함한 커서 문자열"""
+        return None if pos is None else f"{self.generation}.{pos}"
+
+    def decode_cursor(self, cursor):
+        """커서 문자열 → 위치 (다른 세대의 커서면 None)"""
+        if not cursor:
+            return 0
+        generation, _, pos = cursor.rpartition('.')
+        if generation != self.generation or not pos.isdigit():
+            return None
+        return int(pos)
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+사전 직렬화 + 사전 압축 응답 캐시
+갱신 시 1회만 JSON 직렬화/압축하고, 요청 시에는 만들어 둔 바이트를 그대로 전송
+"""
+import json
+import gzip
+import hashlib
+from array import array
+
+from flask import Response, send_file
+
+from services.performance import Performance, json_default
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 선호 순서 (같은 q값이면 앞쪽 우선)
+ENCODING_PREFERENCE = ['br', 'gzip', 'identity']
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=json_default).encode('utf-8')
+
+
+def serialize_payload(payload):
+    """payload → (JSON 바이트, data 목록 항목별 바이트 위치 array [시작0, 끝0, 시작1, 끝1, ...])
+
+    json.dumps(payload)와 같은 바이트를 만들면서 항목 위치를 기록 (다른 워커가 항목 단위로 잘라 읽음)
+    Performance 항목은 레코드에 캐시된 JSON 조각(to_json)을 그대로 사용
+    """
+    spans = array('Q')
+    body = bytearray(b'{')
+    for i, (key, value) in enumerate(payload.items()):
+        if i:
+            body += b','
+        body += _dumps(key) + b':'
+        if key == 'data' and isinstance(value, list):
+            body += b'['
+            for j, item in enumerate(value):
+                if j:
+                    body += b','
+                encoded = item.to_json() if type(item) is Performance else _dumps(item)
+                spans.extend((len(body), len(body) + len(encoded)))
+                body += encoded
+            body += b']'
+        else:
+            body += _dumps(value)
+    body += b'}'
+    return bytes(body), spans
+
+
+def build_precompressed(payload):
+    """payload를 JSON 바이트로 직렬화하고 identity/gzip/br 변형 + 강한 ETag 생성 (spans: 항목별 위치)"""
+    body, spans = serialize_payload(payload)
+    variants = {
+        'identity': body,
+        'gzip': gzip.compress(body, compresslevel=9),
+    }
+    if brotli is not None:
+        variants['br'] = brotli.compress(body, quality=11)
+
+    return {
+        'etag': '"' + hashlib.sha256(body).hexdigest()[:32] + '"',
+        'variants': variants,
+        'spans': spans,
+    }
+
+
+def parse_accept_encoding(header):
+    """Accept-Encoding 헤더 → {인코딩: q값}"""
+    accepted = {}
+    for part in (header or '').split(','):
+        token = part.strip()
+        if not token:
+            continue
+        name, _, params = token.partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(header, available):
+    """클라이언트가 받을 수 있는 인코딩 중 가장 작은 것 선택 (없으면 identity)"""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get('*')
+    best, best_q = 'identity', 0.0
+    for encoding in ENCODING_PREFERENCE:
+        if encoding not in available or encoding == 'identity':
+            continue
+        q = accepted.get(encoding, wildcard if wildcard is not None else 0.0)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match 헤더가 ETag와 일치하는지 확인 (약한 비교)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def precompressed_response(entry, request):
+    """사전 압축 엔트리로 응답 생성 (If-None-Match 일치 시 304)
+
+    entry['variants']: 메모리 바이트, entry['files']: 게시된 파일 경로 (sendfile 전송)
+    """
+    headers = {
+        'ETag': entry['etag'],
+        'Vary': 'Accept-Encoding',
+        'Cache-Control': 'no-cache',
+    }
+    if etag_matches(request.headers.get('If-None-Match'), entry['etag']):
+        return Response(status=304, headers=headers)
+
+    available = entry.get('variants') or entry['files']
+    encoding = choose_encoding(request.headers.get('Accept-Encoding'), available)
+    if encoding != 'identity':
+        headers['Content-Encoding'] = encoding
+    if 'variants' not in entry:
+        response = send_file(entry['files'][encoding], mimetype='application/json', conditional=False, etag=False)
+        response.headers.update(headers)
+        return response
+    return Response(entry['variants'][encoding], status=200, mimetype='application/json', headers=headers)
+
+
+def compressed_json_response(payload, request):
+    """요청마다 만드는 작은 JSON 응답용 (gzip 수용 시 압축)"""
+    body, _ = serialize_payload(payload)
+    headers = {'Vary': 'Accept-Encoding'}
+    if parse_accept_encoding(request.headers.get('Accept-Encoding')).get('gzip', 0.0) > 0:
+        body = gzip.compress(body, compresslevel=6)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(body, status=200, mimetype='application/json', headers=headers)
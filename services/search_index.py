@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+통합 검색 인덱스 (메모리 역색인)
+갱신 시 병합 목록 전체(KOPIS/인터파크/멜론/YES24)를 색인하고, 검색은 KOPIS 호출 없이 메모리에서 처리
+
+- 한국어: 띄어쓰기 무시 + 글자 bigram 색인 → 부분/접두 일치
+- 타이핑 중 미완성 음절(예: '아이ㅇ')과 초성 검색(예: 'ㅇㅇㅇ') 지원
+"""
+import re
+
+from config import SUPPORTED_LANGS
+
+# 필드별 가중치 (높을수록 상위 노출)
+FIELD_WEIGHTS = {'name': 3, 'cast': 2, 'venue': 1, 'genre': 1}
+for _lang in SUPPORTED_LANGS:
+    if _lang != 'ko':
+        FIELD_WEIGHTS[f'name_{_lang}'] = 2
+        FIELD_WEIGHTS[f'venue_{_lang}'] = 1
+
+# 한글 호환 자모 초성 (유니코드 음절 초성 순서)
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+CHOSEONG_INDEX = {c: i for i, c in enumerate(CHOSEONG)}
+HANGUL_BASE = 0xAC00
+SYLLABLES_PER_CHOSEONG = 21 * 28
+
+_STRIP_PATTERN = re.compile(r'[^\w가-힣ㄱ-ㅎ]')
+DEFAULT_LIMIT = 50
+
+
+def normalize_text(text):
+    """검색용 정규화: 소문자 + 공백/특수문자 제거"""
+    return _STRIP_PATTERN.sub('', (text or '').lower()).replace('_', '')
+
+
+def to_choseong(text):
+    """한글 음절을 초성으로 변환 (그 외 문자는 유지)"""
+    out = []
+    for c in text:
+        code = ord(c) - HANGUL_BASE
+        if 0 <= code < 11172:
+            out.append(CHOSEONG[code // SYLLABLES_PER_CHOSEONG])
+        else:
+            out.append(c)
+    return ''.join(out)
+
+
+def _grams(text):
+    """unigram + bigram 집합"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+def _token_pattern(token):
+    """검색어 토큰 → 검증용 정규식 (초성 자모는 해당 초성으로 시작하는 음절도 허용)"""
+    parts = []
+    for c in token:
+        if c in CHOSEONG_INDEX:
+            start = HANGUL_BASE + CHOSEONG_INDEX[c] * SYLLABLES_PER_CHOSEONG
+            parts.append(f'[{c}{chr(start)}-{chr(start + SYLLABLES_PER_CHOSEONG - 1)}]')
+        else:
+            parts.append(re.escape(c))
+    return re.compile(''.join(parts))
+
+
+class SearchIndex:
+    """공연 목록 역색인
+
+    postings[gram]: gram을 포함하는 문서 id 집합 (본문 + 초성 텍스트 공용)
+    docs[id]: {필드: 정규화 텍스트}, choseong[id]: 초성 변환 텍스트 (이름/출연진)
+    items를 따로 주면 performances(색인용 필드)로 색인하고 결과는 items에서 꺼냄
+    """
+
+    def __init__(self, performances, items=None):
+        self.items = performances if items is None else items
+        self.docs = []
+        self.choseong = []
+        self.postings = {}
+        for doc_id, item in enumerate(performances):
+            fields = {}
+            for field in FIELD_WEIGHTS:
+                text = normalize_text(item.get(field, ''))
+                if text:
+                    fields[field] = text
+            initials = to_choseong(fields.get('name', '') + fields.get('cast', ''))
+            self.docs.append(fields)
+            self.choseong.append(initials)
+
+            grams = set()
+            for text in fields.values():
+                grams |= _grams(text)
+            grams |= _grams(initials)
+            for gram in grams:
+                self.postings.setdefault(gram, set()).add(doc_id)
+
+    def _candidates(self, token):
+        """토큰의 gram 교집합으로 후보 문서 id 집합"""
+        if all(c in CHOSEONG_INDEX for c in token):
+            key_text = token
+        else:
+            # 자모가 섞이면 가장 긴 완성 문자 구간만으로 후보 추림
+            runs = [r for r in re.split(f'[{CHOSEONG}]', token) if r]
+            key_text = max(runs, key=len)
+        grams = [key_text[i:i + 2] for i in range(len(key_text) - 1)] or [key_text]
+        result = None
+        for gram in sorted(grams, key=lambda g: len(self.postings.get(g, ()))):
+            ids = self.postings.get(gram)
+            if not ids:
+                return set()
+            result = set(ids) if result is None else result & ids
+            if not result:
+                break
+        return result or set()
+
+    def _token_score(self, doc_id, token, pattern, choseong_only):
+        """문서 내 토큰 일치 점수 (가장 높은 가중치 필드 기준, 없으면 0)"""
+        best = 0
+        for field, text in self.docs[doc_id].items():
+            weight = FIELD_WEIGHTS[field]
+            if weight > best and (token in text or pattern.search(text)):
+                best = weight
+        if not best and choseong_only and token in self.choseong[doc_id]:
+            best = 1
+        return best
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """검색어의 모든 토큰을 포함하는 공연 목록 (점수 → D-day 순)"""
+        tokens = [normalize_text(t) for t in (query or '').split()]
+        tokens = [t for t in tokens if t]
+        if not tokens:
+            return []
+
+        candidates = None
+        compiled = []
+        for token in tokens:
+            ids = self._candidates(token)
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+            compiled.append((token, _token_pattern(token), all(c in CHOSEONG_INDEX for c in token)))
+
+        scored = []
+        for doc_id in candidates:
+            total = 0
+            for token, pattern, choseong_only in compiled:
+                score = self._token_score(doc_id, token, pattern, choseong_only)
+                if not score:
+                    break
+                total += score
+            else:
+                scored.append((-total, doc_id))
+
+        scored.sort()
+        return [self.items[doc_id] for _, doc_id in scored[:limit]]
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+gunicorn 워커 간 공유 캐시
+- 파일 잠금으로 스케줄러(갱신 담당) 프로세스 1개만 선출
+- 담당 프로세스가 /api/all 응답 바이트(identity/gzip/br)를 세대별 파일로 게시
+- 나머지 워커는 meta 파일 변경 시에만 다시 읽고, 응답은 게시된 파일을 sendfile로 그대로 전송
+  (필터/검색용 색인 파일만 읽고, 개별 공연은 응답 파일을 mmap해 필요한 항목만 디코딩)
+"""
+import os
+import json
+import mmap
+import time
+import logging
+import threading
+from array import array
+from collections.abc import Sequence
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from utils.helpers import atomic_write
+
+VARIANT_SUFFIXES = {'identity': '', 'gzip': '.gz', 'br': '.br'}
+KEEP_GENERATIONS = 2
+
+
+class SchedulerLock:
+    """프로세스 1개 선출용 파일 잠금 (스케줄러 담당, 크롤러 워커 등 - 프로세스 종료 시 OS가 자동 해제)
+
+    fcntl이 없는 환경(Windows)에서는 단일 프로세스로 보고 항상 획득
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+
+    @property
+    def held(self):
+        return self._fd is not None
+
+    def acquire(self, blocking=False):
+        """잠금 획득 시도 (blocking이면 획득할 때까지 대기) → 획득 여부"""
+        if self._fd is not None:
+            return True
+        if fcntl is None:
+            self._fd = -1
+            return True
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        self._write_pid()
+        return True
+
+    def _write_pid(self):
+        os.ftruncate(self._fd, 0)
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        os.write(self._fd, str(os.getpid()).encode())
+
+    def handover(self):
+        """자식 프로세스에 넘길 잠금 fd 반환 (-1이면 넘길 fd 없음)
+
+        호출자는 Popen(pass_fds=...) 후 fd를 닫음 - 잠금은 자식이 살아 있는 동안 유지
+        """
+        fd, self._fd = self._fd, None
+        return -1 if fd is None else fd
+
+    def adopt(self, fd):
+        """부모 프로세스가 넘긴 잠금 fd를 이어받음"""
+        self._fd = fd
+        if fd >= 0:
+            self._write_pid()
+
+
+class PublishedItems(Sequence):
+    """게시된 응답 파일의 data 목록 (mmap + 항목별 바이트 위치, 꺼낸 항목만 JSON 디코딩)
+
+    spans: [시작0, 끝0, 시작1, 끝1, ...] (serialize_payload)
+    """
+
+    def __init__(self, path, spans):
+        with open(path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._spans = array('Q', spans)
+
+    def __len__(self):
+        return len(self._spans) // 2
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            return [self[i] for i in range(*pos.indices(len(self)))]
+        if pos < 0:
+            pos += len(self)
+        if not 0 <= pos < len(self):
+            raise IndexError(pos)
+        start, end = self._spans[2 * pos], self._spans[2 * pos + 1]
+        return json.loads(self._buffer[start:end])
+
+
+class SnapshotStore:
+    """세대별 응답 파일 + meta.json 게시/감지
+
+    meta.json은 항상 마지막에 rename되므로, meta가 가리키는 세대 파일은 모두 완성된 상태
+    """
+
+    def __init__(self, directory, check_interval=5):
+        self.directory = directory
+        self.meta_path = os.path.join(directory, 'meta.json')
+        self.check_interval = check_interval
+        self.generation = None
+        self._meta_mtime = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _variant_path(self, generation, encoding):
+        return os.path.join(self.directory, f"all-{generation}.json{VARIANT_SUFFIXES[encoding]}")
+
+    def _index_path(self, generation):
+        return os.path.join(self.directory, f"all-{generation}.index.json")
+
+    def publish(self, entry, last_update, index=None):
+        """사전 압축 엔트리(build_precompressed)를 새 세대로 게시
+
+        index: {'meta': 항목별 색인 필드 목록, 'timestamp', 'stats'} - 주면 항목 위치와 함께 색인 파일로 게시
+        """
+        generation = entry['etag'].strip('"')
+        for encoding, body in entry['variants'].items():
+            atomic_write(self._variant_path(generation, encoding), body)
+        if index is not None:
+            index = dict(index, spans=list(entry['spans']))
+            atomic_write(self._index_path(generation), json.dumps(index, ensure_ascii=False).encode('utf-8'))
+
+        meta = {
+            'generation': generation,
+            'etag': entry['etag'],
+            'encodings': sorted(entry['variants']),
+            'index': index is not None,
+            'last_update': last_update.timestamp(),
+        }
+        atomic_write(self.meta_path, json.dumps(meta).encode('utf-8'))
+        with self._lock:
+            self.generation = generation
+            self._meta_mtime = os.stat(self.meta_path).st_mtime_ns
+        self._remove_old_generations(generation)
+
+    def _remove_old_generations(self, current):
+        """최근 KEEP_GENERATIONS 세대만 남기고 삭제 (전송 중인 이전 세대 파일 보호)"""
+        try:
+            files = [f for f in os.listdir(self.directory) if f.startswith('all-')]
+            generations = {f[4:].split('.', 1)[0] for f in files}
+            by_age = sorted(
+                generations,
+                key=lambda g: os.stat(self._variant_path(g, 'identity')).st_mtime
+                if os.path.exists(self._variant_path(g, 'identity')) else 0,
+                reverse=True
+            )
+            stale = set(by_age[KEEP_GENERATIONS:]) - {current}
+            for name in files:
+                if name[4:].split('.', 1)[0] in stale:
+                    os.remove(os.path.join(self.directory, name))
+        except OSError as e:
+            logging.warning(f"이전 스냅샷 정리 실패: {e}")
+
+    def poll(self, force=False):
+        """새 세대가 게시됐으면 (payload, entry, last_update, 색인 필드 목록) 반환, 아니면 None
+
+        색인 파일이 있으면 payload['data']는 PublishedItems (전체 JSON을 읽지 않음),
+        없으면(이전 형식) 전체를 읽고 색인 필드 목록은 None
+        meta.json stat은 check_interval초에 1회로 제한
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not force and now < self._next_check:
+                return None
+            self._next_check = now + self.check_interval
+            try:
+                mtime = os.stat(self.meta_path).st_mtime_ns
+            except OSError:
+                return None
+            if not force and mtime == self._meta_mtime:
+                return None
+
+            try:
+                with open(self.meta_path, 'rb') as f:
+                    meta = json.load(f)
+                generation = meta['generation']
+                if not force and generation == self.generation:
+                    self._meta_mtime = mtime
+                    return None
+
+                files = {enc: self._variant_path(generation, enc) for enc in meta['encodings']}
+                if meta.get('index'):
+                    with open(self._index_path(generation), 'rb') as f:
+                        index = json.load(f)
+                    items = index['meta']
+                    payload = {'success': True, 'data': PublishedItems(files['identity'], index['spans']),
+                               'timestamp': index['timestamp'], 'stats': index['stats']}
+                else:
+                    with open(files['identity'], 'rb') as f:
+                        payload = json.load(f)
+                    items = None
+            except (OSError, ValueError, KeyError) as e:
+                logging.warning(f"공유 스냅샷 로드 실패: {e}")
+                return None
+
+            self.generation = generation
+            self._meta_mtime = mtime
+
+        entry = {'etag': meta['etag'], 'files': files}
+        return payload, entry, datetime.fromtimestamp(meta['last_update']), items
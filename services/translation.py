@@ -5,149 +5,237 @@
 import os
 import json
 import logging
-import threading
 import time as time_module
+from concurrent.futures import ThreadPoolExecutor
 import polib
 import requests
 
 from config import (
     SUPPORTED_LANGS, LANG_CODES,
-    TRANSLATION_CACHE_FILE, TRANSLATION_CACHE_TTL_DAYS,
-    TRANSLATION_CACHE_MAX_ENTRIES, TRANSLATION_CACHE_MAX_FILE_MB
+    TRANSLATION_CACHE_FILE, TRANSLATION_CACHE_DB, TRANSLATION_CACHE_TTL_DAYS,
+    TRANSLATION_CACHE_MAX_ENTRIES, TRANSLATION_CACHE_COMPACT_HOURS,
+    TRANSLATION_API_URL, TRANSLATION_CONCURRENCY, TRANSLATION_RATE_PER_SEC,
+    TRANSLATION_BATCH_SIZE, TRANSLATION_BATCH_MAX_CHARS, TRANSLATION_MAX_RETRIES
 )
+from utils.rate_limit import TokenBucket
+from utils.kv_store import SqliteStore
 
 
-def load_translation_cache():
-    """JSON 파일에서 번역 캐시 로드 (만료 항목 제거, 기존 형식 호환)"""
-    try:
-        if os.path.exists(TRANSLATION_CACHE_FILE):
-            file_size = os.path.getsize(TRANSLATION_CACHE_FILE)
-            if file_size > TRANSLATION_CACHE_MAX_FILE_MB * 1024 * 1024:
-                logging.warning(f"번역 캐시 파일 크기 초과 ({file_size // 1024}KB), 초기화")
-                return {}
-
-            with open(TRANSLATION_CACHE_FILE, 'r', encoding='utf-8') as f:
-                raw = json.load(f)
-
-            now = time_module.time()
-            ttl_seconds = TRANSLATION_CACHE_TTL_DAYS * 86400
-            cache = {}
-            for key, val in raw.items():
-                if isinstance(val, dict) and 'v' in val and 't' in val:
-                    if now - val['t'] < ttl_seconds:
-                        cache[key] = val
-                else:
-                    cache[key] = {'v': val, 't': now}
-
-            if len(cache) > TRANSLATION_CACHE_MAX_ENTRIES:
-                sorted_items = sorted(cache.items(), key=lambda x: x[1].get('t', 0), reverse=True)
-                cache = dict(sorted_items[:TRANSLATION_CACHE_MAX_ENTRIES])
-                logging.info(f"번역 캐시 항목 제한 적용: {len(raw)} → {len(cache)}")
-
-            return cache
-    except Exception as e:
-        logging.warning(f"번역 캐시 로드 실패: {e}")
-    return {}
+TTL_SECONDS = TRANSLATION_CACHE_TTL_DAYS * 86400
 
+# 번역 캐시: 워커 간 공유 SQLite (조회/저장 모두 건별, 시작 시 전체 로드 없음)
+translation_store = SqliteStore(TRANSLATION_CACHE_DB, 'translations')
 
-def save_translation_cache():
-    """번역 캐시를 JSON 파일에 저장"""
+
+def migrate_json_cache():
+    """기존 translation_cache.json을 SQLite로 1회 이전 (이전 후 파일명 변경)"""
+    if not os.path.exists(TRANSLATION_CACHE_FILE):
+        return
     try:
-        with translation_cache_lock:
-            data = dict(translation_cache)
-        with open(TRANSLATION_CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(TRANSLATION_CACHE_FILE, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+
+        now = time_module.time()
+        by_time = {}
+        for key, val in raw.items():
+            if isinstance(val, dict) and 'v' in val and 't' in val:
+                if now - val['t'] < TTL_SECONDS:
+                    by_time.setdefault(val['t'], {})[key] = val['v']
+            else:
+                by_time.setdefault(now, {})[key] = val
+        for updated, items in by_time.items():
+            translation_store.put_many(items, updated)
+
+        os.replace(TRANSLATION_CACHE_FILE, TRANSLATION_CACHE_FILE + '.migrated')
+        logging.info(f"번역 캐시 이전 완료: {sum(len(v) for v in by_time.values())}건")
     except Exception as e:
-        logging.warning(f"번역 캐시 저장 실패: {e}")
+        logging.warning(f"번역 캐시 이전 실패: {e}")
 
 
-# 모듈 로드 시 캐시 초기화
-translation_cache = load_translation_cache()
-translation_cache_lock = threading.Lock()
+def start_cache_maintenance():
+    """JSON 캐시 이전 + 주기적 정리 시작 (워커 간 경합이 없도록 스케줄러 담당 프로세스에서만 호출)"""
+    migrate_json_cache()
+    translation_store.start_compactor(
+        TRANSLATION_CACHE_COMPACT_HOURS * 3600, max_age=TTL_SECONDS, max_entries=TRANSLATION_CACHE_MAX_ENTRIES
+    )
 
 
-def translate_text(text, from_lang='ko', to_lang='en'):
-    """MyMemory API로 텍스트 번역"""
-    if not text or from_lang == to_lang:
-        return text
+class RateLimited(Exception):
+    """번역 API 속도 제한 (HTTP 429)"""
 
-    cache_key = f"{text}|{to_lang}"
 
-    with translation_cache_lock:
-        if cache_key in translation_cache:
-            entry = translation_cache[cache_key]
-            return entry['v'] if isinstance(entry, dict) else entry
-        old_key = f"{text}|{from_lang}|{to_lang}"
-        if old_key in translation_cache:
-            entry = translation_cache[old_key]
-            return entry['v'] if isinstance(entry, dict) else entry
+class MyMemoryBackend:
+    """MyMemory 호환 번역 백엔드 (GET {url}?q=...&langpair=ko|en)
 
-    try:
+    여러 구간을 줄바꿈으로 묶어 1회 요청으로 번역하고, 응답 줄 수가 맞지 않으면 None 반환
+    url을 로컬 스텁 서버로 바꾸면 외부 API 없이 테스트 가능
+    """
+
+    separator = '\n'
+
+    def __init__(self, url=TRANSLATION_API_URL, timeout=5):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def translate(self, texts, from_lang, to_lang):
+        """texts 구간 일괄 번역 → 번역문 리스트 (구간 분리 실패 시 None)"""
         from_code = LANG_CODES.get(from_lang, from_lang)
         to_code = LANG_CODES.get(to_lang, to_lang)
-
-        url = "https://api.mymemory.translated.net/get"
         params = {
-            'q': text[:500],
+            'q': self.separator.join(t.replace(self.separator, ' ') for t in texts)[:500],
             'langpair': f"{from_code}|{to_code}"
         }
+        response = self.session.get(self.url, params=params, timeout=self.timeout)
+        if response.status_code == 429:
+            raise RateLimited()
+        if response.status_code != 200:
+            return None
+
+        data = response.json()
+        if data.get('responseStatus') == 429:
+            raise RateLimited()
+        if data.get('responseStatus') != 200:
+            return None
+
+        translated = data.get('responseData', {}).get('translatedText', '')
+        parts = translated.split(self.separator) if len(texts) > 1 else [translated]
+        if len(parts) != len(texts):
+            return None
+        return [p.strip() for p in parts]
+
+
+_backend = MyMemoryBackend()
+_rate_limiter = TokenBucket(TRANSLATION_RATE_PER_SEC, capacity=TRANSLATION_CONCURRENCY)
+
+
+def set_translation_backend(backend):
+    """번역 백엔드 교체 (translate(texts, from_lang, to_lang) 메서드 필요)"""
+    global _backend
+    _backend = backend
+
+
+def _cached_translation(text, from_lang, to_lang):
+    """번역 캐시 조회 (없으면 None)"""
+    try:
+        cached = translation_store.get(f"{text}|{to_lang}", TTL_SECONDS)
+        if cached is None:
+            cached = translation_store.get(f"{text}|{from_lang}|{to_lang}", TTL_SECONDS)
+        return cached
+    except Exception as e:
+        logging.warning(f"번역 캐시 조회 실패: {e}")
+        return None
+
 
-        response = requests.get(url, params=params, timeout=5)
+def _request_batch(texts, from_lang, to_lang):
+    """속도 제한 하에서 1회 번역 요청 (429 시 속도 낮추고 지수 백오프 재시도)"""
+    for attempt in range(TRANSLATION_MAX_RETRIES):
+        _rate_limiter.acquire()
+        try:
+            result = _backend.translate(texts, from_lang, to_lang)
+            _rate_limiter.reward()
+            return result
+        except RateLimited:
+            _rate_limiter.penalize()
+            time_module.sleep(min(30, 2 ** attempt))
+        except Exception as e:
+            logging.debug(f"번역 API 오류: {e}")
+            return None
+    return None
 
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('responseStatus') == 200:
-                translated = data.get('responseData', {}).get('translatedText', text)
 
-                with translation_cache_lock:
-                    translation_cache[cache_key] = {'v': translated, 't': time_module.time()}
+def _translate_batch(texts, from_lang, to_lang):
+    """구간 묶음 번역 + 캐시 저장 (묶음 분리 실패 시 구간별 재요청)"""
+    results = _request_batch(texts, from_lang, to_lang)
+    if results is None and len(texts) > 1:
+        results = [(_request_batch([t], from_lang, to_lang) or [None])[0] for t in texts]
+    if results is None:
+        return 0
 
-                return translated
+    items = {f"{text}|{to_lang}": translated for text, translated in zip(texts, results) if translated}
+    try:
+        translation_store.put_many(items)
     except Exception as e:
-        logging.debug(f"번역 API 오류: {e}")
+        logging.warning(f"번역 캐시 저장 실패: {e}")
+    return len(items)
+
+
+def _make_batches(texts):
+    """구간 수/글자 수 제한에 맞춰 묶음 생성"""
+    batch, size = [], 0
+    for text in texts:
+        if batch and (len(batch) >= TRANSLATION_BATCH_SIZE or size + len(text) + 1 > TRANSLATION_BATCH_MAX_CHARS):
+            yield batch
+            batch, size = [], 0
+        batch.append(text)
+        size += len(text) + 1
+    if batch:
+        yield batch
+
+
+def translate_text(text, from_lang='ko', to_lang='en'):
+    """텍스트 1건 번역 (캐시 우선)"""
+    if not text or from_lang == to_lang:
+        return text
+
+    cached = _cached_translation(text, from_lang, to_lang)
+    if cached is not None:
+        return cached
+
+    _translate_batch([text[:500]], from_lang, to_lang)
+    cached = _cached_translation(text[:500], from_lang, to_lang)
+    return cached if cached is not None else text
 
-    return text
+
+def translate_texts(texts, from_lang='ko', to_lang='en'):
+    """여러 텍스트 일괄 번역 (캐시 미스만 묶음 요청, 입력 순서대로 반환)"""
+    if from_lang == to_lang:
+        return list(texts)
+
+    missing = list(dict.fromkeys(t[:500] for t in texts if t and _cached_translation(t, from_lang, to_lang) is None))
+    batches = list(_make_batches(missing))
+    if batches:
+        with ThreadPoolExecutor(max_workers=TRANSLATION_CONCURRENCY) as executor:
+            list(executor.map(lambda batch: _translate_batch(batch, from_lang, to_lang), batches))
+
+    results = []
+    for text in texts:
+        cached = _cached_translation(text[:500], from_lang, to_lang) if text else None
+        results.append(cached if cached is not None else text)
+    return results
 
 
 def translate_performance_data(performances):
-    """스크래핑 시 공연 name/venue를 4개 언어로 사전 번역"""
-    global translation_cache
+    """스크래핑 시 공연 name/venue를 4개 언어로 사전 번역 (묶음 요청 + 동시 실행 + 속도 제한)"""
     target_langs = [l for l in SUPPORTED_LANGS if l != 'ko']
 
-    texts_to_translate = []
-    for perf in performances:
-        for field in ['name', 'venue']:
-            text = perf.get(field, '')
-            if not text:
-                continue
-            for lang in target_langs:
-                cache_key = f"{text}|{lang}"
-                if cache_key not in translation_cache:
-                    texts_to_translate.append((text, lang, cache_key))
-
-    seen = set()
-    unique_texts = []
-    for text, lang, cache_key in texts_to_translate:
-        if cache_key not in seen:
-            seen.add(cache_key)
-            unique_texts.append((text, lang, cache_key))
-
-    for text, lang, cache_key in unique_texts:
-        translated = translate_text(text, 'ko', lang)
-        with translation_cache_lock:
-            translation_cache[cache_key] = {'v': translated, 't': time_module.time()}
-        time_module.sleep(0.1)
+    texts = {perf.get(field, '')[:500] for perf in performances for field in ['name', 'venue']}
+    texts.discard('')
+    keys = [f"{text}|{lang}" for text in texts for lang in target_langs]
+    try:
+        cached = translation_store.get_many(keys, TTL_SECONDS)
+    except Exception as e:
+        logging.warning(f"번역 캐시 조회 실패: {e}")
+        cached = {}
+
+    pending = {lang: [] for lang in target_langs}
+    for text in texts:
+        for lang in target_langs:
+            if f"{text}|{lang}" not in cached:
+                pending[lang].append(text)
+
+    jobs = [(batch, lang) for lang, batch_texts in pending.items() for batch in _make_batches(batch_texts)]
+    if jobs:
+        with ThreadPoolExecutor(max_workers=TRANSLATION_CONCURRENCY) as executor:
+            translated = sum(executor.map(lambda job: _translate_batch(job[0], 'ko', job[1]), jobs))
+        logging.info(f"번역 요청 {len(jobs)}회, 신규 번역 {translated}/{sum(len(v) for v in pending.values())}건")
+        cached.update(translation_store.get_many([k for k in keys if k not in cached], TTL_SECONDS))
 
     for perf in performances:
         for field in ['name', 'venue']:
             text = perf.get(field, '')
             for lang in target_langs:
-                cache_key = f"{text}|{lang}"
-                with translation_cache_lock:
-                    entry = translation_cache.get(cache_key, text)
-                    perf[f"{field}_{lang}"] = entry['v'] if isinstance(entry, dict) and 'v' in entry else entry
-
-    save_translation_cache()
+                perf[f"{field}_{lang}"] = cached.get(f"{text[:500]}|{lang}", text) if text else text
 
 
 def load_po_translations():
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+공연장 → 지역 색인
+KOPIS 목록(area 포함)에서 공연장명별 지역을 학습해 두고,
+area가 없는 인터파크/멜론/YES24 행은 공연장명만으로 지역을 찾음
+여러 워커가 같은 파일에 저장하므로 저장은 파일 잠금 안에서 디스크 내용과 병합
+"""
+import os
+import re
+import json
+import time
+import atexit
+import logging
+import threading
+
+from utils.helpers import atomic_write, file_lock
+
+_BRACKETS = re.compile(r'\[[^\]]*\]|\([^)]*\)')
+_NON_WORD = re.compile(r'[^\w가-힣]')
+
+MIN_KEY_LENGTH = 3  # 이보다 짧은 공연장명은 학습하지 않음
+MIN_PREFIX_LENGTH = 6  # 앞부분 일치에 쓰는 최소 길이 ('아트센터'처럼 흔한 짧은 이름이 다른 지역 공연장을 삼키지 않도록)
+_TERMINAL = ''
+_SUBTREE = None  # 트라이 노드의 하위 학습 이름 공통 지역 (지역이 둘 이상이면 값 None)
+
+
+def venue_keys(venue_name):
+    """학습용 키 (전체 이름, 괄호 부분을 뺀 기본 이름) - 공백/기호 제거 + 소문자"""
+    full = _NON_WORD.sub('', venue_name).lower()
+    base = _NON_WORD.sub('', _BRACKETS.sub('', venue_name)).lower()
+    return [key for key in dict.fromkeys((full, base)) if len(key) >= MIN_KEY_LENGTH]
+
+
+class VenueIndex:
+    """학습된 공연장명 → 지역
+
+    regions: {정규화 공연장명: 지역 또는 None(지역이 엇갈린 이름)}
+    trie: 정규화 공연장명 글자 트라이 (앞부분 일치 조회, 공연장명 길이에 비례)
+          노드마다 하위 학습 이름들의 공통 지역을 두어, 같은 앞부분이 여러 지역에 걸치면 쓰지 않음
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.regions = {}
+        self.trie = {}
+        self.lock = threading.Lock()
+        self.dirty = False
+        self._load()
+        atexit.register(self.save)
+
+    def _read(self):
+        """디스크 색인 → {정규화 공연장명: 지역} (없거나 깨졌으면 빈 dict)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.warning(f"공연장 색인 로드 실패: {e}")
+            return {}
+
+    def _load(self):
+        for key, region in self._read().items():
+            self._set(key, region)
+
+    def _merge(self, key, region):
+        """다른 프로세스가 학습한 항목 반영 (lock 보유 상태에서 호출, 지역이 엇갈리면 None)"""
+        known = self.regions.get(key, _TERMINAL)
+        if known == _TERMINAL:
+            self._set(key, region)
+        elif known is not None and known != region:
+            self._set(key, None)
+
+    def _set(self, key, region):
+        """트라이 + 사전 반영 (lock 보유 상태 또는 초기화 중 호출)"""
+        node = self.trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+            node[_SUBTREE] = region if node.get(_SUBTREE, region) == region else None
+        node[_TERMINAL] = region
+        self.regions[key] = region
+
+    def learn(self, venue_name, region):
+        """KOPIS 행의 공연장명 → 지역 학습 → 색인이 바뀌었으면 True"""
+        if not venue_name or not region:
+            return False
+        changed = False
+        for key in venue_keys(venue_name):
+            known = self.regions.get(key, _TERMINAL)
+            if known == region or known is None:
+                continue
+            with self.lock:
+                # 같은 이름이 여러 지역에 있으면(체인 공연장 등) 이름만으로는 판단하지 않음
+                self._set(key, region if known == _TERMINAL else None)
+                self.dirty = True
+            changed = True
+        return changed
+
+    def lookup(self, venue_name):
+        """공연장명 → 학습된 지역 (이름 전체 또는 괄호를 뺀 이름이 학습된 이름과 같을 때만, 없으면 None)"""
+        if not venue_name:
+            return None
+        for key in venue_keys(venue_name):
+            region = self.regions.get(key)
+            if region:
+                return region
+        return None
+
+    def lookup_prefix(self, venue_name):
+        """공연장명 → 앞부분이 학습된 이름과 같은 경우의 지역 (없거나 애매하면 None)
+
+        MIN_PREFIX_LENGTH자 이상인 학습 이름 중 가장 긴 앞부분 일치 ('나루아트센터 대공연장' → '나루아트센터')
+        그 앞부분으로 시작하는 학습 이름들의 지역이 엇갈리면 사용하지 않음
+        지역 키워드보다 근거가 약하므로 키워드로도 못 찾은 경우에만 사용
+        """
+        if not venue_name:
+            return None
+        key = _NON_WORD.sub('', venue_name).lower()
+        node = self.trie
+        found = None
+        for depth, ch in enumerate(key, 1):
+            node = node.get(ch)
+            if node is None:
+                break
+            if depth >= MIN_PREFIX_LENGTH and node.get(_TERMINAL):
+                found = node[_TERMINAL] if node.get(_SUBTREE) == node[_TERMINAL] else None
+        return found
+
+    def __len__(self):
+        return len(self.regions)
+
+    def save(self):
+        """변경된 색인을 디스크에 저장 (파일 잠금 안에서 다른 프로세스가 저장한 색인과 병합 후 교체)"""
+        with self.lock:
+            if not self.dirty:
+                return
+            self.dirty = False
+        try:
+            with file_lock(self.path):
+                disk = self._read()
+                with self.lock:
+                    for key, region in disk.items():
+                        self._merge(key, region)
+                    data = json.dumps(self.regions, ensure_ascii=False).encode('utf-8')
+                atomic_write(self.path, data)
+        except Exception as e:
+            logging.warning(f"공연장 색인 저장 실패: {e}")
+
+    def start(self, interval):
+        """백그라운드 주기적 저장 스레드 시작"""
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.save()
+
+        thread = threading.Thread(target=loop, daemon=True)
+        thread.start()
+        return thread
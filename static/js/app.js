@@ -17,6 +17,15 @@ function sanitizeUrl(url) {
     return url;
 }
 
+// 포스터는 캐싱 프록시 경유 (width 지정 시 해당 폭의 WebP 썸네일)
+function posterProxyUrl(url, width) {
+    if (!url || !/^(https?:)?\/\//i.test(url)) return '';
+    if (url.startsWith('//')) url = 'https:' + url;
+    let proxied = '/api/proxy/image?url=' + encodeURIComponent(url);
+    if (width) proxied += '&w=' + width + '&format=webp';
+    return proxied;
+}
+
 // =============================================
 // 다국어 지원 (i18n)
 // =============================================
@@ -353,6 +362,23 @@ async function loadAllData() {
     }, 3000);
 
     try {
+        // Phase 0: 첫 화면 카드만 먼저 (서버 인덱스에서 현재 파트 30건, 캐시가 없으면 건너뜀)
+        try {
+            const firstResponse = await fetch(`/api/all?limit=30&part=${encodeURIComponent(currentPart)}`);
+            const firstPage = await firstResponse.json();
+            if (firstPage.success && firstPage.data.length > 0 && allData.length === 0) {
+                allData = firstPage.data;
+                allDataMap = {};
+                allData.forEach(item => {
+                    if (item.hash) allDataMap[item.hash] = item;
+                });
+                updateStats(firstPage.stats);
+                renderResults();
+            }
+        } catch (e) {
+            // 전체 목록 로딩으로 계속 진행
+        }
+
         // Phase 1: 빠른 로딩 (KOPIS + 인터파크만, Selenium 제외)
         const fastResponse = await fetch(`/api/all?start_date=${startDate}&end_date=${endDate}&skip_selenium=true`);
         const fastResult = await fastResponse.json();
@@ -546,11 +572,9 @@ function renderResults() {
             const categoryBadge = item.category ?
                 `<span class="category-badge">${t(getCategoryI18nKey(item.category))}</span>` : '';
 
-            // YES24/멜론 이미지는 캐싱 프록시 사용
-            let posterUrl = item.poster || '';
-            if (posterUrl && (posterUrl.includes('yes24.com') || posterUrl.includes('melon.com') || posterUrl.includes('tkfile'))) {
-                posterUrl = '/api/proxy/image?url=' + encodeURIComponent(posterUrl);
-            }
+            // 카드 이미지는 320px 썸네일 (고해상도 화면은 640px)
+            const posterUrl = posterProxyUrl(item.poster, 320);
+            const posterSrcset = posterUrl ? `${posterUrl} 1x, ${posterProxyUrl(item.poster, 640)} 2x` : '';
 
             const isFav = isFavorite(item.hash);
 
@@ -560,7 +584,7 @@ function renderResults() {
             html += `
                 <div class="card" data-hash="${escapeHtml(item.hash)}">
                     <div class="card-img">
-                        ${posterUrl ? `<img src="${escapeHtml(posterUrl)}" alt="${escapeHtml(displayName)}" loading="lazy" onerror="this.onerror=null; this.style.display='none'; this.parentElement.classList.add('no-poster');">` : ''}
+                        ${posterUrl ? `<img src="${escapeHtml(posterUrl)}" srcset="${escapeHtml(posterSrcset)}" alt="${escapeHtml(displayName)}" loading="lazy" decoding="async" onerror="this.onerror=null; this.style.display='none'; this.parentElement.classList.add('no-poster');">` : ''}
                         ${ddayBadge}
                         ${categoryBadge}
                         <button class="fav-btn ${isFav ? 'active' : ''}" data-fav-hash="${escapeHtml(item.hash)}" title="${t('addFavorite')}">${isFav ? '♥' : '♡'}</button>
@@ -630,13 +654,10 @@ async function showDetail(item) {
         document.getElementById('modalDate').textContent = '-';
     }
 
-    // 포스터 (YES24/멜론은 캐싱 프록시 사용)
+    // 포스터 (캐싱 프록시, 640px 변환본)
     const posterDiv = document.getElementById('modalPoster');
-    if (item.poster) {
-        let modalPosterUrl = item.poster;
-        if (modalPosterUrl.includes('yes24.com') || modalPosterUrl.includes('melon.com') || modalPosterUrl.includes('tkfile')) {
-            modalPosterUrl = '/api/proxy/image?url=' + encodeURIComponent(modalPosterUrl);
-        }
+    const modalPosterUrl = posterProxyUrl(item.poster, 640);
+    if (modalPosterUrl) {
         posterDiv.innerHTML = `<img src="${escapeHtml(modalPosterUrl)}" alt="${escapeHtml(displayName)}" onerror="this.parentElement.innerHTML='<span>No Image</span>'">`;
     } else {
         posterDiv.innerHTML = '<span>No Image</span>';
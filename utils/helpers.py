@@ -2,9 +2,17 @@
 """
 공통 유틸리티 함수
 """
+import os
 import re
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 
 def calculate_dday(date_str):
     """D-day 계산"""
@@ -66,3 +74,36 @@ def sort_by_dday(performances_list):
         return (2, 0)
     performances_list.sort(key=sort_key)
     return performances_list
+
+
+@contextmanager
+def file_lock(path):
+    """프로세스 간 배타 잠금 (path + '.lock' 파일 flock, 블록 종료 시 해제)
+
+    여러 워커가 같은 파일을 읽고-병합-교체할 때 사이에 끼어든 저장을 잃지 않도록 사용
+    fcntl이 없는 환경(Windows)에서는 잠금 없이 실행
+    """
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    fd = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path, data):
+    """같은 디렉터리 임시 파일에 쓴 뒤 rename (읽는 쪽은 이전/새 파일 중 하나만 보게 됨)"""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
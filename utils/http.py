@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP 세션 풀 (호스트/용도별 keep-alive 재사용)
+"""
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(name, pool_size=10, headers=None):
+    """이름별 공용 requests.Session (커넥션 풀 크기 pool_size, 최초 1회 생성)"""
+    with _sessions_lock:
+        session = _sessions.get(name)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['User-Agent'] = DEFAULT_USER_AGENT
+            if headers:
+                session.headers.update(headers)
+            _sessions[name] = session
+    return session
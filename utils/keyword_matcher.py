@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+다중 키워드 매처 (Aho-Corasick)
+라벨별 키워드 전체를 오토마톤 하나로 묶어 문자열을 1회만 훑어 분류
+"""
+from collections import deque
+
+_WORD_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')
+
+
+class KeywordMatcher:
+    """우선순위가 있는 라벨별 키워드 매처 (대소문자 무시)
+
+    groups: [(라벨, [키워드, ...]), ...] - 앞에 있는 라벨이 우선
+    word_boundary: 키워드 → bool, True인 키워드는 앞뒤가 영문/숫자가 아닐 때만 매칭
+                   (정규식 (?<![A-Za-z0-9])키워드(?![A-Za-z0-9]) 와 같은 의미)
+    """
+
+    def __init__(self, groups, word_boundary=None):
+        self.labels = []
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]  # 노드별 (우선순위, 키워드 길이, 단어 경계 여부) - 실패 링크 출력 포함
+
+        for priority, (label, keywords) in enumerate(groups):
+            self.labels.append(label)
+            for keyword in keywords:
+                self._insert(keyword.lower(), priority, bool(word_boundary and word_boundary(keyword)))
+        self._link()
+
+    def _insert(self, keyword, priority, bounded):
+        node = 0
+        for ch in keyword:
+            nxt = self.goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+            node = nxt
+        if (priority, len(keyword), bounded) not in self.output[node]:
+            self.output[node] += ((priority, len(keyword), bounded),)
+
+    def _link(self):
+        """BFS로 실패 링크 계산 + 출력 병합"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and ch not in self.goto[state]:
+                    state = self.fail[state]
+                target = self.goto[state].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                self.output[child] += self.output[self.fail[child]]
+
+    def _best(self, text, stop_at):
+        """매칭된 라벨 중 가장 높은 우선순위 번호 (없으면 None, stop_at 이하를 찾으면 즉시 종료)"""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # 소문자 변환 시 길이가 바뀌는 문자(예: 'İ')는 위치 계산이 어긋나므로 글자 단위로 변환
+            lowered = ''.join(ch.lower()[0] for ch in text)
+        goto, fail, output = self.goto, self.fail, self.output
+        length = len(lowered)
+        best = None
+        node = 0
+        for end, ch in enumerate(lowered):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for priority, size, bounded in output[node]:
+                if best is not None and priority >= best:
+                    continue
+                if bounded:
+                    start = end - size + 1
+                    if start > 0 and lowered[start - 1] in _WORD_CHARS:
+                        continue
+                    if end + 1 < length and lowered[end + 1] in _WORD_CHARS:
+                        continue
+                best = priority
+                if best <= stop_at:
+                    return best
+        return best
+
+    def first(self, text, default=None):
+        """가장 우선순위가 높은 매칭 라벨 (없으면 default)"""
+        if not text:
+            return default
+        best = self._best(text, 0)
+        return self.labels[best] if best is not None else default
+
+    def search(self, text):
+        """키워드가 하나라도 매칭되는지"""
+        return bool(text) and self._best(text, len(self.labels)) is not None
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite(WAL) 기반 키-값 저장소
+gunicorn 워커 간 파일 하나를 공유하고, 조회는 기본키 1회, 쓰기는 변경 행만 반영
+"""
+import json
+import time
+import sqlite3
+import threading
+import logging
+
+
+class SqliteStore:
+    """SQLite 키-값 테이블 (값은 JSON 직렬화, 스레드별 연결)
+
+    열기 비용은 데이터 크기와 무관 (전체 로드 없음)
+    """
+
+    def __init__(self, path, table):
+        self.path = path
+        self.table = table
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _conn(self):
+        """현재 스레드 전용 연결 (최초 1회 스키마 생성)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with self._init_lock:
+                if not self._initialized:
+                    conn.execute(
+                        f'CREATE TABLE IF NOT EXISTS {self.table} '
+                        '(key TEXT PRIMARY KEY, value TEXT NOT NULL, updated REAL NOT NULL) WITHOUT ROWID'
+                    )
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS {self.table}_updated ON {self.table}(updated)')
+                    self._initialized = True
+            self._local.conn = conn
+        return conn
+
+    def get_entry(self, key, max_age=None):
+        """키 조회 → (값, 저장 시각) (없거나 max_age초보다 오래되면 None)"""
+        row = self._conn().execute(
+            f'SELECT value, updated FROM {self.table} WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None or (max_age is not None and time.time() - row[1] > max_age):
+            return None
+        return json.loads(row[0]), row[1]
+
+    def get(self, key, max_age=None):
+        """키 조회 (없거나 max_age초보다 오래되면 None)"""
+        entry = self.get_entry(key, max_age)
+        return entry[0] if entry is not None else None
+
+    def get_many(self, keys, max_age=None):
+        """여러 키 조회 → {키: 값} (있는 것만)"""
+        keys = list(keys)
+        found = {}
+        oldest = time.time() - max_age if max_age is not None else 0
+        conn = self._conn()
+        # SQLite 바인딩 변수 제한(999) 이내로 나눠 조회
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = conn.execute(
+                f'SELECT key, value FROM {self.table} WHERE updated >= ? AND key IN ({",".join("?" * len(chunk))})',
+                [oldest] + chunk
+            )
+            for key, value in rows:
+                found[key] = json.loads(value)
+        return found
+
+    def put_many(self, items, updated=None):
+        """{키: 값} 일괄 저장 (단일 트랜잭션)"""
+        if not items:
+            return
+        updated = updated or time.time()
+        rows = [(key, json.dumps(value, ensure_ascii=False), updated) for key, value in items.items()]
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(f'INSERT OR REPLACE INTO {self.table} (key, value, updated) VALUES (?, ?, ?)', rows)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def put(self, key, value, updated=None):
+        """키 1건 저장"""
+        self.put_many({key: value}, updated)
+
+    def delete(self, key):
+        """키 삭제"""
+        self._conn().execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+
+    def delete_many(self, keys):
+        """여러 키 삭제 (단일 트랜잭션)"""
+        keys = list(keys)
+        if not keys:
+            return
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(f'DELETE FROM {self.table} WHERE key = ?', [(key,) for key in keys])
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def touch_many(self, times):
+        """{키: 시각} 저장 시각만 갱신 (값은 그대로, 없는 키는 무시)"""
+        if not times:
+            return
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                f'UPDATE {self.table} SET updated = ? WHERE key = ? AND updated < ?',
+                [(updated, key, updated) for key, updated in times.items()]
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def items(self):
+        """전체 (키, 값, 저장 시각) 목록 - 오래된 순"""
+        rows = self._conn().execute(f'SELECT key, value, updated FROM {self.table} ORDER BY updated').fetchall()
+        return [(key, json.loads(value), updated) for key, value, updated in rows]
+
+    def count(self):
+        """저장된 항목 수"""
+        return self._conn().execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+    def compact(self, max_age=None, max_entries=None):
+        """만료 항목 삭제 + 최신순 max_entries건만 유지 → 삭제 건수"""
+        conn = self._conn()
+        removed = 0
+        if max_age is not None:
+            removed += conn.execute(
+                f'DELETE FROM {self.table} WHERE updated < ?', (time.time() - max_age,)
+            ).rowcount
+        if max_entries is not None:
+            removed += conn.execute(
+                f'DELETE FROM {self.table} WHERE key IN '
+                f'(SELECT key FROM {self.table} ORDER BY updated DESC LIMIT -1 OFFSET ?)', (max_entries,)
+            ).rowcount
+        if removed:
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        return removed
+
+    def start_compactor(self, interval, max_age=None, max_entries=None):
+        """백그라운드 주기적 정리 스레드 시작"""
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    removed = self.compact(max_age, max_entries)
+                    if removed:
+                        logging.info(f"{self.table} 정리: {removed}건 삭제")
+                except Exception as e:
+                    logging.warning(f"{self.table} 정리 실패: {e}")
+
+        thread = threading.Thread(target=loop, daemon=True)
+        thread.start()
+        return thread
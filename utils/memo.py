@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+함수 결과 메모 (LRU + 디스크 스냅샷)
+같은 공연명이 갱신마다 반복되므로 분류/정규화 결과를 프로세스 간 재사용
+스냅샷은 버전(기준 테이블 해시)이 다르면 버리고 새로 계산
+여러 프로세스(gunicorn 워커, 크롤러 워커)가 같은 파일에 저장하므로 저장은 파일 잠금 안에서 디스크 내용과 병합
+"""
+import os
+import json
+import time
+import atexit
+import hashlib
+import logging
+import functools
+import threading
+from collections import OrderedDict
+
+from utils.helpers import atomic_write, file_lock
+
+
+def table_fingerprint(*tables):
+    """키워드 테이블 내용 해시 (테이블이 바뀌면 메모 무효화)"""
+    encoded = json.dumps(tables, ensure_ascii=False, sort_keys=True, default=list)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+class Memo:
+    """(네임스페이스, 인자) → 결과 LRU
+
+    entries: {(네임스페이스, 인자...): 결과} - 오래 안 쓴 순 (OrderedDict)
+    조회는 잠금 없이, 추가/삭제만 잠금 (인자/결과는 JSON 직렬화 가능한 값만)
+    """
+
+    def __init__(self, path, version, max_entries):
+        self.path = path
+        self.version = version
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._load()
+        atexit.register(self.save)
+
+    def _read_snapshot(self):
+        """디스크 스냅샷 → [(키, 결과), ...] (없거나 깨졌으면 빈 목록, 버전이 다르면 None)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            logging.warning(f"메모 스냅샷 로드 실패: {e}")
+            return []
+        if snapshot.get('version') != self.version:
+            return None
+        return [(tuple(key), value) for key, value in snapshot.get('entries', [])]
+
+    def _load(self):
+        """스냅샷 로드 (버전이 다르면 무시)"""
+        if not self.path:
+            return
+        entries = self._read_snapshot()
+        if entries is None:
+            logging.info("메모 스냅샷 버전 변경: 새로 계산")
+            self.dirty = True
+            return
+        for key, value in entries[-self.max_entries:]:
+            self.entries[key] = value
+
+    def wrap(self, namespace):
+        """함수 결과를 메모하는 데코레이터 (위치 인자 호출만 메모)"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if kwargs:
+                    return fn(*args, **kwargs)
+                key = (namespace,) + args
+                try:
+                    value = self.entries[key]
+                except KeyError:
+                    self.misses += 1
+                    value = fn(*args)
+                    self.put(key, value)
+                    return value
+                except TypeError:
+                    return fn(*args)  # 해시 불가 인자
+                self.hits += 1
+                try:
+                    self.entries.move_to_end(key)
+                except KeyError:
+                    pass
+                return value
+            return wrapper
+        return decorator
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.dirty = True
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, namespace):
+        """네임스페이스 항목 전체 삭제 → 삭제 건수"""
+        with self.lock:
+            keys = [key for key in self.entries if key[0] == namespace]
+            for key in keys:
+                del self.entries[key]
+            if keys:
+                self.dirty = True
+        return len(keys)
+
+    def stats(self):
+        """항목 수 / 적중 / 미적중"""
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
+
+    def save(self):
+        """변경된 항목을 스냅샷으로 저장
+
+        파일 잠금을 잡고 다른 프로세스가 그사이 저장한 항목을 병합한 뒤 교체 (마지막 저장이 앞선 저장을 덮어쓰지 않도록)
+        디스크에만 있던 항목은 오래 안 쓴 쪽으로 들여와 이 프로세스에서도 재사용
+        """
+        if not self.path:
+            return
+        with self.lock:
+            if not self.dirty:
+                return
+            self.dirty = False
+        try:
+            with file_lock(self.path):
+                disk = self._read_snapshot() or []
+                with self.lock:
+                    merged = OrderedDict((key, value) for key, value in disk if key not in self.entries)
+                    merged.update(self.entries)
+                    while len(merged) > self.max_entries:
+                        merged.popitem(last=False)
+                    self.entries = merged
+                    data = {'version': self.version, 'entries': [[list(key), value] for key, value in merged.items()]}
+                atomic_write(self.path, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+        except Exception as e:
+            logging.warning(f"메모 스냅샷 저장 실패: {e}")
+
+    def start(self, interval):
+        """백그라운드 주기적 스냅샷 저장 스레드 시작"""
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.save()
+
+        thread = threading.Thread(target=loop, daemon=True)
+        thread.start()
+        return thread
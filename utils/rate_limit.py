@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+요청 속도 제한 유틸리티
+"""
+import time
+import threading
+
+
+class TokenBucket:
+    """토큰 버킷 속도 제한 (스레드 안전)
+
+    rate: 초당 토큰 보충 수, capacity: 최대 버스트
+    429 응답 시 penalize()로 속도를 낮추고, 성공이 이어지면 reward()로 원래 속도까지 회복
+    """
+
+    def __init__(self, rate, capacity=None, min_rate=0.2):
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = min_rate
+        self.capacity = float(capacity or max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens=1.0):
+        """토큰을 얻을 때까지 대기"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self, factor=0.5):
+        """속도 제한 응답(429) 수신: 보충 속도를 낮추고 남은 토큰 비움"""
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate * factor)
+            self.tokens = 0.0
+            self.updated = time.monotonic()
+
+    def reward(self, step=1.1):
+        """성공 응답: 원래 속도까지 점진적으로 회복"""
+        with self.lock:
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate * step)
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+같은 키의 동시 작업을 1회 실행으로 합치는 유틸리티 (single-flight)
+"""
+import logging
+import threading
+
+
+class _Call:
+    """진행 중인 작업 1건 (완료 시 결과/예외를 대기자 모두에게 전달)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """키별 진행 중 작업 공유
+
+    do(): 같은 키가 실행 중이면 새로 실행하지 않고 그 결과를 기다림
+    do_async(): 백그라운드 실행 (이미 실행 중이면 무시) - stale-while-revalidate 갱신용
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def _run(self, key, call, fn):
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+        finally:
+            with self.lock:
+                self.calls.pop(key, None)
+            call.done.set()
+
+    def do(self, key, fn, timeout=None):
+        """fn() 결과 반환 (동시 요청은 1회만 실행, 예외도 공유)"""
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+
+        if leader:
+            self._run(key, call, fn)
+        elif not call.done.wait(timeout):
+            raise TimeoutError(f"대기 시간 초과: {key}")
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def do_async(self, key, fn):
+        """fn()을 백그라운드로 실행 → 새로 시작했으면 True"""
+        with self.lock:
+            if key in self.calls:
+                return False
+            call = self.calls[key] = _Call()
+
+        def run():
+            self._run(key, call, fn)
+            if call.error is not None:
+                logging.warning(f"백그라운드 갱신 실패 ({key}): {call.error}")
+
+        threading.Thread(target=run, daemon=True).start()
+        return True
+
+    def in_flight(self, key):
+        """키 작업 진행 여부"""
+        with self.lock:
+            return key in self.calls